@@ -0,0 +1,28 @@
+"""
+基准测试
+提供 daoji_core 数据模型、处理管道、数据流路由和模块注册表的可复现基准测试
+
+命令行用法:
+    python -m daoji_core.benchmarks run --output bench.json
+    python -m daoji_core.benchmarks compare baseline.json bench.json
+"""
+
+from .runner import (
+    BenchmarkCase,
+    BenchmarkRegistry,
+    BenchmarkResult,
+    compare_reports,
+    measure,
+    run_benchmarks,
+)
+from .suites import default_registry
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkRegistry",
+    "BenchmarkResult",
+    "measure",
+    "run_benchmarks",
+    "compare_reports",
+    "default_registry",
+]
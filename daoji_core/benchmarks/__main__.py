@@ -0,0 +1,102 @@
+"""
+基准测试命令行入口
+
+    python -m daoji_core.benchmarks list
+    python -m daoji_core.benchmarks run [-k pipeline] [--quick] [--output bench.json]
+    python -m daoji_core.benchmarks compare baseline.json bench.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .runner import BenchmarkResult, compare_reports, run_benchmarks
+from .suites import default_registry
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    """输出单个用例的结果"""
+    print(
+        f"{result.key:<60} {result.median_ns / 1000:>12.2f} µs  ±{result.stdev_ns / 1000:>9.2f}  "
+        f"{result.ops_per_sec:>12.0f} ops/s",
+        file=sys.stderr,
+    )
+
+
+def _cmd_list(args: argparse.Namespace) -> int:
+    for case in default_registry().select(args.filter):
+        print(case.key)
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    cases = default_registry().select(args.filter)
+    if not cases:
+        print("没有匹配的基准用例", file=sys.stderr)
+        return 1
+
+    repeat, min_time = (3, 0.02) if args.quick else (args.repeat, args.min_time)
+    report = run_benchmarks(cases, repeat=repeat, min_time=min_time, warmup=args.warmup, progress=_print_result)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"结果已写入 {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    rows = compare_reports(baseline, current, threshold=args.threshold)
+
+    regressions = 0
+    for row in rows:
+        if "change" in row:
+            print(f"{row['key']:<60} {row['change']:>+8.1%}  {row['status']}")
+        else:
+            print(f"{row['key']:<60} {'':>8}  {row['status']}")
+        regressions += row["status"] == "regression"
+
+    print(f"\n共 {len(rows)} 个用例，回退 {regressions} 个（阈值 {args.threshold:.0%}）")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m daoji_core.benchmarks", description="daoji_core 基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="列出基准用例")
+    list_parser.add_argument("-k", "--filter", action="append", help="按名称或分组筛选（可重复）")
+    list_parser.set_defaults(func=_cmd_list)
+
+    run_parser = subparsers.add_parser("run", help="运行基准测试并输出JSON结果")
+    run_parser.add_argument("-k", "--filter", action="append", help="按名称或分组筛选（可重复）")
+    run_parser.add_argument("-o", "--output", help="JSON结果输出文件，默认输出到标准输出")
+    run_parser.add_argument("--repeat", type=int, default=5, help="每个用例的计时轮数")
+    run_parser.add_argument("--min-time", type=float, default=0.1, help="单轮最短耗时（秒）")
+    run_parser.add_argument("--warmup", type=int, default=1, help="预热轮数")
+    run_parser.add_argument("--quick", action="store_true", help="快速模式（3轮，每轮至少0.02秒）")
+    run_parser.set_defaults(func=_cmd_run)
+
+    compare_parser = subparsers.add_parser("compare", help="对比两份JSON结果")
+    compare_parser.add_argument("baseline", help="基准结果文件")
+    compare_parser.add_argument("current", help="当前结果文件")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="回退判定阈值（0.1 表示 10%%）")
+    compare_parser.add_argument("--fail-on-regression", action="store_true", help="存在回退时以非零状态码退出")
+    compare_parser.set_defaults(func=_cmd_compare)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+基准测试运行器
+提供基准用例注册、计时、环境信息采集和结果对比
+"""
+
+import gc
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# 结果文件格式版本，字段不兼容变更时递增
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """基准用例
+
+    setup 在计时前调用一次，返回被计时的无参函数和可选的清理函数。
+    """
+
+    name: str
+    group: str
+    params: dict[str, Any]
+    setup: Callable[[], tuple[Callable[[], Any], Callable[[], None] | None]]
+
+    @property
+    def key(self) -> str:
+        """用例唯一键（名称 + 参数）"""
+        if not self.params:
+            return self.name
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+
+@dataclass
+class BenchmarkResult:
+    """基准测试结果（耗时单位为纳秒/次）"""
+
+    name: str
+    group: str
+    params: dict[str, Any]
+    key: str
+    number: int
+    repeat: int
+    min_ns: float
+    median_ns: float
+    mean_ns: float
+    stdev_ns: float
+    ops_per_sec: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+
+@dataclass
+class BenchmarkRegistry:
+    """基准用例注册表"""
+
+    cases: list[BenchmarkCase] = field(default_factory=list)
+
+    def add(
+        self,
+        name: str,
+        group: str,
+        setup: Callable[[], tuple[Callable[[], Any], Callable[[], None] | None]],
+        **params: Any,
+    ) -> None:
+        """注册基准用例"""
+        self.cases.append(BenchmarkCase(name=name, group=group, params=params, setup=setup))
+
+    def select(self, patterns: list[str] | None = None) -> list[BenchmarkCase]:
+        """按名称或分组子串筛选用例"""
+        if not patterns:
+            return list(self.cases)
+        return [case for case in self.cases if any(p in case.key or p == case.group for p in patterns)]
+
+
+@contextmanager
+def _quiet_logging() -> Iterator[None]:
+    """基准测试期间屏蔽 WARNING 及以下日志，避免日志输出干扰计时"""
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
+def _calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """确定每轮调用次数，使单轮耗时不低于 min_time"""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        if elapsed >= min_time or number >= 1_000_000:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def measure(case: BenchmarkCase, repeat: int = 5, min_time: float = 0.1, warmup: int = 1) -> BenchmarkResult:
+    """运行单个基准用例
+
+    每轮调用 number 次，取各轮的单次平均耗时做统计；计时期间关闭垃圾回收。
+
+    Args:
+        case: 基准用例
+        repeat: 计时轮数
+        min_time: 单轮最短耗时（秒），用于确定每轮调用次数
+        warmup: 预热轮数
+
+    Returns:
+        基准测试结果
+    """
+    func, teardown = case.setup()
+    try:
+        number = _calibrate(func, min_time)
+        for _ in range(warmup):
+            for _ in range(number):
+                func()
+
+        samples = []
+        gc_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter_ns()
+                for _ in range(number):
+                    func()
+                samples.append((time.perf_counter_ns() - start) / number)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    finally:
+        if teardown is not None:
+            teardown()
+
+    median = statistics.median(samples)
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        params=dict(case.params),
+        key=case.key,
+        number=number,
+        repeat=repeat,
+        min_ns=min(samples),
+        median_ns=median,
+        mean_ns=statistics.fmean(samples),
+        stdev_ns=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        ops_per_sec=1e9 / median if median else 0.0,
+    )
+
+
+def collect_environment() -> dict[str, Any]:
+    """采集运行环境信息（用于比较不同提交的结果）"""
+    environment: dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+    try:
+        import pydantic
+
+        environment["pydantic"] = pydantic.VERSION
+    except ImportError:
+        pass
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+        environment["git_commit"] = commit
+    except (OSError, subprocess.SubprocessError):
+        environment["git_commit"] = None
+    return environment
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase],
+    repeat: int = 5,
+    min_time: float = 0.1,
+    warmup: int = 1,
+    progress: Callable[[BenchmarkResult], None] | None = None,
+) -> dict[str, Any]:
+    """运行一组基准用例
+
+    Args:
+        cases: 基准用例列表
+        repeat: 每个用例的计时轮数
+        min_time: 单轮最短耗时（秒）
+        warmup: 预热轮数
+        progress: 每个用例完成后的回调
+
+    Returns:
+        可直接序列化为JSON的结果报告
+    """
+    results = []
+    with _quiet_logging():
+        for case in cases:
+            result = measure(case, repeat=repeat, min_time=min_time, warmup=warmup)
+            results.append(result.to_dict())
+            if progress is not None:
+                progress(result)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": collect_environment(),
+        "settings": {"repeat": repeat, "min_time": min_time, "warmup": warmup},
+        "results": results,
+    }
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1) -> list[dict[str, Any]]:
+    """对比两份结果报告
+
+    以单次耗时中位数计算变化比例，超过 threshold 视为回退或提升。
+
+    Args:
+        baseline: 基准报告
+        current: 当前报告
+        threshold: 判定阈值（0.1 表示 10%）
+
+    Returns:
+        按用例排列的对比结果，status 为 regression/improvement/unchanged/new/missing
+    """
+    baseline_results = {result["key"]: result for result in baseline.get("results", [])}
+    current_results = {result["key"]: result for result in current.get("results", [])}
+
+    rows = []
+    for key, result in current_results.items():
+        base = baseline_results.get(key)
+        if base is None:
+            rows.append({"key": key, "status": "new", "current_ns": result["median_ns"]})
+            continue
+
+        change = result["median_ns"] / base["median_ns"] - 1 if base["median_ns"] else 0.0
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append(
+            {
+                "key": key,
+                "status": status,
+                "baseline_ns": base["median_ns"],
+                "current_ns": result["median_ns"],
+                "change": change,
+            }
+        )
+
+    for key, base in baseline_results.items():
+        if key not in current_results:
+            rows.append({"key": key, "status": "missing", "baseline_ns": base["median_ns"]})
+    return rows
@@ -0,0 +1,212 @@
+"""
+基准用例定义
+覆盖数据模型构造、管道处理开销、数据流路由和模块注册表操作
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from ..data import (
+    BaseDataModel,
+    DataFlowManager,
+    DataPipeline,
+    DataProcessor,
+    DataType,
+    ProcessingResult,
+    TableData,
+    TextData,
+    TextRecord,
+)
+from ..modules import ModuleRegistry
+from ..modules.base import SimpleModule
+from .runner import BenchmarkRegistry
+
+# 参数规模
+PROCESSOR_COUNTS = (0, 1, 2, 4, 8, 16)
+MODULE_COUNTS = (1, 4, 16, 64)
+REGISTRY_SIZES = (10, 100, 1000)
+TABLE_SHAPES = ((5, 10), (10, 1000))
+
+
+class NoopProcessor(DataProcessor):
+    """空处理器（只返回输入数据，用于测量管道自身开销）"""
+
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data: BaseDataModel) -> bool:
+        return True
+
+    def process(self, data: BaseDataModel) -> ProcessingResult:
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+def _model_cases(registry: BenchmarkRegistry) -> None:
+    """数据模型构造"""
+
+    def base_model() -> tuple[Callable[[], Any], None]:
+        return (lambda: BaseDataModel(type=DataType.TEXT)), None
+
+    def text_data() -> tuple[Callable[[], Any], None]:
+        return (lambda: TextData(content="hello world", language="en")), None
+
+    def text_record() -> tuple[Callable[[], Any], None]:
+        return (lambda: TextRecord("hello world", language="en")), None
+
+    def text_rebuild() -> tuple[Callable[[], Any], None]:
+        data = TextData(content="hello world " * 10000)
+        return (lambda: TextData(content=data.content, source="bench")), None
+
+    def text_evolve() -> tuple[Callable[[], Any], None]:
+        data = TextData(content="hello world " * 10000)
+        return (lambda: data.evolve(source="bench")), None
+
+    def result_validated() -> tuple[Callable[[], Any], None]:
+        data = TextData(content="hello world")
+        return (lambda: ProcessingResult.success_result(data=data, processing_time=0.0, processor_name="bench")), None
+
+    def result_trusted() -> tuple[Callable[[], Any], None]:
+        data = TextData(content="hello world")
+        return (lambda: ProcessingResult.trusted_success(data=data, processing_time=0.0, processor_name="bench")), None
+
+    registry.add("models.base_data_model", "models", base_model)
+    registry.add("models.text_data", "models", text_data)
+    registry.add("models.text_record", "models", text_record)
+    registry.add("models.result_validated", "models", result_validated)
+    registry.add("models.result_trusted", "models", result_trusted)
+    registry.add("models.text_rebuild_large", "models", text_rebuild)
+    registry.add("models.text_evolve_large", "models", text_evolve)
+
+    for columns, rows in TABLE_SHAPES:
+
+        def table_data(columns: int = columns, rows: int = rows) -> tuple[Callable[[], Any], None]:
+            headers = [f"c{i}" for i in range(columns)]
+            data = [list(range(columns)) for _ in range(rows)]
+            return (lambda: TableData(headers=headers, rows=data)), None
+
+        def table_data_trusted(columns: int = columns, rows: int = rows) -> tuple[Callable[[], Any], None]:
+            headers = [f"c{i}" for i in range(columns)]
+            data = [list(range(columns)) for _ in range(rows)]
+            return (lambda: TableData.construct_trusted(headers=headers, rows=data)), None
+
+        registry.add("models.table_data", "models", table_data, columns=columns, rows=rows)
+        registry.add("models.table_data_trusted", "models", table_data_trusted, columns=columns, rows=rows)
+
+
+def _pipeline_cases(registry: BenchmarkRegistry) -> None:
+    """管道处理开销随处理器数量的变化"""
+    for count in PROCESSOR_COUNTS:
+
+        def pipeline_process(count: int = count, metrics: bool = False) -> tuple[Callable[[], Any], None]:
+            pipeline = DataPipeline("bench", metrics=metrics)
+            for i in range(count):
+                pipeline.add_processor(NoopProcessor(f"noop{i}"))
+            data = TextData(content="hello world")
+            return (lambda: pipeline.process(data)), None
+
+        registry.add("pipeline.process", "pipeline", pipeline_process, processors=count)
+
+        def pipeline_process_metrics(count: int = count) -> tuple[Callable[[], Any], None]:
+            return pipeline_process(count, metrics=True)
+
+        registry.add("pipeline.process_metrics", "pipeline", pipeline_process_metrics, processors=count)
+
+        def pipeline_batch(count: int = count) -> tuple[Callable[[], Any], None]:
+            pipeline = DataPipeline("bench")
+            for i in range(count):
+                pipeline.add_processor(NoopProcessor(f"noop{i}"))
+            items = [TextData(content="hello world") for _ in range(100)]
+            return (lambda: pipeline.process_batch(items)), None
+
+        registry.add("pipeline.process_batch_100", "pipeline", pipeline_batch, processors=count)
+
+
+def _build_flow_manager(module_count: int) -> DataFlowManager:
+    """构造注册了 module_count 个文本模块的数据流管理器"""
+    manager = DataFlowManager()
+    manager.pipeline.add_processor(NoopProcessor("noop"))
+    for i in range(module_count):
+        manager.register_module(f"module{i}", SimpleModule(f"module{i}", [DataType.TEXT]))
+    return manager
+
+
+def _routing_cases(registry: BenchmarkRegistry) -> None:
+    """route_data（直接调用/经模块输入队列）与 auto_route_data 随模块数量的变化"""
+    for count in MODULE_COUNTS:
+
+        def route(count: int = count) -> tuple[Callable[[], Any], None]:
+            manager = _build_flow_manager(count)
+            data = TextData(content="hello world")
+            target = f"module{count - 1}"
+            return (lambda: manager.route_data(data, target)), None
+
+        def auto_route(count: int = count) -> tuple[Callable[[], Any], Callable[[], None]]:
+            manager = _build_flow_manager(count)
+            data = TextData(content="hello world")
+            return (lambda: manager.auto_route_data(data)), manager.shutdown
+
+        def route_queued(count: int = count) -> tuple[Callable[[], Any], Callable[[], None]]:
+            manager = _build_flow_manager(count)
+            data = TextData(content="hello world")
+            target = f"module{count - 1}"
+            manager.configure_module_queue(target)
+            return (lambda: manager.route_data(data, target)), manager.shutdown
+
+        registry.add("routing.route_data", "routing", route, modules=count)
+        registry.add("routing.route_data_queued", "routing", route_queued, modules=count)
+        registry.add("routing.auto_route_data", "routing", auto_route, modules=count)
+
+
+def _registry_cases(registry: BenchmarkRegistry) -> None:
+    """ModuleRegistry 操作（运行前后清空全局注册表）"""
+    for size in REGISTRY_SIZES:
+
+        def populated(size: int = size) -> tuple[ModuleRegistry, list[SimpleModule]]:
+            module_registry = ModuleRegistry.get_instance()
+            module_registry.clear_registry()
+            modules = [SimpleModule(f"bench{i}", [DataType.TEXT]) for i in range(size)]
+            for module in modules:
+                module_registry.register_module(module)
+            return module_registry, modules
+
+        def get_module(size: int = size) -> tuple[Callable[[], Any], Callable[[], None]]:
+            module_registry, _ = populated(size)
+            name = f"bench{size // 2}"
+            return (lambda: module_registry.get_module(name)), module_registry.clear_registry
+
+        def list_modules(size: int = size) -> tuple[Callable[[], Any], Callable[[], None]]:
+            module_registry, _ = populated(size)
+            return module_registry.list_modules, module_registry.clear_registry
+
+        def register_unregister(size: int = size) -> tuple[Callable[[], Any], Callable[[], None]]:
+            module_registry, _ = populated(size)
+            extra = SimpleModule("bench_extra", [DataType.TEXT])
+
+            def cycle() -> None:
+                module_registry.register_module(extra)
+                module_registry.unregister_module("bench_extra")
+
+            return cycle, module_registry.clear_registry
+
+        def iterate(size: int = size) -> tuple[Callable[[], Any], Callable[[], None]]:
+            module_registry, _ = populated(size)
+            return (lambda: [module.name for module in module_registry]), module_registry.clear_registry
+
+        def registry_statistics(size: int = size) -> tuple[Callable[[], Any], Callable[[], None]]:
+            module_registry, _ = populated(size)
+            return module_registry.get_registry_statistics, module_registry.clear_registry
+
+        registry.add("registry.get_module", "registry", get_module, modules=size)
+        registry.add("registry.list_modules", "registry", list_modules, modules=size)
+        registry.add("registry.register_unregister", "registry", register_unregister, modules=size)
+        registry.add("registry.iterate", "registry", iterate, modules=size)
+        registry.add("registry.statistics", "registry", registry_statistics, modules=size)
+
+
+def default_registry() -> BenchmarkRegistry:
+    """构造包含所有内置基准用例的注册表"""
+    registry = BenchmarkRegistry()
+    _model_cases(registry)
+    _pipeline_cases(registry)
+    _routing_cases(registry)
+    _registry_cases(registry)
+    return registry
@@ -3,18 +3,75 @@
 提供统一的数据模型、处理管道和流管理功能
 """
 
+from .cache import ResultCache
+from .columnar import ArrowTableData
+from .execution import ExecutionBackend, ExecutionEngine
+from .failures import (
+    ArrowDeadLetterSink,
+    DeadLetter,
+    DeadLetterSink,
+    FailurePolicy,
+    JsonlDeadLetterSink,
+    RetryPolicy,
+)
 from .interface import DataFlowManager, DataModule
-from .models import BaseDataModel, DataType, ProcessingResult, TableData, TextData
-from .pipeline import DataPipeline, DataProcessor
+from .metrics import PipelineMetrics, export_prometheus
+from .models import BaseDataModel, BaseRecord, DataType, ImageData, ProcessingResult, TableData, TextData
+from .pipeline import (
+    AsyncDataProcessor,
+    CachedProcessor,
+    DataPipeline,
+    DataProcessor,
+    MergeStrategy,
+    ParallelProcessor,
+)
+from .plan import ExecutionPlan
+from .profiling import PipelineProfiler
+from .queues import ModuleQueue, OverflowPolicy
+from .records import DataRecord, ImageRecord, TableRecord, TextRecord, as_model, as_record
+from .sharding import ShardedRunner
+from .timing import TimingSpan, current_span, timed
 
 __all__ = [
     "BaseDataModel",
     "DataType",
     "TextData",
     "TableData",
+    "ArrowTableData",
+    "ImageData",
     "ProcessingResult",
+    "BaseRecord",
+    "TextRecord",
+    "TableRecord",
+    "ImageRecord",
+    "DataRecord",
+    "as_record",
+    "as_model",
     "DataProcessor",
+    "AsyncDataProcessor",
+    "CachedProcessor",
+    "ResultCache",
     "DataPipeline",
+    "FailurePolicy",
+    "RetryPolicy",
+    "DeadLetter",
+    "DeadLetterSink",
+    "JsonlDeadLetterSink",
+    "ArrowDeadLetterSink",
+    "ExecutionPlan",
+    "PipelineMetrics",
+    "export_prometheus",
+    "PipelineProfiler",
+    "TimingSpan",
+    "timed",
+    "current_span",
+    "ParallelProcessor",
+    "MergeStrategy",
+    "ExecutionBackend",
+    "ExecutionEngine",
+    "ShardedRunner",
     "DataModule",
     "DataFlowManager",
+    "ModuleQueue",
+    "OverflowPolicy",
 ]
@@ -0,0 +1,310 @@
+"""
+处理结果缓存
+提供基于内容哈希的处理器结果缓存，支持内存LRU和SQLite磁盘两级存储
+"""
+
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .image_io import is_buffer
+from .models import BaseDataModel, BaseRecord, ProcessingResult
+
+if TYPE_CHECKING:
+    from ..config import AIConfig
+
+logger = logging.getLogger(__name__)
+
+# 计算内容哈希时忽略的身份字段
+IDENTITY_FIELDS = frozenset({"id", "timestamp"})
+
+
+def content_hash(data: BaseDataModel | BaseRecord, ignore_fields: frozenset[str] = IDENTITY_FIELDS) -> str:
+    """计算数据内容哈希
+
+    忽略 id、timestamp 等身份字段，内容相同的两条数据得到相同的哈希；
+    二进制数据和Arrow表直接对底层缓冲区求哈希，不做序列化复制。
+
+    Args:
+        data: 数据模型或轻量记录
+        ignore_fields: 不参与哈希的字段
+
+    Returns:
+        十六进制哈希字符串
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    if isinstance(data, BaseRecord):
+        fields = {"type": data.type, "source": data.source, "metadata": data.metadata}
+        fields.update((name, getattr(data, name)) for name in data._fields)
+    else:
+        # 直接读取字段值：ArrowTableData 的 rows 是按需物化的属性，哈希只需要其Arrow表
+        values = data.__dict__
+        fields = {name: values[name] for name in type(data).model_fields}
+
+    for name in sorted(fields):
+        if name in ignore_fields:
+            continue
+        _feed(hasher, name)
+        _feed(hasher, fields[name])
+    return hasher.hexdigest()
+
+
+def _feed(hasher: Any, value: Any) -> None:
+    """将值按类型规范化后写入哈希"""
+    if value is None:
+        hasher.update(b"N")
+    elif isinstance(value, bool):
+        hasher.update(b"T" if value else b"F")
+    elif isinstance(value, Enum):
+        _feed(hasher, value.value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        hasher.update(b"s%d:" % len(encoded))
+        hasher.update(encoded)
+    elif isinstance(value, int | float):
+        hasher.update(b"n" + repr(value).encode())
+    elif isinstance(value, datetime | date):
+        hasher.update(b"d" + value.isoformat().encode())
+    elif isinstance(value, dict):
+        hasher.update(b"{%d" % len(value))
+        for key in sorted(value, key=str):
+            _feed(hasher, str(key))
+            _feed(hasher, value[key])
+    elif isinstance(value, list | tuple):
+        hasher.update(b"[%d" % len(value))
+        for item in value:
+            _feed(hasher, item)
+    elif is_buffer(value):
+        with memoryview(value) as view:
+            hasher.update(b"b%d:" % view.nbytes)
+            hasher.update(view)
+    elif hasattr(value, "schema") and hasattr(value, "columns"):
+        # pyarrow.Table：对schema和各列缓冲区求哈希
+        hasher.update(b"A" + str(value.schema).encode())
+        for column in value.columns:
+            for chunk in column.chunks:
+                hasher.update(b"c%d:%d" % (chunk.offset, len(chunk)))
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        hasher.update(buffer)
+    else:
+        _feed(hasher, repr(value))
+
+
+def _detach(result: ProcessingResult) -> ProcessingResult:
+    """复制结果及其输出数据对象（元数据和警告列表独立），修改副本不会影响缓存条目"""
+    data = result.data
+    return result.model_copy(
+        update={"data": None if data is None else data.evolve(), "warnings": list(result.warnings)}
+    )
+
+
+class SQLiteCacheStore:
+    """SQLite磁盘缓存存储
+
+    以pickle形式存储处理结果，按过期时间惰性清理。
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, expires_at REAL, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> ProcessingResult | None:
+        """读取未过期的缓存结果"""
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at, value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            expires_at, value = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        try:
+            return pickle.loads(value)
+        except Exception as e:
+            logger.warning(f"读取磁盘缓存 {key} 失败: {e}")
+            return None
+
+    def set(self, key: str, result: ProcessingResult, expires_at: float | None) -> None:
+        """写入缓存结果"""
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, expires_at, value) VALUES (?, ?, ?)", (key, expires_at, value)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """删除所有过期条目
+
+        Returns:
+            删除的条目数
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """清空磁盘缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """处理结果缓存
+
+    以 处理器名称 + 处理器版本 + 数据内容哈希 为键缓存成功的处理结果：
+    - 内存LRU，按条目数限制容量
+    - 可选的SQLite磁盘层，内存未命中时查询并回填内存
+    - 两层共用同一个TTL
+    - 命中/未命中计数
+
+    写入时保存结果的副本，每次命中返回新的副本，调用方修改返回结果（包括其输出数据）不会影响缓存条目。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float | None = 3600,
+        disk_path: str | Path | None = None,
+    ):
+        """
+        Args:
+            max_entries: 内存层最大条目数
+            ttl: 缓存生存时间（秒），None 表示永不过期
+            disk_path: SQLite磁盘缓存文件路径，None 表示只使用内存层
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries 必须大于0")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk = SQLiteCacheStore(disk_path) if disk_path else None
+        self._memory: OrderedDict[str, tuple[float | None, ProcessingResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stores": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls, config: "AIConfig", max_entries: int = 10000, use_disk: bool = True) -> "ResultCache":
+        """根据AI配置创建缓存
+
+        TTL取自 cache_ttl，启用 enable_model_cache 且 use_disk 为 True 时
+        在 model_cache_dir 下创建磁盘缓存。
+        """
+        disk_path = None
+        if use_disk and config.enable_model_cache:
+            disk_path = Path(config.model_cache_dir) / "result_cache.sqlite3"
+        return cls(max_entries=max_entries, ttl=config.cache_ttl, disk_path=disk_path)
+
+    @staticmethod
+    def make_key(processor_name: str, processor_version: str, data: BaseDataModel | BaseRecord) -> str:
+        """生成缓存键"""
+        return f"{processor_name}:{processor_version}:{content_hash(data)}"
+
+    def get(self, key: str) -> ProcessingResult | None:
+        """查询缓存
+
+        Returns:
+            缓存结果的副本（输出数据对象同样是副本），未命中时返回 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return _detach(result)
+                del self._memory[key]
+
+        if self.disk is not None:
+            result = self.disk.get(key)
+            if result is not None:
+                self._store_memory(key, result, now + self.ttl if self.ttl else None)
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                return _detach(result)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, result: ProcessingResult) -> None:
+        """写入缓存（只缓存成功结果）"""
+        if not result.success:
+            return
+
+        expires_at = time.time() + self.ttl if self.ttl else None
+        self._store_memory(key, _detach(result), expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, result, expires_at)
+            except Exception as e:
+                logger.warning(f"写入磁盘缓存 {key} 失败: {e}")
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def _store_memory(self, key: str, result: ProcessingResult, expires_at: float | None) -> None:
+        """写入内存层并按LRU淘汰"""
+        with self._lock:
+            self._memory[key] = (expires_at, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """清空缓存（包括磁盘层）"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["disk_enabled"] = self.disk is not None
+        return stats
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+    def __repr__(self) -> str:
+        return f"ResultCache(entries={len(self)}, max_entries={self.max_entries}, ttl={self.ttl})"
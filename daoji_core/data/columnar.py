@@ -0,0 +1,241 @@
+"""
+列式表格数据
+提供基于 pyarrow.Table 的列式表格数据模型
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from pydantic import Field, PrivateAttr, field_serializer
+
+from .models import TableData
+
+# column_schema 中常用类型名到Arrow类型别名的映射，与 pyarrow/json2arrow.py 的推断规则保持一致
+_TYPE_ALIASES = {
+    "str": "string",
+    "text": "string",
+    "int": "int64",
+    "integer": "int64",
+    "float": "float64",
+    "double": "float64",
+    "boolean": "bool",
+    "bytes": "binary",
+    "date": "date32",
+    "datetime": "timestamp[us]",
+    "timestamp": "timestamp[us]",
+}
+
+
+def require_pyarrow() -> Any:
+    """导入 pyarrow，未安装时给出明确错误"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("列式表格需要安装 pyarrow: uv add pyarrow") from e
+
+    # 项目根目录下的 pyarrow/ 示例目录会在未安装 pyarrow 时被当作命名空间包导入
+    if not hasattr(pa, "Table"):
+        raise ImportError("列式表格需要安装 pyarrow: uv add pyarrow")
+    return pa
+
+
+def arrow_type(type_name: str) -> Any:
+    """将 column_schema 中的类型名转换为Arrow类型
+
+    Args:
+        type_name: 类型名，支持常用Python类型名和Arrow类型别名（如 int64、timestamp[ms]）
+
+    Returns:
+        Arrow数据类型
+    """
+    pa = require_pyarrow()
+    alias = _TYPE_ALIASES.get(type_name.lower(), type_name.lower())
+    try:
+        return pa.type_for_alias(alias)
+    except ValueError:
+        raise ValueError(f"不支持的列类型: {type_name}")
+
+
+def rows_to_arrow(headers: list[str], rows: list[list[Any]], column_schema: dict[str, str] | None = None) -> Any:
+    """将行数据转换为 pyarrow.Table
+
+    column_schema 中声明的列按声明类型转换，其余列自动推断；
+    推断失败的混合类型列转为字符串列。
+
+    Args:
+        headers: 表头列表
+        rows: 数据行列表
+        column_schema: 列数据类型定义
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = require_pyarrow()
+    header_count = len(headers)
+    if any(len(row) != header_count for row in rows):
+        raise ValueError(f"数据行列数与表头列数({header_count})不匹配")
+
+    columns = list(zip(*rows, strict=True)) if rows else [()] * header_count
+    column_schema = column_schema or {}
+
+    arrays = []
+    for name, values in zip(headers, columns, strict=True):
+        if name in column_schema:
+            arrays.append(pa.array(values, type=arrow_type(column_schema[name])))
+            continue
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if value is None else str(value) for value in values], type=pa.string()))
+
+    return pa.Table.from_arrays(arrays, names=list(headers))
+
+
+class ArrowTableData(TableData):
+    """列式表格数据模型
+
+    以 pyarrow.Table 存储数据，适合百万行级别的表格：
+    - 列访问零拷贝（get_column）
+    - 批量追加行（add_rows、add_table），新数据以新的chunk拼接，不复制已有数据
+    - 按记录批次流式转换为字典（iter_dicts）
+    - 由 column_schema 生成Arrow schema
+
+    rows 是由Arrow表按需物化的只读行数据（首次访问时转换并缓存，表被替换后重新物化），
+    读取 rows 的代码（包括 as_record 和序列化）得到与Arrow表一致的行；修改行数据应使用 add_rows。
+    """
+
+    rows: list[list[Any]] = Field(default_factory=list, description="行数据由Arrow表按需物化，见 rows 属性")
+
+    table: Any = Field(description="pyarrow.Table 列式数据")
+
+    # (物化时的Arrow表, 行数据)，按表对象的身份判断缓存是否有效
+    _materialized: tuple[Any, list[list[Any]]] | None = PrivateAttr(default=None)
+
+    def __init__(self, **data):
+        pa = require_pyarrow()
+        table = data.get("table")
+        if not isinstance(table, pa.Table):
+            raise ValueError("table 必须是 pyarrow.Table")
+        data.setdefault("headers", list(table.column_names))
+        super().__init__(**data)
+
+    @classmethod
+    def from_rows(
+        cls, headers: list[str], rows: list[list[Any]], column_schema: dict[str, str] | None = None, **kwargs
+    ) -> "ArrowTableData":
+        """从行数据创建列式表格"""
+        table = rows_to_arrow(headers, rows, column_schema)
+        return cls(table=table, headers=list(headers), column_schema=column_schema, **kwargs)
+
+    @classmethod
+    def from_table_data(cls, data: TableData) -> "ArrowTableData":
+        """从行式 TableData 创建列式表格（保留id、时间戳和元数据）"""
+        if isinstance(data, ArrowTableData):
+            return data
+        return cls(
+            table=rows_to_arrow(data.headers, data.rows, data.column_schema),
+            headers=list(data.headers),
+            column_schema=data.column_schema,
+            id=data.id,
+            timestamp=data.timestamp,
+            metadata=data.metadata,
+            source=data.source,
+        )
+
+    def _materialize_rows(self) -> list[list[Any]]:
+        """将Arrow表物化为行数据（缓存到表被替换为止）"""
+        table = self.table
+        cached = self._materialized
+        if cached is not None and cached[0] is table:
+            return cached[1]
+        columns = [column.to_pylist() for column in table.columns]
+        rows = [list(row) for row in zip(*columns, strict=True)] if columns else []
+        self._materialized = (table, rows)
+        return rows
+
+    @field_serializer("rows")
+    def _serialize_rows(self, value: list[list[Any]]) -> list[list[Any]]:
+        """序列化时输出由Arrow表物化的行数据"""
+        return self._materialize_rows()
+
+    def to_table_data(self) -> TableData:
+        """物化为行式 TableData（行列数由Arrow表保证一致，跳过逐行校验）"""
+        return TableData.construct_trusted(
+            headers=list(self.headers),
+            rows=[list(row) for row in self._materialize_rows()],
+            column_schema=self.column_schema,
+            id=self.id,
+            timestamp=self.timestamp,
+            metadata=dict(self.metadata),
+            source=self.source,
+        )
+
+    def _validate_data(self):
+        """验证表头与Arrow表结构一致"""
+        if not self.headers:
+            raise ValueError("表头不能为空")
+
+        if list(self.table.column_names) != list(self.headers):
+            raise ValueError(f"表头 {self.headers} 与Arrow表列名 {self.table.column_names} 不一致")
+
+    def get_row_count(self) -> int:
+        """获取行数"""
+        return self.table.num_rows
+
+    def get_column(self, column_name: str) -> Any:
+        """获取指定列（零拷贝，返回 pyarrow.ChunkedArray）"""
+        if column_name not in self.table.column_names:
+            raise ValueError(f"列 '{column_name}' 不存在")
+        return self.table.column(column_name)
+
+    def get_column_data(self, column_name: str) -> list[Any]:
+        """获取指定列的数据"""
+        return self.get_column(column_name).to_pylist()
+
+    def add_row(self, row: list[Any]) -> None:
+        """添加数据行"""
+        self.add_rows([row])
+
+    def add_rows(self, rows: list[list[Any]]) -> None:
+        """批量添加数据行"""
+        if not rows:
+            return
+        self.add_table(rows_to_arrow(self.headers, rows, self.column_schema))
+
+    def add_table(self, table: Any) -> None:
+        """追加另一个 pyarrow.Table（列名需一致，类型不一致时按当前schema转换）"""
+        pa = require_pyarrow()
+        if list(table.column_names) != list(self.headers):
+            raise ValueError(f"列名 {table.column_names} 与表头 {self.headers} 不一致")
+        if table.schema != self.table.schema:
+            table = table.cast(self.table.schema)
+        self.table = pa.concat_tables([self.table, table])
+
+    def iter_dicts(self, batch_size: int = 65536) -> Iterator[dict[str, Any]]:
+        """按记录批次流式产出字典行"""
+        for batch in self.table.to_batches(max_chunksize=batch_size):
+            yield from batch.to_pylist()
+
+    def to_dict_list(self) -> list[dict[str, Any]]:
+        """转换为字典列表格式"""
+        return self.table.to_pylist()
+
+    def get_arrow_schema(self) -> Any:
+        """获取Arrow schema"""
+        return self.table.schema
+
+    def get_memory_usage(self) -> int:
+        """获取Arrow缓冲区占用的字节数"""
+        return self.table.nbytes
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """pickle时不传递物化的行数据缓存"""
+        state = super().__getstate__()
+        if state.get("__pydantic_private__"):
+            state["__pydantic_private__"] = {**state["__pydantic_private__"], "_materialized": None}
+        return state
+
+
+# pydantic 不允许用属性覆盖父类字段，类创建后再设置：实例字典中的 rows 字段值始终为空列表，
+# 属性（数据描述符）优先于实例字典，读取 rows 时返回由Arrow表物化的行数据
+ArrowTableData.rows = property(ArrowTableData._materialize_rows, doc="由Arrow表物化的只读行数据")  # type: ignore[assignment]
@@ -0,0 +1,266 @@
+"""
+并行执行引擎
+为处理器分支和模块分发提供线程池、进程池和asyncio执行后端
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from .models import ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionBackend(str, Enum):
+    """执行后端枚举"""
+
+    SEQUENTIAL = "sequential"
+    THREAD = "thread"
+    PROCESS = "process"
+    ASYNCIO = "asyncio"
+
+
+@dataclass
+class BranchTask:
+    """待执行的分支任务
+
+    func 必须返回 ProcessingResult；使用进程池后端时 func 和 args 必须可被pickle。
+    func 为协程函数时，asyncio 执行路径会直接 await 它。
+    """
+
+    name: str
+    func: Callable[..., Any]
+    args: tuple[Any, ...] = field(default_factory=tuple)
+    timeout: float | None = None
+
+
+@dataclass
+class BranchOutcome:
+    """分支执行结果
+
+    start_ns 为分支实际开始执行的时刻（perf_counter_ns），排队等待工作线程的时间不计入；
+    未能开始执行（超时、调度失败）时为提交时刻。
+    """
+
+    name: str
+    result: ProcessingResult
+    elapsed: float
+    timed_out: bool = False
+    start_ns: int | None = None
+
+
+def _timed_call(
+    name: str, func: Callable[..., ProcessingResult], args: tuple[Any, ...]
+) -> tuple[ProcessingResult, int, float]:
+    """在工作线程/进程中执行分支并计时（模块级函数，便于进程池pickle）
+
+    Returns:
+        (处理结果, 开始时刻 perf_counter_ns, 耗时秒数)
+    """
+    start_ns = time.perf_counter_ns()
+    try:
+        result = func(*args)
+    except Exception as e:
+        result = ProcessingResult.trusted_error(
+            error=f"分支执行异常: {str(e)}",
+            processing_time=(time.perf_counter_ns() - start_ns) / 1e9,
+            error_code="BRANCH_ERROR",
+            processor_name=name,
+        )
+    return result, start_ns, (time.perf_counter_ns() - start_ns) / 1e9
+
+
+async def _atimed_call(
+    name: str, func: Callable[..., Any], args: tuple[Any, ...]
+) -> tuple[ProcessingResult, int, float]:
+    """执行协程分支并计时"""
+    start_ns = time.perf_counter_ns()
+    try:
+        result = await func(*args)
+    except Exception as e:
+        result = ProcessingResult.trusted_error(
+            error=f"分支执行异常: {str(e)}",
+            processing_time=(time.perf_counter_ns() - start_ns) / 1e9,
+            error_code="BRANCH_ERROR",
+            processor_name=name,
+        )
+    return result, start_ns, (time.perf_counter_ns() - start_ns) / 1e9
+
+
+class ExecutionEngine:
+    """并行执行引擎
+
+    将一组分支任务分发到指定后端并收集结果：
+    - sequential: 在调用线程中依次执行；设置了超时的任务改在工作线程中执行以便按时返回，仍逐个执行
+    - thread: 线程池执行，适合I/O密集和释放GIL的任务
+    - process: 进程池执行，适合纯Python的CPU密集任务
+    - asyncio: 在事件循环中并发执行，同步任务自动卸载到线程池
+
+    arun 可用于任意后端：sequential 逐个执行，process 将同步任务卸载到进程池。
+
+    超时从任务提交时开始计算，超时的分支会得到 BRANCH_TIMEOUT 错误结果，
+    已在运行的线程/进程无法被强制中断，其结果会被丢弃。
+    """
+
+    def __init__(self, backend: ExecutionBackend | str = ExecutionBackend.THREAD, max_workers: int | None = None):
+        self.backend = ExecutionBackend(backend)
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def run(self, tasks: Sequence[BranchTask]) -> list[BranchOutcome]:
+        """同步执行所有分支任务
+
+        Args:
+            tasks: 分支任务列表
+
+        Returns:
+            与任务顺序一致的执行结果列表
+        """
+        if not tasks:
+            return []
+
+        if self.backend == ExecutionBackend.SEQUENTIAL:
+            return [self._run_inline(task) if task.timeout is None else self._run_pooled([task])[0] for task in tasks]
+
+        if self.backend == ExecutionBackend.ASYNCIO:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.arun(tasks))
+            logger.warning("当前线程已有运行中的事件循环，asyncio后端改用线程池执行，请使用 arun")
+
+        return self._run_pooled(tasks)
+
+    async def arun(self, tasks: Sequence[BranchTask]) -> list[BranchOutcome]:
+        """在事件循环中并发执行所有分支任务
+
+        Args:
+            tasks: 分支任务列表
+
+        Returns:
+            与任务顺序一致的执行结果列表
+        """
+        if not tasks:
+            return []
+
+        loop = asyncio.get_running_loop()
+        limit = 1 if self.backend == ExecutionBackend.SEQUENTIAL else self.max_workers
+        semaphore = asyncio.Semaphore(limit) if limit else None
+        executor = self._get_executor()
+
+        async def run_one(task: BranchTask) -> BranchOutcome:
+            if semaphore is None:
+                return await self._arun_one(task, loop, executor)
+            async with semaphore:
+                return await self._arun_one(task, loop, executor)
+
+        return list(await asyncio.gather(*(run_one(task) for task in tasks)))
+
+    async def _arun_one(self, task: BranchTask, loop: asyncio.AbstractEventLoop, executor: Executor) -> BranchOutcome:
+        """在事件循环中执行单个任务，同步任务卸载到执行器"""
+        submitted_ns = time.perf_counter_ns()
+        if inspect.iscoroutinefunction(task.func):
+            awaitable = _atimed_call(task.name, task.func, task.args)
+        else:
+            awaitable = loop.run_in_executor(executor, _timed_call, task.name, task.func, task.args)
+        try:
+            result, start_ns, elapsed = await asyncio.wait_for(awaitable, task.timeout)
+        except TimeoutError:
+            return self._timeout_outcome(task, submitted_ns)
+        except Exception as e:
+            return self._failure_outcome(task, e, submitted_ns)
+        return BranchOutcome(name=task.name, result=result, elapsed=elapsed, start_ns=start_ns)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭底层执行器"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self) -> Executor:
+        """懒加载并复用执行器"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.backend == ExecutionBackend.PROCESS:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="daoji-exec"
+                        )
+        return self._executor
+
+    def _run_inline(self, task: BranchTask) -> BranchOutcome:
+        """在当前线程中执行任务"""
+        result, start_ns, elapsed = _timed_call(task.name, task.func, task.args)
+        return BranchOutcome(name=task.name, result=result, elapsed=elapsed, start_ns=start_ns)
+
+    def _run_pooled(self, tasks: Sequence[BranchTask]) -> list[BranchOutcome]:
+        """通过线程池/进程池执行任务"""
+        executor = self._get_executor()
+        submitted_ns = time.perf_counter_ns()
+        futures = [executor.submit(_timed_call, task.name, task.func, task.args) for task in tasks]
+
+        outcomes = []
+        for task, future in zip(tasks, futures, strict=True):
+            remaining = None
+            if task.timeout is not None:
+                remaining = max(0.0, task.timeout - (time.perf_counter_ns() - submitted_ns) / 1e9)
+            try:
+                result, start_ns, elapsed = future.result(timeout=remaining)
+                outcomes.append(BranchOutcome(name=task.name, result=result, elapsed=elapsed, start_ns=start_ns))
+            except TimeoutError:
+                future.cancel()
+                outcomes.append(self._timeout_outcome(task, submitted_ns))
+            except Exception as e:
+                outcomes.append(self._failure_outcome(task, e, submitted_ns))
+
+        return outcomes
+
+    def _timeout_outcome(self, task: BranchTask, submitted_ns: int) -> BranchOutcome:
+        """构造超时结果（耗时从提交时刻算起）"""
+        elapsed = (time.perf_counter_ns() - submitted_ns) / 1e9
+        logger.warning(f"分支 {task.name} 执行超时（{task.timeout}s）")
+        result = ProcessingResult.trusted_error(
+            error=f"分支 {task.name} 执行超时（{task.timeout}s）",
+            processing_time=elapsed,
+            error_code="BRANCH_TIMEOUT",
+            processor_name=task.name,
+        )
+        return BranchOutcome(name=task.name, result=result, elapsed=elapsed, timed_out=True, start_ns=submitted_ns)
+
+    def _failure_outcome(self, task: BranchTask, error: Exception, submitted_ns: int) -> BranchOutcome:
+        """构造执行器层面的失败结果（如进程池崩溃、pickle失败）"""
+        elapsed = (time.perf_counter_ns() - submitted_ns) / 1e9
+        logger.error(f"分支 {task.name} 调度失败: {error}")
+        result = ProcessingResult.trusted_error(
+            error=f"分支 {task.name} 调度失败: {str(error)}",
+            processing_time=elapsed,
+            error_code="BRANCH_ERROR",
+            processor_name=task.name,
+        )
+        return BranchOutcome(name=task.name, result=result, elapsed=elapsed, start_ns=submitted_ns)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """pickle时丢弃执行器和锁"""
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ExecutionEngine(backend='{self.backend.value}', max_workers={self.max_workers})"
@@ -0,0 +1,314 @@
+"""
+失败处理
+提供批量/流式处理的失败策略、临时性错误的退避重试和死信输出
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from ..utils.exceptions import DaojiCoreError
+from .columnar import require_pyarrow
+from .models import BaseDataModel, BaseRecord, ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+# 默认视为临时性错误、可以重试的错误代码
+RETRYABLE_ERROR_CODES = frozenset({"TRANSIENT_ERROR", "TIMEOUT", "CONNECTION_ERROR", "BRANCH_TIMEOUT"})
+
+
+class FailurePolicy(str, Enum):
+    """批量/流式处理的失败策略"""
+
+    CONTINUE = "continue"  # 失败记录以错误结果原位返回（默认）
+    FAIL_FAST = "fail_fast"  # 遇到失败记录立即抛出 ProcessingError
+    SKIP = "skip"  # 失败记录从输出中移除
+    DEAD_LETTER = "dead_letter"  # 失败记录写入死信输出并从输出中移除
+
+
+def error_code_for(error: BaseException) -> str | None:
+    """根据异常类型确定错误代码
+
+    DaojiCoreError 体系的异常沿用其 error_code（如 TransientError → TRANSIENT_ERROR），
+    超时和连接异常分别归为 TIMEOUT 和 CONNECTION_ERROR，其他异常不设错误代码。
+    """
+    if isinstance(error, DaojiCoreError):
+        return error.error_code
+    if isinstance(error, TimeoutError):
+        return "TIMEOUT"
+    if isinstance(error, ConnectionError):
+        return "CONNECTION_ERROR"
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """退避重试策略
+
+    只重试错误代码属于 retryable_codes 的失败（默认为临时性错误），
+    第 n 次重试前等待 min(backoff * multiplier^(n-1), max_backoff) 秒，并叠加 ±jitter 比例的随机抖动。
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.1
+    multiplier: float = 2.0
+    max_backoff: float = 10.0
+    jitter: float = 0.1
+    retryable_codes: frozenset[str] = RETRYABLE_ERROR_CODES
+
+    def __post_init__(self) -> None:
+        if self.max_attempts <= 0:
+            raise ValueError("max_attempts 必须大于0")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("backoff 和 max_backoff 不能为负数")
+
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次重试前的等待时间（秒）"""
+        delay = min(self.backoff * self.multiplier ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def is_retryable(self, result: ProcessingResult) -> bool:
+        """判断失败结果是否可以重试"""
+        return not result.success and result.error_code in self.retryable_codes
+
+    def run_batch(
+        self, func: Callable[[list[Any]], list[ProcessingResult]], items: list[Any], name: str = ""
+    ) -> list[ProcessingResult]:
+        """批量执行并重试其中的临时性失败
+
+        每轮只重新提交可重试的记录；整批调用抛出可重试异常时重试整批，
+        不可重试的异常直接向上抛出。
+
+        Args:
+            func: 批量处理函数，返回与输入等长的结果列表
+            items: 输入数据列表
+            name: 用于日志的处理器名称
+
+        Returns:
+            与输入一一对应的最终结果列表
+        """
+        results: list[ProcessingResult] = []
+        positions = list(range(len(items)))
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                delay = self.delay(attempt - 1)
+                logger.warning(f"处理器 {name} 有 {len(positions)} 条记录临时失败，{delay:.2f}s 后第 {attempt} 次尝试")
+                time.sleep(delay)
+
+            try:
+                batch = func([items[i] for i in positions])
+            except Exception as e:
+                if attempt == self.max_attempts or error_code_for(e) not in self.retryable_codes:
+                    raise
+                logger.warning(f"处理器 {name} 批处理临时异常: {e}")
+                continue
+
+            if not results:
+                results = batch
+            else:
+                for i, result in zip(positions, batch, strict=True):
+                    results[i] = result
+            positions = [i for i, result in enumerate(results) if self.is_retryable(result)]
+            if not positions:
+                break
+
+        return results
+
+    async def arun(
+        self, func: Callable[[Any], Awaitable[ProcessingResult]], item: Any, name: str = ""
+    ) -> ProcessingResult:
+        """异步执行单条记录并重试临时性失败
+
+        返回可重试的失败结果或抛出可重试异常时按退避策略重试，不可重试的异常直接向上抛出。
+
+        Args:
+            func: 处理单条记录的协程函数
+            item: 输入数据
+            name: 用于日志的处理器名称
+
+        Returns:
+            最终处理结果
+        """
+        result: ProcessingResult | None = None
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                delay = self.delay(attempt - 1)
+                logger.warning(f"处理器 {name} 临时失败，{delay:.2f}s 后第 {attempt} 次尝试")
+                await asyncio.sleep(delay)
+
+            try:
+                result = await func(item)
+            except Exception as e:
+                if attempt == self.max_attempts or error_code_for(e) not in self.retryable_codes:
+                    raise
+                logger.warning(f"处理器 {name} 临时异常: {e}")
+                continue
+
+            if not self.is_retryable(result):
+                break
+
+        return result
+
+
+@dataclass
+class DeadLetter:
+    """死信记录"""
+
+    index: int
+    data: BaseDataModel | BaseRecord
+    result: ProcessingResult
+    pipeline_name: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "pipeline": self.pipeline_name,
+            "index": self.index,
+            "data_id": self.data.id,
+            "data_type": str(getattr(self.data.type, "value", self.data.type)),
+            "data": _dump_data(self.data),
+            "error": self.result.error,
+            "error_code": self.result.error_code,
+            "processor_name": self.result.processor_name,
+        }
+
+
+def _dump_data(data: BaseDataModel | BaseRecord) -> dict[str, Any]:
+    """将输入数据转换为可JSON序列化的字典（无法序列化的字段转为字符串）"""
+    values = data.to_dict() if isinstance(data, BaseRecord) else data.model_dump()
+    return json.loads(json.dumps(values, ensure_ascii=False, default=_json_default))
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化兜底"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"
+    return str(value)
+
+
+class DeadLetterSink(ABC):
+    """死信输出抽象基类（实现需保证线程安全）"""
+
+    @abstractmethod
+    def write(self, letter: DeadLetter) -> None:
+        """写入一条死信"""
+        pass
+
+    def flush(self) -> None:
+        """刷新缓冲（默认无缓冲）"""
+        return
+
+    def close(self) -> None:
+        """关闭输出"""
+        self.flush()
+
+    def __enter__(self) -> "DeadLetterSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class JsonlDeadLetterSink(DeadLetterSink):
+    """JSONL 死信输出（每行一条死信，追加写入）"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._file = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, letter: DeadLetter) -> None:
+        line = json.dumps(letter.to_dict(), ensure_ascii=False, default=_json_default)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        logger.info(f"死信已写入 {self.path}，共 {self.count} 条")
+
+
+class ArrowDeadLetterSink(DeadLetterSink):
+    """Arrow IPC 流格式死信输出（需要 pyarrow）
+
+    死信按 batch_size 条缓冲为一个记录批次写入，data 列为输入数据的JSON字符串；
+    可用 pyarrow.ipc.open_stream 读取。
+    """
+
+    _FIELDS = (
+        "timestamp",
+        "pipeline",
+        "index",
+        "data_id",
+        "data_type",
+        "data",
+        "error",
+        "error_code",
+        "processor_name",
+    )
+
+    def __init__(self, path: str | Path, batch_size: int = 1000):
+        pa = require_pyarrow()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.count = 0
+        self.schema = pa.schema([(name, pa.int64() if name == "index" else pa.string()) for name in self._FIELDS])
+        self._writer = pa.ipc.new_stream(str(self.path), self.schema)
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def write(self, letter: DeadLetter) -> None:
+        row = letter.to_dict()
+        row["data"] = json.dumps(row["data"], ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(row)
+            self.count += 1
+            if len(self._buffer) >= self.batch_size:
+                self._write_buffer()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_buffer()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                return
+            self._write_buffer()
+            self._writer.close()
+            self._writer = None
+        logger.info(f"死信已写入 {self.path}，共 {self.count} 条")
+
+    def _write_buffer(self) -> None:
+        """将缓冲的死信写为一个记录批次（调用方持有锁）"""
+        if not self._buffer or self._writer is None:
+            return
+        pa = require_pyarrow()
+        self._writer.write_batch(pa.RecordBatch.from_pylist(self._buffer, schema=self.schema))
+        self._buffer = []
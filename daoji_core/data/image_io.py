@@ -0,0 +1,112 @@
+"""
+图像数据读取工具
+提供内存映射加载和不解码像素的图像头解析
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Any
+
+# 支持 buffer 协议、可零拷贝传递的图像数据类型
+ImageBuffer = bytes | bytearray | memoryview | mmap.mmap
+
+
+def map_file(file_path: str | Path) -> mmap.mmap | bytes:
+    """以只读方式内存映射文件（空文件返回 b""，因为空文件无法映射）"""
+    with open(file_path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def read_file_header(file_path: str | Path, size: int = 64 * 1024) -> bytes:
+    """读取文件头部字节"""
+    with open(file_path, "rb") as f:
+        return f.read(size)
+
+
+def is_buffer(value: Any) -> bool:
+    """检查对象是否支持 buffer 协议"""
+    try:
+        memoryview(value).release()
+    except TypeError:
+        return False
+    return True
+
+
+def probe_image(buffer: ImageBuffer) -> tuple[str, int | None, int | None] | None:
+    """解析图像格式和尺寸（只读取文件头，不解码像素）
+
+    支持 PNG、JPEG、GIF、BMP、WEBP。
+
+    Args:
+        buffer: 图像数据或其头部字节
+
+    Returns:
+        (格式, 宽度, 高度)，无法识别时返回 None；尺寸无法从头部确定时为 None
+    """
+    with memoryview(buffer) as view:
+        head = bytes(view[:32])
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and len(head) >= 24:
+            width, height = struct.unpack(">II", head[16:24])
+            return "png", width, height
+
+        if head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+            width, height = struct.unpack("<HH", head[6:10])
+            return "gif", width, height
+
+        if head.startswith(b"BM") and len(head) >= 26:
+            width, height = struct.unpack("<ii", head[18:26])
+            return "bmp", width, abs(height)
+
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return ("webp", *_probe_webp(head))
+
+        if head.startswith(b"\xff\xd8"):
+            return ("jpeg", *_probe_jpeg(view))
+
+    return None
+
+
+def _probe_webp(head: bytes) -> tuple[int | None, int | None]:
+    """解析WEBP尺寸"""
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30:
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25:
+        b0, b1, b2, b3 = head[21:25]
+        width = 1 + (((b1 & 0x3F) << 8) | b0)
+        height = 1 + (((b3 & 0x0F) << 10) | (b2 << 2) | ((b1 & 0xC0) >> 6))
+        return width, height
+    if chunk == b"VP8X" and len(head) >= 30:
+        width = 1 + int.from_bytes(head[24:27], "little")
+        height = 1 + int.from_bytes(head[27:30], "little")
+        return width, height
+    return None, None
+
+
+def _probe_jpeg(view: memoryview) -> tuple[int | None, int | None]:
+    """扫描JPEG段直到SOF段解析尺寸"""
+    offset = 2
+    length = len(view)
+    while offset + 9 <= length:
+        if view[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = view[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+        segment_length = struct.unpack(">H", view[offset + 2 : offset + 4])[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", view[offset + 5 : offset + 9])
+            return width, height
+        offset += 2 + segment_length
+    return None, None
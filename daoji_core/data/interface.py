@@ -3,15 +3,127 @@
 提供模块间数据交换的标准接口和管理器
 """
 
+import asyncio
+import inspect
 import logging
-from typing import Protocol, runtime_checkable
-
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Protocol, runtime_checkable
+
+from .execution import BranchOutcome, BranchTask, ExecutionBackend, ExecutionEngine
 from .models import BaseDataModel, DataType, ProcessingResult
 from .pipeline import DataPipeline
+from .profiling import PipelineProfiler
+from .queues import ModuleQueue, OverflowPolicy
+from .timing import TimingSpan, enter_span, exit_span, timed
 
 logger = logging.getLogger(__name__)
 
 
+def _call_dispatched_module(name: str, module: "DataModule", data: BaseDataModel) -> ProcessingResult:
+    """调用单个模块（模块级函数，便于进程池pickle）
+
+    结果的 timing 为模块调用区间，模块自身的计时区间挂载在其下。
+    """
+    with timed(f"module:{name}") as span:
+        try:
+            result = module.process_data(data)
+        except Exception as e:
+            result = ProcessingResult.trusted_error(
+                error=f"自动路由到模块 {name} 失败: {str(e)}",
+                processing_time=span.finish().duration,
+                error_code="AUTO_ROUTING_ERROR",
+            )
+    if result.timing is not None:
+        span.attach(result.timing)
+    result.timing = span
+    return result
+
+
+async def _acall_dispatched_module(
+    name: str, aprocess_data: Callable[[BaseDataModel], Awaitable[ProcessingResult]], data: BaseDataModel
+) -> ProcessingResult:
+    """异步调用单个模块"""
+    with timed(f"module:{name}") as span:
+        try:
+            result = await aprocess_data(data)
+        except Exception as e:
+            result = ProcessingResult.trusted_error(
+                error=f"自动路由到模块 {name} 失败: {str(e)}",
+                processing_time=span.finish().duration,
+                error_code="AUTO_ROUTING_ERROR",
+            )
+    if result.timing is not None:
+        span.attach(result.timing)
+    result.timing = span
+    return result
+
+
+class _QueuedCall:
+    """已投递到模块输入队列的调用（计时从投递开始，包含排队等待时间）"""
+
+    __slots__ = ("name", "future", "started", "finished")
+
+    def __init__(self, name: str, future: "Future[ProcessingResult]", started: float):
+        self.name = name
+        self.future = future
+        self.started = started
+        self.finished: float | None = None
+        future.add_done_callback(self._done)
+
+    @classmethod
+    def submit(cls, name: str, queue: ModuleQueue, data: BaseDataModel) -> "_QueuedCall":
+        """投递到模块输入队列（block 策略下队列满时阻塞）"""
+        started = time.perf_counter()
+        return cls(name, queue.submit(data), started)
+
+    @classmethod
+    async def asubmit(cls, name: str, queue: ModuleQueue, data: BaseDataModel) -> "_QueuedCall":
+        """异步投递到模块输入队列（等待空位时不阻塞事件循环）"""
+        started = time.perf_counter()
+        return cls(name, await queue.asubmit(data), started)
+
+    def _done(self, future: "Future[ProcessingResult]") -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """从投递到完成（未完成时为到当前）的耗时"""
+        return (self.finished if self.finished is not None else time.perf_counter()) - self.started
+
+    def remaining(self, timeout: float | None) -> float | None:
+        """距超时的剩余时间，None 表示不限制"""
+        return None if timeout is None else max(0.0, timeout - self.elapsed)
+
+    def timeout_outcome(self) -> BranchOutcome:
+        """超时未完成时取消调用（仍在排队时会被移出处理）并返回超时结果"""
+        self.future.cancel()
+        elapsed = self.elapsed
+        result = ProcessingResult.trusted_error(
+            error=f"模块 {self.name} 排队处理超时",
+            processing_time=elapsed,
+            error_code="MODULE_TIMEOUT",
+            processor_name=self.name,
+        )
+        return BranchOutcome(name=self.name, result=result, elapsed=elapsed, timed_out=True)
+
+    def failure_outcome(self, error: Exception) -> BranchOutcome:
+        """队列工作线程抛出异常时的错误结果"""
+        elapsed = self.elapsed
+        result = ProcessingResult.trusted_error(
+            error=f"自动路由到模块 {self.name} 失败: {str(error)}",
+            processing_time=elapsed,
+            error_code="AUTO_ROUTING_ERROR",
+            processor_name=self.name,
+        )
+        return BranchOutcome(name=self.name, result=result, elapsed=elapsed)
+
+
 @runtime_checkable
 class DataModule(Protocol):
     """数据模块接口协议
@@ -50,21 +162,65 @@ class DataModule(Protocol):
         ...
 
 
+@dataclass(frozen=True)
+class RoutingTable:
+    """不可变的路由分发表
+
+    由 DataFlowManager 在模块注册/注销和路由规则变更时重建，
+    路由时只做字典查找，不再调用模块的 get_supported_types。
+    """
+
+    version: int
+    routes: Mapping[DataType, tuple[tuple[str, "DataModule"], ...]]
+    supported_types: Mapping[str, frozenset[DataType]]
+
+    def modules_for(self, data_type: DataType) -> tuple[tuple[str, "DataModule"], ...]:
+        """获取数据类型对应的 (模块名称, 模块实例) 列表"""
+        return self.routes.get(data_type, ())
+
+    def supports(self, name: str, data_type: DataType) -> bool:
+        """检查模块是否支持指定数据类型"""
+        return data_type in self.supported_types.get(name, ())
+
+
 class DataFlowManager:
     """数据流管理器
 
     管理模块间的数据流转：
     - 模块注册和发现
     - 数据路由和分发
+    - 模块输入队列与背压（见 configure_module_queue）
     - 处理管道管理
     - 流程监控和日志
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        dispatch_backend: ExecutionBackend | str = ExecutionBackend.SEQUENTIAL,
+        max_in_flight: int | None = None,
+        module_timeout: float | None = None,
+    ):
+        """
+        Args:
+            max_concurrency: 异步路由的最大并发数
+            dispatch_backend: auto_route_data 的分发后端
+            max_in_flight: 自动路由时同时在途的最大模块调用数
+            module_timeout: 自动路由时的默认模块超时时间（秒）
+        """
         self.modules: dict[str, DataModule] = {}
         self.pipeline = DataPipeline("GlobalPipeline")
         self.logger = logging.getLogger(__name__)
         self._routing_rules: dict[DataType, list[str]] = {}
+        self._supported_types: dict[str, frozenset[DataType]] = {}
+        self._routing_table = RoutingTable(version=0, routes=MappingProxyType({}), supported_types=MappingProxyType({}))
+        self.max_concurrency = max_concurrency
+        self._async_limiter: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+        self.dispatch_engine = ExecutionEngine(backend=dispatch_backend, max_workers=max_in_flight)
+        self.module_timeout = module_timeout
+        self._module_timeouts: dict[str, float] = {}
+        self._queues: dict[str, ModuleQueue] = {}
+        self.profiler: PipelineProfiler | None = None
 
     def register_module(self, name: str, module: DataModule) -> None:
         """注册数据模块
@@ -85,8 +241,13 @@ class DataFlowManager:
         self.modules[name] = module
         self.logger.info(f"注册模块: {name}")
 
+        queue = self._queues.get(name)
+        if queue is not None:
+            queue.handler = partial(self._call_queued_module, name, module)
+
         # 自动设置路由规则
         self._setup_routing_for_module(name, module)
+        self._rebuild_routing_table()
 
     def unregister_module(self, name: str) -> bool:
         """注销模块
@@ -100,7 +261,9 @@ class DataFlowManager:
         if name in self.modules:
             del self.modules[name]
             self.logger.info(f"注销模块: {name}")
+            self.remove_module_queue(name, wait=False)
             self._cleanup_routing_for_module(name)
+            self._rebuild_routing_table()
             return True
         return False
 
@@ -126,6 +289,8 @@ class DataFlowManager:
     def route_data(self, data: BaseDataModel, target_module: str) -> ProcessingResult:
         """路由数据到指定模块
 
+        结果的 timing 为本次路由的计时树，包含全局管道和模块调用两个子区间。
+
         Args:
             data: 输入数据
             target_module: 目标模块名称
@@ -133,31 +298,51 @@ class DataFlowManager:
         Returns:
             处理结果
         """
-        if target_module not in self.modules:
-            return ProcessingResult.error_result(
-                error=f"模块 {target_module} 未注册", processing_time=0.0, error_code="MODULE_NOT_FOUND"
-            )
+        route_span, token = enter_span(f"route:{target_module}")
+        try:
+            result = self._route_data(data, target_module, route_span)
+        finally:
+            exit_span(route_span, token)
+        result.timing = route_span
+        return result
+
+    def _route_data(self, data: BaseDataModel, target_module: str, route_span: TimingSpan) -> ProcessingResult:
+        """路由数据到指定模块（在路由计时区间内执行）"""
+        rejection = self._check_target(data, target_module)
+        if rejection is not None:
+            return rejection
 
         module = self.modules[target_module]
 
-        # 检查模块是否支持该数据类型
-        supported_types = module.get_supported_types()
-        if data.type not in supported_types:
-            return ProcessingResult.error_result(
-                error=f"模块 {target_module} 不支持数据类型 {data.type}",
-                processing_time=0.0,
-                error_code="UNSUPPORTED_DATA_TYPE",
-            )
-
         try:
             # 先通过全局管道预处理
             pipeline_result = self.pipeline.process(data)
             if not pipeline_result.success:
                 return pipeline_result
 
+            queue = self._queues.get(target_module)
+            if queue is not None:
+                call = _QueuedCall.submit(target_module, queue, pipeline_result.data)
+                try:
+                    result = call.future.result(timeout=call.remaining(self._timeout_for(target_module)))
+                except TimeoutError:
+                    return call.timeout_outcome().result
+                if result.timing is not None:
+                    route_span.attach(result.timing)
+                return result
+
             # 发送到目标模块
             self.logger.debug(f"路由数据到模块: {target_module}")
-            result = module.process_data(pipeline_result.data)
+            profiler = self._sample_profiler()
+            with timed(f"module:{target_module}") as module_span:
+                active_profile = profiler.start(f"module:{target_module}") if profiler is not None else None
+                try:
+                    result = module.process_data(pipeline_result.data)
+                finally:
+                    if active_profile is not None:
+                        active_profile.stop()
+            if result.timing is not None:
+                module_span.attach(result.timing)
 
             self.logger.debug(f"模块 {target_module} 处理完成")
             return result
@@ -165,63 +350,410 @@ class DataFlowManager:
         except Exception as e:
             error_msg = f"路由到模块 {target_module} 时发生异常: {str(e)}"
             self.logger.error(error_msg)
-            return ProcessingResult.error_result(error=error_msg, processing_time=0.0, error_code="ROUTING_ERROR")
+            return ProcessingResult.trusted_error(
+                error=error_msg, processing_time=route_span.duration, error_code="ROUTING_ERROR"
+            )
+
+    def _check_target(self, data: BaseDataModel, target_module: str) -> ProcessingResult | None:
+        """检查目标模块已注册且支持该数据类型，不满足时返回错误结果"""
+        if target_module not in self.modules:
+            return ProcessingResult.trusted_error(
+                error=f"模块 {target_module} 未注册", processing_time=0.0, error_code="MODULE_NOT_FOUND"
+            )
+
+        # 检查模块是否支持该数据类型
+        if not self._routing_table.supports(target_module, data.type):
+            return ProcessingResult.trusted_error(
+                error=f"模块 {target_module} 不支持数据类型 {data.type}",
+                processing_time=0.0,
+                error_code="UNSUPPORTED_DATA_TYPE",
+            )
+        return None
+
+    async def aroute_data(self, data: BaseDataModel, target_module: str) -> ProcessingResult:
+        """异步路由数据到指定模块
+
+        受 max_concurrency 限制并发；模块提供 aprocess_data 协程时直接 await，
+        否则将 process_data 卸载到线程池执行。
+
+        Args:
+            data: 输入数据
+            target_module: 目标模块名称
+
+        Returns:
+            处理结果
+        """
+        route_span, token = enter_span(f"route:{target_module}")
+        try:
+            result = await self._aroute_data(data, target_module, route_span)
+        finally:
+            exit_span(route_span, token)
+        result.timing = route_span
+        return result
+
+    async def _aroute_data(self, data: BaseDataModel, target_module: str, route_span: TimingSpan) -> ProcessingResult:
+        """异步路由数据到指定模块（在路由计时区间内执行）"""
+        rejection = self._check_target(data, target_module)
+        if rejection is not None:
+            return rejection
+
+        module = self.modules[target_module]
+
+        async with self._get_async_limiter():
+            try:
+                pipeline_result = await self.pipeline.aprocess(data)
+                if not pipeline_result.success:
+                    return pipeline_result
+
+                queue = self._queues.get(target_module)
+                if queue is not None:
+                    call = await _QueuedCall.asubmit(target_module, queue, pipeline_result.data)
+                    try:
+                        result = await asyncio.wait_for(
+                            asyncio.wrap_future(call.future), call.remaining(self._timeout_for(target_module))
+                        )
+                    except TimeoutError:
+                        return call.timeout_outcome().result
+                    if result.timing is not None:
+                        route_span.attach(result.timing)
+                    return result
+
+                self.logger.debug(f"异步路由数据到模块: {target_module}")
+                with timed(f"module:{target_module}") as module_span:
+                    result = await self._acall_module(
+                        target_module, module, pipeline_result.data, self._sample_profiler()
+                    )
+                if result.timing is not None:
+                    module_span.attach(result.timing)
+
+                self.logger.debug(f"模块 {target_module} 处理完成")
+                return result
+
+            except Exception as e:
+                error_msg = f"路由到模块 {target_module} 时发生异常: {str(e)}"
+                self.logger.error(error_msg)
+                return ProcessingResult.trusted_error(
+                    error=error_msg, processing_time=route_span.duration, error_code="ROUTING_ERROR"
+                )
 
     def auto_route_data(self, data: BaseDataModel) -> list[ProcessingResult]:
         """自动路由数据到所有支持的模块
 
+        按分发后端（见 set_dispatch_mode）将预处理后的数据分发到所有兼容模块。
+        配置了输入队列的模块改为投递到队列，由队列的工作线程处理（耗时包含排队等待时间）。
+        超时的模块返回 MODULE_TIMEOUT 错误结果，其余模块的结果照常返回（sequential 后端同样生效）；
+        每个结果的 branch_timings 记录了对应模块的分发耗时。
+
         Args:
             data: 输入数据
 
         Returns:
-            所有模块的处理结果列表
+            所有模块的处理结果列表（与模块注册顺序一致）
         """
         results = []
 
         # 获取支持该数据类型的模块
-        compatible_modules = self._get_compatible_modules(data.type)
+        compatible_modules = self._routing_table.modules_for(data.type)
 
         if not compatible_modules:
             self.logger.warning(f"没有模块支持数据类型 {data.type}")
             return results
 
-        # 先通过全局管道预处理
-        pipeline_result = self.pipeline.process(data)
-        if not pipeline_result.success:
-            results.append(pipeline_result)
-            return results
+        route_span, token = enter_span("auto_route")
+        try:
+            # 先通过全局管道预处理
+            pipeline_result = self.pipeline.process(data)
+            if not pipeline_result.success:
+                pipeline_result.timing = route_span
+                results.append(pipeline_result)
+                return results
+
+            # 发送到所有兼容模块：有输入队列的模块先投递，其余模块由分发后端执行
+            queues, direct_modules = self._split_queued(compatible_modules)
+            calls = [_QueuedCall.submit(name, queue, pipeline_result.data) for name, queue in queues]
+            tasks = self._build_dispatch_tasks(
+                direct_modules, pipeline_result.data, use_async=False, profiler=self._sample_profiler()
+            )
+            outcomes = self.dispatch_engine.run(tasks)
+            if calls:
+                outcomes = self._merge_outcomes(compatible_modules, outcomes, [self._wait_queued(c) for c in calls])
+        finally:
+            exit_span(route_span, token)
+        return self._collect_dispatch_results(outcomes, route_span)
 
-        # 发送到所有兼容模块
-        for module_name in compatible_modules:
-            try:
-                module = self.modules[module_name]
-                result = module.process_data(pipeline_result.data)
-                results.append(result)
-                self.logger.debug(f"自动路由到模块 {module_name} 完成")
-            except Exception as e:
-                error_result = ProcessingResult.error_result(
-                    error=f"自动路由到模块 {module_name} 失败: {str(e)}",
-                    processing_time=0.0,
-                    error_code="AUTO_ROUTING_ERROR",
-                )
-                results.append(error_result)
+    async def aauto_route_data(self, data: BaseDataModel) -> list[ProcessingResult]:
+        """异步自动路由数据到所有支持的模块
 
-        return results
+        模块提供 aprocess_data 协程时直接 await，否则卸载到分发后端的执行器；
+        并发数受 max_in_flight 限制。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            所有模块的处理结果列表（与模块注册顺序一致）
+        """
+        compatible_modules = self._routing_table.modules_for(data.type)
+
+        if not compatible_modules:
+            self.logger.warning(f"没有模块支持数据类型 {data.type}")
+            return []
+
+        route_span, token = enter_span("auto_route")
+        try:
+            pipeline_result = await self.pipeline.aprocess(data)
+            if not pipeline_result.success:
+                pipeline_result.timing = route_span
+                return [pipeline_result]
+
+            queues, direct_modules = self._split_queued(compatible_modules)
+            calls = [await _QueuedCall.asubmit(name, queue, pipeline_result.data) for name, queue in queues]
+            tasks = self._build_dispatch_tasks(
+                direct_modules, pipeline_result.data, use_async=True, profiler=self._sample_profiler()
+            )
+            outcomes = await self.dispatch_engine.arun(tasks)
+            if calls:
+                queued_outcomes = [await self._await_queued(c) for c in calls]
+                outcomes = self._merge_outcomes(compatible_modules, outcomes, queued_outcomes)
+        finally:
+            exit_span(route_span, token)
+        return self._collect_dispatch_results(outcomes, route_span)
+
+    def set_dispatch_mode(
+        self,
+        backend: ExecutionBackend | str,
+        max_in_flight: int | None = None,
+        module_timeout: float | None = None,
+    ) -> None:
+        """设置 auto_route_data 的分发模式
+
+        Args:
+            backend: 分发后端（sequential/thread/process/asyncio）
+            max_in_flight: 同时在途的最大模块调用数
+            module_timeout: 默认的模块超时时间（秒），None 表示不限制
+        """
+        self.dispatch_engine.shutdown(wait=False)
+        self.dispatch_engine = ExecutionEngine(backend=backend, max_workers=max_in_flight)
+        self.module_timeout = module_timeout
+        self.logger.info(f"设置分发模式: {self.dispatch_engine.backend.value}, 最大并发 {max_in_flight}")
+
+    def set_module_timeout(self, name: str, timeout: float | None) -> None:
+        """设置单个模块的超时时间
+
+        Args:
+            name: 模块名称
+            timeout: 超时时间（秒），None 表示使用默认超时
+        """
+        if timeout is None:
+            self._module_timeouts.pop(name, None)
+        else:
+            self._module_timeouts[name] = timeout
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭分发执行器和所有模块输入队列（已排队的记录会处理完）"""
+        self.dispatch_engine.shutdown(wait=wait)
+        for name in list(self._queues):
+            self.remove_module_queue(name, wait=wait)
+
+    def configure_module_queue(
+        self,
+        name: str,
+        maxsize: int = 128,
+        workers: int = 1,
+        policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        block_timeout: float | None = None,
+    ) -> ModuleQueue:
+        """为模块配置有界输入队列和工作线程池
+
+        配置后 route_data、auto_route_data 及其异步版本不再直接调用模块，而是将预处理后的
+        数据投递到队列，由 workers 个工作线程处理；慢模块只会积压自己的队列。
+        队列满时按 policy 处理：block 阻塞生产者（背压），drop_oldest 丢弃最旧的排队记录
+        （QUEUE_DROPPED），reject 拒绝新记录（QUEUE_FULL）。
+        等待队列结果受模块超时限制（见 set_module_timeout），超时返回 MODULE_TIMEOUT。
+        重复配置时旧队列会在处理完已排队的记录后关闭。
+
+        Args:
+            name: 模块名称
+            maxsize: 队列容量
+            workers: 工作线程数（即模块的最大并发调用数）
+            policy: 队列满时的处理策略
+            block_timeout: block 策略下生产者的最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            模块输入队列
+
+        Raises:
+            ValueError: 模块未注册或参数无效
+        """
+        module = self.modules.get(name)
+        if module is None:
+            raise ValueError(f"模块 {name} 未注册")
+
+        queue = ModuleQueue(
+            name,
+            partial(self._call_queued_module, name, module),
+            maxsize=maxsize,
+            workers=workers,
+            policy=policy,
+            block_timeout=block_timeout,
+        )
+        previous, self._queues[name] = self._queues.get(name), queue
+        if previous is not None:
+            previous.close(wait=False)
+        self.logger.info(f"为模块 {name} 配置输入队列: 容量 {maxsize}, 工作线程 {workers}, 策略 {queue.policy.value}")
+        return queue
+
+    def remove_module_queue(self, name: str, wait: bool = True) -> bool:
+        """移除模块的输入队列，恢复直接调用（已排队的记录会处理完）
+
+        Args:
+            name: 模块名称
+            wait: 是否等待已排队的记录处理完成
+
+        Returns:
+            是否存在并移除了队列
+        """
+        queue = self._queues.pop(name, None)
+        if queue is None:
+            return False
+        queue.close(wait=wait)
+        self.logger.info(f"移除模块 {name} 的输入队列")
+        return True
+
+    def get_module_queue(self, name: str) -> ModuleQueue | None:
+        """获取模块的输入队列"""
+        return self._queues.get(name)
+
+    def submit(self, data: BaseDataModel, target_module: str) -> "Future[ProcessingResult]":
+        """非阻塞地投递数据到指定模块
+
+        在调用线程中完成检查和全局管道预处理后投递到模块输入队列，立即返回结果的 Future；
+        block 策略下队列满时阻塞调用线程。模块未配置队列时同步路由并返回已完成的 Future。
+
+        Args:
+            data: 输入数据
+            target_module: 目标模块名称
+
+        Returns:
+            处理结果的 Future
+        """
+        queue = self._queues.get(target_module)
+        if queue is None or target_module not in self.modules:
+            future: Future[ProcessingResult] = Future()
+            future.set_result(self.route_data(data, target_module))
+            return future
+
+        rejection = self._check_target(data, target_module)
+        if rejection is None:
+            pipeline_result = self.pipeline.process(data)
+            if pipeline_result.success:
+                return queue.submit(pipeline_result.data)
+            rejection = pipeline_result
+        future = Future()
+        future.set_result(rejection)
+        return future
+
+    def get_queue_statistics(self) -> dict[str, dict[str, Any]]:
+        """获取所有模块输入队列的统计信息（深度、峰值、拒绝/丢弃数、等待和处理时间分布）"""
+        return {name: queue.get_statistics() for name, queue in self._queues.items()}
 
     def set_routing_rule(self, data_type: DataType, module_names: list[str]) -> None:
         """设置数据类型的路由规则
 
+        只有支持该数据类型的模块会进入路由表，与 route_data 的检查保持一致。
+
         Args:
             data_type: 数据类型
             module_names: 目标模块名称列表
         """
-        self._routing_rules[data_type] = module_names
+        unknown = [name for name in module_names if name not in self.modules]
+        if unknown:
+            self.logger.warning(f"路由规则包含未注册的模块，注册前将被忽略: {unknown}")
+        unsupported = [name for name in module_names if name in self.modules and not self._supports(name, data_type)]
+        if unsupported:
+            self.logger.warning(f"路由规则包含不支持数据类型 {data_type} 的模块，将被忽略: {unsupported}")
+
+        self._routing_rules[data_type] = list(module_names)
+        self._rebuild_routing_table()
         self.logger.info(f"设置路由规则: {data_type} -> {module_names}")
 
     def get_routing_rules(self) -> dict[DataType, list[str]]:
         """获取所有路由规则"""
         return self._routing_rules.copy()
 
+    def enable_profiling(
+        self,
+        output_dir: str | Path,
+        cpu: bool = True,
+        memory: bool = False,
+        sample_rate: int = 1,
+        top_n: int = 25,
+        include_pipeline: bool = True,
+    ) -> PipelineProfiler:
+        """开启模块调用剖析模式
+
+        剖析结果按模块归属（阶段名为 module:{模块名}）；include_pipeline 为 True 时
+        以相同参数开启全局管道的剖析，管道处理器的结果单独输出。
+
+        Args:
+            output_dir: 剖析结果输出目录
+            cpu: 是否启用 cProfile CPU 剖析
+            memory: 是否启用 tracemalloc 内存分配剖析
+            sample_rate: 每 N 次路由剖析一次
+            top_n: 内存报告中列出的分配位置数
+            include_pipeline: 是否同时剖析全局管道
+
+        Returns:
+            模块调用剖析器
+        """
+        if self.profiler is not None:
+            self.profiler.close()
+        self.profiler = PipelineProfiler(
+            output_dir, name="DataFlowManager", cpu=cpu, memory=memory, sample_rate=sample_rate, top_n=top_n
+        )
+        if include_pipeline:
+            self.pipeline.enable_profiling(output_dir, cpu=cpu, memory=memory, sample_rate=sample_rate, top_n=top_n)
+        self.logger.info(f"开启剖析模式，输出目录 {output_dir}，采样率 1/{sample_rate}")
+        return self.profiler
+
+    def disable_profiling(self, dump: bool = True) -> list[Path]:
+        """关闭剖析模式（包括全局管道的剖析）
+
+        Args:
+            dump: 是否将已收集的剖析结果写入输出目录
+
+        Returns:
+            写入的文件路径列表
+        """
+        written = self.pipeline.disable_profiling(dump=dump)
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.close()
+            if dump:
+                written.extend(profiler.dump())
+        return written
+
+    def get_routing_table(self) -> RoutingTable:
+        """获取当前的路由分发表"""
+        return self._routing_table
+
+    def rebuild_routing_table(self) -> RoutingTable:
+        """重新读取所有模块支持的数据类型并重建路由表
+
+        模块支持的数据类型在注册时缓存，运行期间发生变化时需调用此方法；
+        已有的路由规则保持不变。
+
+        Returns:
+            新的路由分发表
+        """
+        for name, module in self.modules.items():
+            try:
+                self._supported_types[name] = frozenset(module.get_supported_types())
+            except Exception as e:
+                self._supported_types[name] = frozenset()
+                self.logger.warning(f"读取模块 {name} 支持的数据类型失败: {e}")
+        return self._rebuild_routing_table()
+
     def get_pipeline(self) -> DataPipeline:
         """获取全局处理管道"""
         return self.pipeline
@@ -274,34 +806,199 @@ class DataFlowManager:
         return {
             "total_modules": len(self.modules),
             "total_routing_rules": len(self._routing_rules),
+            "routing_table_version": self._routing_table.version,
             "pipeline_processors": len(self.pipeline.processors),
+            "queued_modules": len(self._queues),
         }
 
     def _setup_routing_for_module(self, name: str, module: DataModule) -> None:
         """为模块设置自动路由规则"""
         try:
             supported_types = module.get_supported_types()
+            self._supported_types[name] = frozenset(supported_types)
             for data_type in supported_types:
                 if data_type not in self._routing_rules:
                     self._routing_rules[data_type] = []
                 if name not in self._routing_rules[data_type]:
                     self._routing_rules[data_type].append(name)
         except Exception as e:
+            self._supported_types[name] = frozenset()
             self.logger.warning(f"为模块 {name} 设置路由规则失败: {e}")
 
     def _cleanup_routing_for_module(self, name: str) -> None:
         """清理模块的路由规则"""
+        self._supported_types.pop(name, None)
         for data_type, module_names in self._routing_rules.items():
             if name in module_names:
                 module_names.remove(name)
 
-    def _get_compatible_modules(self, data_type: DataType) -> list[str]:
-        """获取支持指定数据类型的模块列表"""
-        compatible = []
-        for name, module in self.modules.items():
+    def _build_dispatch_tasks(
+        self,
+        modules: tuple[tuple[str, DataModule], ...],
+        data: BaseDataModel,
+        use_async: bool,
+        profiler: PipelineProfiler | None = None,
+    ) -> list[BranchTask]:
+        """构造模块分发任务
+
+        启用剖析时同步模块调用会被包装为剖析阶段（进程池后端除外，剖析器无法跨进程）。
+        """
+        if self.dispatch_engine.backend == ExecutionBackend.PROCESS:
+            profiler = None
+
+        tasks = []
+        for name, module in modules:
+            aprocess_data = getattr(module, "aprocess_data", None)
+            func: Callable[..., ProcessingResult | Awaitable[ProcessingResult]]
+            if use_async and aprocess_data is not None and inspect.iscoroutinefunction(aprocess_data):
+                func, args = _acall_dispatched_module, (name, aprocess_data, data)
+            else:
+                func, args = _call_dispatched_module, (name, module, data)
+                if profiler is not None:
+                    func = profiler.wrap(f"module:{name}", func)
+            timeout = self._module_timeouts.get(name, self.module_timeout)
+            tasks.append(BranchTask(name=name, func=func, args=args, timeout=timeout))
+        return tasks
+
+    def _collect_dispatch_results(
+        self, outcomes: list[BranchOutcome], route_span: TimingSpan
+    ) -> list[ProcessingResult]:
+        """汇总模块分发结果并记录耗时
+
+        所有结果共享本次自动路由的计时树，每个模块对应一个子区间；
+        在线程池或进程池中执行的模块区间在这里挂载到路由区间下。
+        """
+        results = []
+        for outcome in outcomes:
+            result = outcome.result
+            if outcome.timed_out:
+                result = ProcessingResult.trusted_error(
+                    error=f"自动路由到模块 {outcome.name} 超时",
+                    processing_time=outcome.elapsed,
+                    error_code="MODULE_TIMEOUT",
+                    processor_name=outcome.name,
+                )
+            result.branch_timings[outcome.name] = outcome.elapsed
+            module_span = result.timing
+            if module_span is None:
+                module_span = TimingSpan.from_elapsed(f"module:{outcome.name}", route_span.start_ns, outcome.elapsed)
+            route_span.attach(module_span)
+            result.timing = route_span
+            self.logger.debug(f"自动路由到模块 {outcome.name} 完成，耗时 {outcome.elapsed:.3f}s")
+            results.append(result)
+        return results
+
+    async def _acall_module(
+        self, name: str, module: DataModule, data: BaseDataModel, profiler: PipelineProfiler | None = None
+    ) -> ProcessingResult:
+        """异步调用模块，同步模块卸载到线程池
+
+        启用剖析时，同步模块在工作线程内剖析；异步模块只剖析事件循环线程上的执行。
+        """
+        aprocess_data = getattr(module, "aprocess_data", None)
+        if aprocess_data is not None and inspect.iscoroutinefunction(aprocess_data):
+            active_profile = profiler.start(f"module:{name}") if profiler is not None else None
             try:
-                if data_type in module.get_supported_types():
-                    compatible.append(name)
-            except Exception as e:
-                self.logger.warning(f"检查模块 {name} 兼容性失败: {e}")
-        return compatible
+                return await aprocess_data(data)
+            finally:
+                if active_profile is not None:
+                    active_profile.stop()
+
+        process_data = module.process_data
+        if profiler is not None:
+            process_data = profiler.wrap(f"module:{name}", process_data)
+        return await asyncio.to_thread(process_data, data)
+
+    def _split_queued(
+        self, modules: tuple[tuple[str, DataModule], ...]
+    ) -> tuple[list[tuple[str, ModuleQueue]], tuple[tuple[str, DataModule], ...]]:
+        """将模块分为有输入队列的和直接调用的两组"""
+        if not self._queues:
+            return [], modules
+        queues = []
+        direct = []
+        for name, module in modules:
+            queue = self._queues.get(name)
+            if queue is None:
+                direct.append((name, module))
+            else:
+                queues.append((name, queue))
+        return queues, tuple(direct)
+
+    def _timeout_for(self, name: str) -> float | None:
+        """模块的超时时间"""
+        return self._module_timeouts.get(name, self.module_timeout)
+
+    def _wait_queued(self, call: _QueuedCall) -> BranchOutcome:
+        """等待队列调用完成"""
+        try:
+            result = call.future.result(timeout=call.remaining(self._timeout_for(call.name)))
+        except TimeoutError:
+            return call.timeout_outcome()
+        except Exception as e:
+            return call.failure_outcome(e)
+        return BranchOutcome(name=call.name, result=result, elapsed=call.elapsed)
+
+    async def _await_queued(self, call: _QueuedCall) -> BranchOutcome:
+        """异步等待队列调用完成"""
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(call.future), call.remaining(self._timeout_for(call.name))
+            )
+        except TimeoutError:
+            return call.timeout_outcome()
+        except Exception as e:
+            return call.failure_outcome(e)
+        return BranchOutcome(name=call.name, result=result, elapsed=call.elapsed)
+
+    @staticmethod
+    def _merge_outcomes(
+        modules: tuple[tuple[str, DataModule], ...],
+        direct_outcomes: list[BranchOutcome],
+        queued_outcomes: list[BranchOutcome],
+    ) -> list[BranchOutcome]:
+        """按模块注册顺序合并直接调用和队列调用的结果"""
+        queued = {outcome.name: outcome for outcome in queued_outcomes}
+        direct = iter(direct_outcomes)
+        return [queued[name] if name in queued else next(direct) for name, _ in modules]
+
+    def _call_queued_module(self, name: str, module: DataModule, data: BaseDataModel) -> ProcessingResult:
+        """队列工作线程中调用模块（需要剖析时在工作线程内剖析）"""
+        profiler = self._sample_profiler()
+        if profiler is None:
+            return _call_dispatched_module(name, module, data)
+        return profiler.wrap(f"module:{name}", _call_dispatched_module)(name, module, data)
+
+    def _sample_profiler(self) -> PipelineProfiler | None:
+        """本次调用需要剖析时返回剖析器"""
+        profiler = self.profiler
+        return profiler if profiler is not None and profiler.should_sample() else None
+
+    def _supports(self, name: str, data_type: DataType) -> bool:
+        """模块是否支持指定数据类型（按注册时缓存的支持类型判断）"""
+        return data_type in self._supported_types.get(name, ())
+
+    def _get_async_limiter(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发限制信号量"""
+        loop = asyncio.get_running_loop()
+        if self._async_limiter is None or self._async_limiter[0] is not loop:
+            self._async_limiter = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._async_limiter[1]
+
+    def _rebuild_routing_table(self) -> RoutingTable:
+        """根据路由规则和已注册模块重建不可变路由表（跳过不支持对应数据类型的模块）"""
+        routes = {
+            data_type: tuple(
+                (name, self.modules[name])
+                for name in module_names
+                if name in self.modules and self._supports(name, data_type)
+            )
+            for data_type, module_names in self._routing_rules.items()
+        }
+        self._routing_table = RoutingTable(
+            version=self._routing_table.version + 1,
+            routes=MappingProxyType(routes),
+            supported_types=MappingProxyType(dict(self._supported_types)),
+        )
+        self.logger.debug(f"重建路由表，版本 {self._routing_table.version}")
+        return self._routing_table
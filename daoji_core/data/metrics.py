@@ -0,0 +1,264 @@
+"""
+管道运行指标
+提供处理器级别的调用计数、延迟分布统计和Prometheus文本格式导出
+"""
+
+import sys
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any
+
+# 延迟桶上界（秒）：1微秒到约100秒，相邻桶按1.25倍递增，分位数相对误差不超过25%
+DEFAULT_BUCKETS: tuple[float, ...] = tuple(1e-6 * 1.25**i for i in range(83))
+
+# 导出的延迟分位数
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """固定分桶的延迟直方图
+
+    记录开销为一次二分查找，内存占用与样本数无关；
+    分位数通过桶内线性插值估算，并限制在观测到的最小值和最大值之间。
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float, count: int = 1) -> None:
+        """记录样本
+
+        Args:
+            seconds: 单个样本的耗时
+            count: 具有相同耗时的样本数（批处理时为批次大小）
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += count
+        self.count += count
+        self.total += seconds * count
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """估算分位数
+
+        Args:
+            q: 分位点（0-1）
+
+        Returns:
+            估算的耗时（秒），没有样本时返回 0.0
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = self.bounds[index - 1] if index > 0 else 0.0
+            upper = self.bounds[index] if index < len(self.bounds) else self.max
+            estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+            return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, float]:
+        """导出统计摘要"""
+        summary = {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}"] = self.quantile(q)
+        return summary
+
+
+class StageMetrics:
+    """单个处理阶段（处理器或整个管道）的运行指标"""
+
+    __slots__ = ("name", "calls", "skips", "errors", "allocations", "latency", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.skips = 0
+        self.errors = 0
+        self.allocations = 0
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, errors: int = 0, count: int = 1, allocations: int | None = None) -> None:
+        """记录一次调用
+
+        Args:
+            seconds: 调用总耗时
+            errors: 失败的记录数
+            count: 处理的记录数，批处理时耗时按记录数均摊
+            allocations: 调用期间新增的内存块数，None 表示未追踪
+        """
+        with self._lock:
+            self.calls += count
+            self.errors += errors
+            if allocations is not None:
+                self.allocations += allocations
+            self.latency.observe(seconds / count, count)
+
+    def record_skip(self, count: int = 1) -> None:
+        """记录跳过的记录数"""
+        with self._lock:
+            self.skips += count
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出指标快照"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "skips": self.skips,
+                "errors": self.errors,
+                "allocations": self.allocations,
+                "latency": self.latency.to_dict(),
+            }
+
+
+class PipelineMetrics:
+    """管道运行指标
+
+    分别统计管道整体和每个处理器的调用数、跳过数、错误数和延迟分布。
+    开启 track_allocations 后额外记录每次调用期间新增的内存块数
+    （基于 sys.getallocatedblocks，为进程级近似值，多线程并发时会相互干扰）。
+    """
+
+    def __init__(self, pipeline_name: str, track_allocations: bool = False):
+        self.pipeline_name = pipeline_name
+        self.track_allocations = track_allocations
+        self.pipeline = StageMetrics(pipeline_name)
+        self.processors: dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, processor_name: str) -> StageMetrics:
+        """获取处理器指标，不存在时创建"""
+        stage = self.processors.get(processor_name)
+        if stage is None:
+            with self._lock:
+                stage = self.processors.setdefault(processor_name, StageMetrics(processor_name))
+        return stage
+
+    def mark(self) -> int | None:
+        """记录当前已分配内存块数，未开启分配追踪时返回 None"""
+        return sys.getallocatedblocks() if self.track_allocations else None
+
+    def record(
+        self, processor_name: str, seconds: float, errors: int = 0, count: int = 1, mark: int | None = None
+    ) -> None:
+        """记录处理器调用
+
+        Args:
+            processor_name: 处理器名称
+            seconds: 调用耗时
+            errors: 失败的记录数
+            count: 处理的记录数
+            mark: 调用前 mark() 的返回值
+        """
+        allocations = None if mark is None else sys.getallocatedblocks() - mark
+        self.stage(processor_name).record(seconds, errors, count, allocations)
+
+    def record_skip(self, processor_name: str, count: int = 1) -> None:
+        """记录处理器跳过的记录数"""
+        self.stage(processor_name).record_skip(count)
+
+    def record_pipeline(self, seconds: float, errors: int = 0, count: int = 1, mark: int | None = None) -> None:
+        """记录管道整体执行"""
+        allocations = None if mark is None else sys.getallocatedblocks() - mark
+        self.pipeline.record(seconds, errors, count, allocations)
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        with self._lock:
+            self.pipeline = StageMetrics(self.pipeline_name)
+            self.processors = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出指标快照"""
+        return {
+            "track_allocations": self.track_allocations,
+            "pipeline": self.pipeline.snapshot(),
+            "processors": {name: stage.snapshot() for name, stage in list(self.processors.items())},
+        }
+
+    def to_prometheus(self, prefix: str = "daoji") -> str:
+        """导出为Prometheus文本格式"""
+        return export_prometheus([self], prefix)
+
+
+def _escape_label(value: str) -> str:
+    """转义Prometheus标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """格式化Prometheus标签"""
+    return ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+
+
+def export_prometheus(metrics: Iterable[PipelineMetrics], prefix: str = "daoji") -> str:
+    """将多个管道的指标导出为Prometheus文本格式
+
+    管道整体指标以 {prefix}_pipeline_ 为前缀，处理器指标以 {prefix}_processor_ 为前缀，
+    延迟以 summary 类型导出 p50/p95/p99 分位数。
+
+    Args:
+        metrics: 管道指标集合
+        prefix: 指标名前缀
+
+    Returns:
+        Prometheus文本格式字符串
+    """
+    series: list[tuple[str, dict[str, str], dict[str, Any]]] = []
+    for pipeline_metrics in metrics:
+        snapshot = pipeline_metrics.snapshot()
+        series.append(("pipeline", {"pipeline": pipeline_metrics.pipeline_name}, snapshot["pipeline"]))
+        for name, stage in snapshot["processors"].items():
+            series.append(("processor", {"pipeline": pipeline_metrics.pipeline_name, "processor": name}, stage))
+
+    lines: list[str] = []
+    for scope in ("pipeline", "processor"):
+        scoped = [(labels, stage) for kind, labels, stage in series if kind == scope]
+        if not scoped:
+            continue
+
+        for field, help_text in (
+            ("calls", "处理的记录数"),
+            ("skips", "跳过的记录数"),
+            ("errors", "失败的记录数"),
+            ("allocations", "新增的内存块数"),
+        ):
+            metric = f"{prefix}_{scope}_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{{{_format_labels(labels)}}} {stage[field]}" for labels, stage in scoped)
+
+        metric = f"{prefix}_{scope}_latency_seconds"
+        lines.append(f"# HELP {metric} 单条记录处理耗时")
+        lines.append(f"# TYPE {metric} summary")
+        for labels, stage in scoped:
+            latency = stage["latency"]
+            for q in QUANTILES:
+                quantile_labels = _format_labels({**labels, "quantile": str(q)})
+                lines.append(f"{metric}{{{quantile_labels}}} {latency[f'p{round(q * 100)}']:.9f}")
+            lines.append(f"{metric}_sum{{{_format_labels(labels)}}} {latency['sum']:.9f}")
+            lines.append(f"{metric}_count{{{_format_labels(labels)}}} {latency['count']}")
+
+    return "\n".join(lines) + "\n" if lines else ""
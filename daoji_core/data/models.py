@@ -3,12 +3,86 @@
 提供统一的数据结构和类型安全的数据模型
 """
 
+import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from pathlib import Path
+from typing import Any, ClassVar
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator
+from pydantic_core import PydanticUndefined
+
+from .image_io import is_buffer, map_file, probe_image, read_file_header
+from .timing import TimingSpan
+
+# 可信构造模板：(静态默认值, 默认工厂, 必填字段, 私有属性)
+_TrustedTemplate = tuple[dict[str, Any], tuple[tuple[str, Callable[[], Any]], ...], frozenset[str], dict[str, Any]]
+
+# 可信构造模板缓存：模型类 → 模板
+_TRUSTED_TEMPLATES: dict[type[BaseModel], _TrustedTemplate] = {}
+
+
+def _trusted_template(cls: type[BaseModel]) -> _TrustedTemplate:
+    """获取模型类的可信构造模板（首次调用时解析字段默认值）"""
+    template = _TRUSTED_TEMPLATES.get(cls)
+    if template is None:
+        defaults: dict[str, Any] = {}
+        factories: list[tuple[str, Callable[[], Any]]] = []
+        required: set[str] = set()
+        for name, info in cls.model_fields.items():
+            # 所有字段按声明顺序占位，构造时 update 不改变键顺序，与校验构造的字段顺序一致
+            defaults[name] = None
+            if info.default_factory is not None:
+                factories.append((name, info.default_factory))
+            elif info.default is PydanticUndefined:
+                required.add(name)
+            else:
+                defaults[name] = info.default
+        template = (defaults, tuple(factories), frozenset(required), dict(cls.__private_attributes__))
+        _TRUSTED_TEMPLATES[cls] = template
+    return template
+
+
+def construct_trusted[M: BaseModel](cls: type[M], values: dict[str, Any]) -> M:
+    """跳过校验快速构造模型实例
+
+    与 model_construct 语义一致，但字段默认值只在首次构造时解析一次
+    （model_construct 每次都会检查默认工厂的签名，对含 default_factory 的模型反而比校验更慢）。
+    只能用于类型已知正确的可信数据，外部输入仍应走正常校验。
+
+    Args:
+        cls: 模型类
+        values: 字段值
+
+    Returns:
+        模型实例
+    """
+    defaults, factories, required, private_attributes = _trusted_template(cls)
+    if not required.issubset(values):
+        raise TypeError(f"{cls.__name__} 缺少必填字段 {', '.join(sorted(required - values.keys()))}")
+
+    data = defaults.copy()
+    data.update(values)
+    for name, factory in factories:
+        if name not in values:
+            data[name] = factory()
+
+    private = {name: attr.get_default() for name, attr in private_attributes.items()} if private_attributes else None
+    return _install_trusted(cls, data, set(values), private)
+
 
-from pydantic import BaseModel, Field
+def _install_trusted[M: BaseModel](
+    cls: type[M], data: dict[str, Any], fields_set: set[str], private: dict[str, Any] | None
+) -> M:
+    """创建实例并直接写入字段字典（不调用 __init__）"""
+    instance = cls.__new__(cls)
+    object.__setattr__(instance, "__dict__", data)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", private)
+    return instance
 
 
 class DataType(str, Enum):
@@ -61,6 +135,28 @@ class BaseDataModel(BaseModel):
         """检查是否有指定元数据"""
         return key in self.metadata
 
+    @classmethod
+    def construct_trusted(cls, **values: Any) -> "BaseDataModel":
+        """跳过校验快速构造（用于框架内部和已校验数据派生的可信数据，外部输入应使用普通构造）"""
+        return construct_trusted(cls, values)
+
+    def evolve(self, **changes: Any) -> "BaseDataModel":
+        """派生修改了部分字段的副本（写时复制）
+
+        未修改的字段（包括大体积的 content/rows/data）与原对象共享引用，id 和 timestamp 保持不变，
+        不重新执行Pydantic校验，修改后的字段值由调用方保证正确；metadata 字典浅拷贝，
+        派生对象添加元数据不会影响原对象。rows 等可变容器是共享的，应整体替换而不是原地修改。
+
+        Args:
+            **changes: 需要修改的字段
+
+        Returns:
+            派生的数据对象
+        """
+        if "metadata" not in changes:
+            changes["metadata"] = dict(self.metadata)
+        return self.model_copy(update=changes)
+
 
 class TextData(BaseDataModel):
     """文本数据模型"""
@@ -91,6 +187,22 @@ class TextData(BaseDataModel):
         """检查文本是否为空"""
         return not self.content.strip()
 
+    @classmethod
+    def construct_trusted(cls, **values: Any) -> "TextData":
+        """按正常校验构造
+
+        TextData 的构造耗时主要在 id/timestamp 默认工厂，跳过校验并不更快，
+        因此直接走校验构造，保证 word_count 等派生字段与普通构造一致。
+        """
+        return cls(**values)
+
+    def evolve(self, **changes: Any) -> "TextData":
+        """派生副本，修改 content 且未指定 word_count 时重新计算词数"""
+        if "content" in changes and "word_count" not in changes:
+            content = changes["content"]
+            changes["word_count"] = len(content.split()) if content else None
+        return super().evolve(**changes)
+
 
 class TableData(BaseDataModel):
     """表格数据模型"""
@@ -146,13 +258,17 @@ class TableData(BaseDataModel):
 
 
 class ImageData(BaseDataModel):
-    """图像数据模型"""
+    """图像数据模型
+
+    data 可以是 bytes，也可以是 bytearray/memoryview/mmap 等支持 buffer 协议的对象，
+    校验和 model_copy 都不会复制图像数据；只提供 file_path 时可通过 get_buffer 惰性内存映射加载。
+    """
 
     type: DataType = DataType.IMAGE
 
     file_path: str | None = Field(None, description="图像文件路径")
 
-    data: bytes | None = Field(None, description="图像二进制数据")
+    data: Any = Field(None, description="图像二进制数据（bytes 或 buffer 对象）")
 
     format: str | None = Field(None, description="图像格式 (jpg, png, gif等)")
 
@@ -162,21 +278,261 @@ class ImageData(BaseDataModel):
 
     size_bytes: int | None = Field(None, description="文件大小（字节）")
 
+    _mapped: Any = PrivateAttr(default=None)
+
+    @field_validator("data")
+    @classmethod
+    def validate_data(cls, v: Any) -> Any:
+        """验证图像数据支持 buffer 协议（不复制数据）"""
+        if v is not None and not is_buffer(v):
+            raise ValueError(f"图像数据必须是 bytes 或支持 buffer 协议的对象，实际为 {type(v).__name__}")
+        return v
+
+    @field_serializer("data", when_used="json")
+    def serialize_data(self, v: Any) -> bytes | None:
+        """JSON序列化时转换为 bytes"""
+        return None if v is None else bytes(v)
+
     def has_file(self) -> bool:
         """检查是否有文件路径"""
         return bool(self.file_path)
 
     def has_data(self) -> bool:
         """检查是否有二进制数据"""
-        return bool(self.data)
+        return self.data is not None and len(self.data) > 0
+
+    def load(self, use_mmap: bool = True) -> "ImageData":
+        """从 file_path 加载图像数据（已有数据时不做任何操作）
+
+        Args:
+            use_mmap: 是否以只读内存映射方式加载，否则一次性读入 bytes
+
+        Returns:
+            当前实例
+        """
+        if self.data is not None:
+            return self
+        if not self.file_path:
+            raise ValueError("图像没有数据也没有文件路径")
+
+        if use_mmap:
+            self.data = map_file(self.file_path)
+            self._mapped = self.data
+        else:
+            self.data = Path(self.file_path).read_bytes()
+        self.size_bytes = len(self.data)
+        return self
+
+    def get_buffer(self) -> memoryview:
+        """获取图像数据的零拷贝视图（必要时惰性加载）"""
+        return memoryview(self.load().data)
+
+    def get_bytes(self) -> bytes:
+        """获取图像数据的 bytes 副本"""
+        data = self.load().data
+        return data if isinstance(data, bytes) else bytes(data)
+
+    def probe_metadata(self) -> "ImageData":
+        """解析图像头补全格式和尺寸（不解码像素，未加载时只读取文件头）
+
+        Returns:
+            当前实例
+        """
+        if self.data is not None:
+            info = probe_image(self.data)
+            self.size_bytes = len(self.data)
+        elif self.file_path:
+            info = probe_image(read_file_header(self.file_path))
+            self.size_bytes = Path(self.file_path).stat().st_size
+        else:
+            return self
+
+        if info is not None:
+            image_format, width, height = info
+            self.format = self.format or image_format
+            self.width = self.width or width
+            self.height = self.height or height
+        return self
+
+    def evolve(self, **changes: Any) -> "ImageData":
+        """派生副本，图像数据共享引用，内存映射仍归原对象所有（由原对象负责 release）"""
+        clone = super().evolve(**changes)
+        clone._mapped = None
+        return clone
+
+    def release(self) -> None:
+        """释放内存映射（释放前需确保没有仍在使用的 memoryview）"""
+        if self._mapped is not None:
+            if self.data is self._mapped:
+                self.data = None
+            self._mapped.close()
+            self._mapped = None
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """pickle时将 buffer 对象转换为 bytes，内存映射不跨进程传递"""
+        state = super().__getstate__()
+        data = state["__dict__"].get("data")
+        if data is not None and not isinstance(data, bytes):
+            state["__dict__"] = {**state["__dict__"], "data": bytes(data)}
+        if state.get("__pydantic_private__"):
+            state["__pydantic_private__"] = {**state["__pydantic_private__"], "_mapped": None}
+        return state
+
+
+class BaseRecord:
+    """轻量记录基类
+
+    与 BaseDataModel 提供相同的访问接口，但不经过Pydantic校验：
+    - id 在首次访问时生成
+    - 仅记录创建时的时间戳数值，首次访问 timestamp 时才构造 datetime
+    - metadata 在首次写入时才创建字典
+
+    适用于框架内部和可信数据源的高吞吐场景，外部输入仍应使用 BaseDataModel 校验。
+    """
+
+    __slots__ = ("_id", "_created", "_timestamp", "_metadata", "source")
+
+    type: ClassVar[DataType]
+    model_class: ClassVar[type[BaseDataModel]]
+    _fields: ClassVar[tuple[str, ...]] = ()
+    _registry: ClassVar[dict[DataType, type["BaseRecord"]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "type" in cls.__dict__:
+            BaseRecord._registry[cls.type] = cls
+
+    def __init__(
+        self,
+        *,
+        id: str | None = None,
+        timestamp: datetime | None = None,
+        metadata: dict[str, Any] | None = None,
+        source: str | None = None,
+    ):
+        self._id = id
+        self._created = time.time()
+        self._timestamp = timestamp
+        self._metadata = metadata
+        self.source = source
+
+    @property
+    def id(self) -> str:
+        """数据唯一标识（首次访问时生成）"""
+        if self._id is None:
+            self._id = str(uuid.uuid4())
+        return self._id
+
+    @property
+    def timestamp(self) -> datetime:
+        """创建时间"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created)
+        return self._timestamp
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """元数据"""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    def add_metadata(self, key: str, value: Any) -> None:
+        """添加元数据"""
+        self.metadata[key] = value
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """获取元数据"""
+        if self._metadata is None:
+            return default
+        return self._metadata.get(key, default)
+
+    def has_metadata(self, key: str) -> bool:
+        """检查是否有指定元数据"""
+        return self._metadata is not None and key in self._metadata
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典（字段与对应的数据模型一致）"""
+        values = {
+            "id": self.id,
+            "type": self.type,
+            "timestamp": self.timestamp,
+            "metadata": self.metadata,
+            "source": self.source,
+        }
+        for name in self._fields:
+            values[name] = getattr(self, name)
+        return values
+
+    def to_model(self) -> BaseDataModel:
+        """转换为Pydantic数据模型（会执行完整校验）"""
+        return self.model_class(**self.to_dict())
+
+    @classmethod
+    def from_model(cls, model: BaseDataModel) -> "BaseRecord":
+        """从Pydantic数据模型创建记录"""
+        record_class = BaseRecord._registry.get(model.type)
+        if record_class is None:
+            raise ValueError(f"不支持的数据类型: {model.type}")
+        if cls is not BaseRecord and record_class is not cls:
+            raise ValueError(f"{cls.__name__} 不能由 {type(model).__name__} 创建")
+
+        values = {name: getattr(model, name) for name in record_class._fields}
+        return record_class(
+            id=model.id,
+            timestamp=model.timestamp,
+            metadata=model.metadata,
+            source=model.source,
+            **values,
+        )
+
+    def model_copy(self, update: dict[str, Any] | None = None, deep: bool = False) -> "BaseRecord":
+        """浅拷贝记录并更新字段（与 BaseModel.model_copy 接口一致，不支持深拷贝）"""
+        if deep:
+            raise ValueError("轻量记录不支持深拷贝")
+
+        clone = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(self, slot):
+                    object.__setattr__(clone, slot, getattr(self, slot))
+        for name, value in (update or {}).items():
+            if name in ("id", "timestamp", "metadata"):
+                object.__setattr__(clone, f"_{name}", value)
+            else:
+                setattr(clone, name, value)
+        return clone
+
+    def evolve(self, **changes: Any) -> "BaseRecord":
+        """派生修改了部分字段的副本（写时复制，语义与 BaseDataModel.evolve 一致）"""
+        if "metadata" not in changes and self._metadata is not None:
+            changes["metadata"] = dict(self._metadata)
+        return self.model_copy(update=changes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BaseRecord) or type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id='{self.id}', type='{self.type.value}')"
+
+
+# 可信构造结果时记录为显式设置的字段（与 success_result/error_result 一致）
+_SUCCESS_FIELDS = frozenset({"success", "data", "processing_time", "processor_name", "timing"})
+_ERROR_FIELDS = frozenset({"success", "error", "error_code", "processing_time", "processor_name", "timing"})
 
 
 class ProcessingResult(BaseModel):
     """数据处理结果模型"""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     success: bool = Field(description="处理是否成功")
 
-    data: BaseDataModel | None = Field(None, description="处理后的数据")
+    data: BaseDataModel | BaseRecord | None = Field(None, description="处理后的数据")
 
     error: str | None = Field(None, description="错误信息")
 
@@ -188,6 +544,15 @@ class ProcessingResult(BaseModel):
 
     warnings: list[str] = Field(default_factory=list, description="警告信息列表")
 
+    branch_timings: dict[str, float] = Field(default_factory=dict, description="各分支处理时间（秒）")
+
+    timing: TimingSpan | None = Field(None, description="计时树（管道、处理器和模块调用的嵌套耗时）")
+
+    @field_serializer("timing")
+    def _serialize_timing(self, timing: TimingSpan | None) -> dict[str, Any] | None:
+        """计时树序列化为字典"""
+        return timing.to_dict() if timing is not None else None
+
     def add_warning(self, warning: str) -> None:
         """添加警告信息"""
         self.warnings.append(warning)
@@ -198,14 +563,58 @@ class ProcessingResult(BaseModel):
 
     @classmethod
     def success_result(
-        cls, data: BaseDataModel, processing_time: float, processor_name: str | None = None
+        cls,
+        data: BaseDataModel | BaseRecord,
+        processing_time: float,
+        processor_name: str | None = None,
+        timing: TimingSpan | None = None,
     ) -> "ProcessingResult":
         """创建成功结果"""
-        return cls(success=True, data=data, processing_time=processing_time, processor_name=processor_name)
+        return cls(
+            success=True, data=data, processing_time=processing_time, processor_name=processor_name, timing=timing
+        )
+
+    @classmethod
+    def trusted_success(
+        cls,
+        data: BaseDataModel | BaseRecord,
+        processing_time: float,
+        processor_name: str | None = None,
+        timing: TimingSpan | None = None,
+    ) -> "ProcessingResult":
+        """创建成功结果（跳过校验，供框架内部使用）"""
+        if cls is not ProcessingResult:
+            return construct_trusted(
+                cls,
+                {
+                    "success": True,
+                    "data": data,
+                    "processing_time": processing_time,
+                    "processor_name": processor_name,
+                    "timing": timing,
+                },
+            )
+        values = {
+            "success": True,
+            "data": data,
+            "error": None,
+            "error_code": None,
+            "processing_time": processing_time,
+            "processor_name": processor_name,
+            "warnings": [],
+            "branch_timings": {},
+            "timing": timing,
+        }
+        return _install_trusted(cls, values, set(_SUCCESS_FIELDS), None)
 
     @classmethod
     def error_result(
-        cls, error: str, processing_time: float, error_code: str | None = None, processor_name: str | None = None
+        cls,
+        error: str,
+        processing_time: float,
+        error_code: str | None = None,
+        processor_name: str | None = None,
+        timing: TimingSpan | None = None,
     ) -> "ProcessingResult":
         """创建错误结果"""
         return cls(
@@ -214,4 +623,40 @@ class ProcessingResult(BaseModel):
             error_code=error_code,
             processing_time=processing_time,
             processor_name=processor_name,
+            timing=timing,
         )
+
+    @classmethod
+    def trusted_error(
+        cls,
+        error: str,
+        processing_time: float,
+        error_code: str | None = None,
+        processor_name: str | None = None,
+        timing: TimingSpan | None = None,
+    ) -> "ProcessingResult":
+        """创建错误结果（跳过校验，供框架内部使用）"""
+        if cls is not ProcessingResult:
+            return construct_trusted(
+                cls,
+                {
+                    "success": False,
+                    "error": error,
+                    "error_code": error_code,
+                    "processing_time": processing_time,
+                    "processor_name": processor_name,
+                    "timing": timing,
+                },
+            )
+        values = {
+            "success": False,
+            "data": None,
+            "error": error,
+            "error_code": error_code,
+            "processing_time": processing_time,
+            "processor_name": processor_name,
+            "warnings": [],
+            "branch_timings": {},
+            "timing": timing,
+        }
+        return _install_trusted(cls, values, set(_ERROR_FIELDS), None)
@@ -3,15 +3,101 @@
 提供链式数据处理和转换功能
 """
 
+import asyncio
 import logging
+import queue
+import threading
 import time
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-
-from .models import BaseDataModel, ProcessingResult
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Generator, Iterable, Iterator, Sequence
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from ..utils.exceptions import ProcessingError
+from .cache import ResultCache
+from .execution import BranchOutcome, BranchTask, ExecutionBackend, ExecutionEngine
+from .failures import DeadLetter, DeadLetterSink, FailurePolicy, RetryPolicy, error_code_for
+from .metrics import PipelineMetrics
+from .models import BaseDataModel, BaseRecord, DataType, ProcessingResult
+from .plan import ExecutionPlan, PlanStep
+from .profiling import PipelineProfiler
+from .timing import TimingSpan, enter_span, exit_span
 
 logger = logging.getLogger(__name__)
 
+_END_OF_STREAM = object()
+
+# 流式处理中的数据块：(原始输入, 当前数据, 失败结果, 块计时区间, 本块使用的剖析器)
+_Chunk = tuple[
+    list[BaseDataModel], list[BaseDataModel], list[ProcessingResult | None], TimingSpan, PipelineProfiler | None
+]
+
+
+def _chunked[T](iterator: Iterator[T], size: int) -> Iterator[list[T]]:
+    """将迭代器切分为固定大小的数据块"""
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _aiter[T](iterable: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    """统一同步和异步迭代器"""
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+def _prefetch[T](iterator: Iterator[T], depth: int) -> Generator[T, None, None]:
+    """在后台线程中预读迭代器
+
+    最多预读 depth 条尚未被消费的记录：没有空位时生产者阻塞（背压），不会提前从源迭代器多取一条；
+    消费者提前退出时生产者线程随之结束，源迭代器抛出的异常会在消费者一侧重新抛出。
+    """
+    buffer: queue.SimpleQueue[tuple[Any, BaseException | None]] = queue.SimpleQueue()
+    slots = threading.Semaphore(depth)
+    stop = threading.Event()
+
+    def acquire() -> bool:
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def produce() -> None:
+        try:
+            while True:
+                if not acquire():
+                    return
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                buffer.put((item, None))
+        except BaseException as e:
+            buffer.put((_END_OF_STREAM, e))
+            return
+        buffer.put((_END_OF_STREAM, None))
+
+    producer = threading.Thread(target=produce, name="daoji-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _END_OF_STREAM:
+                if error is not None:
+                    raise error
+                return
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+
 
 class DataProcessor(ABC):
     """数据处理器抽象基类
@@ -20,8 +106,20 @@ class DataProcessor(ABC):
     - 处理数据的核心方法
     - 检查是否可以处理特定数据
     - 处理器名称和描述
+
+    子类可声明 supported_types，表示 can_process 仅取决于数据类型，
+    编译后的执行计划据此按类型分组，不再逐条调用 can_process。
+
+    数据传递约定：
+    - 默认不得修改输入数据，需要变更时返回 data.evolve(...) 派生的副本，
+      未修改的字段共享引用，id 和 timestamp 保持不变，不重新校验
+    - 声明 in_place = True 的处理器可以直接给输入数据的字段赋值并返回该对象（或 data=None），
+      管道在首次执行此类处理器前对调用方传入的数据做一次写时复制，调用方的对象不会被修改
     """
 
+    supported_types: tuple[DataType, ...] | None = None
+    in_place: bool = False
+
     def __init__(self, name: str | None = None):
         self.name = name or self.__class__.__name__
         self.logger = logging.getLogger(f"{__name__}.{self.name}")
@@ -54,6 +152,10 @@ class DataProcessor(ABC):
         """获取处理器描述"""
         return getattr(self, "__doc__", "") or f"{self.name} 数据处理器"
 
+    def get_version(self) -> str:
+        """获取处理器版本（处理逻辑变化时应更新 __version__ 使缓存失效）"""
+        return getattr(self, "__version__", "1.0.0")
+
     def validate_input(self, data: BaseDataModel) -> bool:
         """验证输入数据
 
@@ -87,6 +189,186 @@ class DataProcessor(ABC):
         """
         return result
 
+    def process_batch(self, items: list[BaseDataModel]) -> list[ProcessingResult]:
+        """批量处理数据
+
+        默认逐条执行 pre_process/process/post_process，单条记录的异常会转换为错误结果。
+        子类可重写此方法对整批数据进行向量化处理，返回列表须与输入等长且顺序一致。
+
+        Args:
+            items: 输入数据列表
+
+        Returns:
+            与输入一一对应的处理结果列表
+        """
+        results = []
+        for item in items:
+            start_ns = time.perf_counter_ns()
+            try:
+                results.append(self.post_process(self.process(self.pre_process(item))))
+            except Exception as e:
+                results.append(
+                    ProcessingResult.trusted_error(
+                        error=f"处理器 {self.name} 执行异常: {str(e)}",
+                        processing_time=(time.perf_counter_ns() - start_ns) / 1e9,
+                        error_code=error_code_for(e),
+                        processor_name=self.name,
+                    )
+                )
+        return results
+
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """异步处理数据
+
+        同步处理器默认将 process 卸载到线程池执行，避免阻塞事件循环。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            处理结果
+        """
+        return await asyncio.to_thread(self.process, data)
+
+
+class AsyncDataProcessor(DataProcessor):
+    """异步数据处理器抽象基类
+
+    适用于LLM调用、HTTP请求、数据库查询等I/O密集型处理：
+    - 子类实现 aprocess 协程
+    - 同步 process 在无运行中事件循环时通过 asyncio.run 执行
+    - process_batch 在单个事件循环中以有限并发处理整批数据
+    """
+
+    def __init__(self, name: str | None = None, max_concurrency: int = 10):
+        super().__init__(name)
+        self.max_concurrency = max_concurrency
+
+    @abstractmethod
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """异步处理数据
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            处理结果
+        """
+        pass
+
+    def process(self, data: BaseDataModel) -> ProcessingResult:
+        """同步处理数据（不能在运行中的事件循环内调用）"""
+        return asyncio.run(self.aprocess(data))
+
+    def process_batch(self, items: list[BaseDataModel]) -> list[ProcessingResult]:
+        """在单个事件循环中并发处理整批数据"""
+        return asyncio.run(self._aprocess_batch(items))
+
+    async def _aprocess_batch(self, items: list[BaseDataModel]) -> list[ProcessingResult]:
+        """以有限并发执行批量异步处理"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(item: BaseDataModel) -> ProcessingResult:
+            async with semaphore:
+                start_ns = time.perf_counter_ns()
+                try:
+                    return self.post_process(await self.aprocess(self.pre_process(item)))
+                except Exception as e:
+                    return ProcessingResult.trusted_error(
+                        error=f"处理器 {self.name} 执行异常: {str(e)}",
+                        processing_time=(time.perf_counter_ns() - start_ns) / 1e9,
+                        error_code=error_code_for(e),
+                        processor_name=self.name,
+                    )
+
+        return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+
+class CachedProcessor(DataProcessor):
+    """缓存处理器
+
+    包装另一个处理器，以 处理器名称 + 版本 + 数据内容哈希 为键缓存成功结果，
+    内容相同的数据再次出现时直接返回缓存结果，不再调用内部处理器。
+    缓存的是内部处理器 pre_process/process/post_process 的完整结果，
+    因此缓存键按原始输入计算。命中时输出数据绑定到当前输入的 id、timestamp 和元数据，
+    内容相同的不同记录各自得到独立的输出对象。
+    """
+
+    def __init__(self, processor: DataProcessor, cache: ResultCache):
+        super().__init__(processor.name)
+        self.processor = processor
+        self.cache = cache
+        self.supported_types = processor.supported_types
+        self.in_place = processor.in_place
+
+    def can_process(self, data: BaseDataModel) -> bool:
+        """沿用内部处理器的判断"""
+        return self.processor.can_process(data)
+
+    def get_description(self) -> str:
+        """获取内部处理器描述"""
+        return self.processor.get_description()
+
+    def get_version(self) -> str:
+        """获取内部处理器版本"""
+        return self.processor.get_version()
+
+    def process(self, data: BaseDataModel) -> ProcessingResult:
+        """命中缓存时直接返回，否则执行内部处理器并缓存成功结果"""
+        key = self._make_key(data)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._rebind(cached, data)
+
+        inner = self.processor
+        result = inner.post_process(inner.process(inner.pre_process(data)))
+        self.cache.set(key, result)
+        return result
+
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """异步版本的缓存处理"""
+        key = self._make_key(data)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._rebind(cached, data)
+
+        inner = self.processor
+        result = inner.post_process(await inner.aprocess(inner.pre_process(data)))
+        self.cache.set(key, result)
+        return result
+
+    def process_batch(self, items: list[BaseDataModel]) -> list[ProcessingResult]:
+        """只将未命中缓存的数据交给内部处理器批量处理"""
+        keys = [self._make_key(item) for item in items]
+        results: list[ProcessingResult | None] = []
+        missing = []
+        for i, (item, key) in enumerate(zip(items, keys, strict=True)):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(i)
+            results.append(None if cached is None else self._rebind(cached, item))
+
+        if missing:
+            computed = self.processor.process_batch([items[i] for i in missing])
+            for i, result in zip(missing, computed, strict=True):
+                self.cache.set(keys[i], result)
+                results[i] = result
+
+        return results  # type: ignore[return-value]
+
+    def _make_key(self, data: BaseDataModel) -> str:
+        """生成缓存键"""
+        return ResultCache.make_key(self.name, self.get_version(), data)
+
+    @staticmethod
+    def _rebind(cached: ProcessingResult, data: BaseDataModel) -> ProcessingResult:
+        """将缓存结果的输出数据绑定到当前输入的身份（id、timestamp 和元数据，处理器写入的元数据优先）"""
+        output = cached.data
+        if output is None:
+            return cached
+        cached.data = output.evolve(id=data.id, timestamp=data.timestamp, metadata={**data.metadata, **output.metadata})
+        return cached
+
 
 class DataPipeline:
     """数据处理管道
@@ -96,13 +378,27 @@ class DataPipeline:
     - 顺序执行处理器
     - 错误处理和恢复
     - 处理过程监控
+
+    输入既可以是 BaseDataModel，也可以是 BaseRecord 轻量记录。
+    运行指标默认关闭（每条记录、每个处理器都要加锁记录延迟分布），
+    需要时通过 metrics=True 或 enable_metrics() 开启。
     """
 
-    def __init__(self, name: str | None = None):
+    def __init__(self, name: str | None = None, metrics: bool = False):
+        """
+        Args:
+            name: 管道名称
+            metrics: 是否开启运行指标
+        """
         self.name = name or "DataPipeline"
         self.processors: list[DataProcessor] = []
         self.logger = logging.getLogger(f"{__name__}.{self.name}")
-        self.enable_parallel = False  # 未来可扩展并行处理
+        self._plan: ExecutionPlan | None = None
+        self.metrics: PipelineMetrics | None = PipelineMetrics(self.name) if metrics else None
+        self.profiler: PipelineProfiler | None = None
+        self.failure_policy = FailurePolicy.CONTINUE
+        self.dead_letter: DeadLetterSink | None = None
+        self.retry_policy: RetryPolicy | None = None
 
     def add_processor(self, processor: DataProcessor) -> "DataPipeline":
         """添加处理器
@@ -114,6 +410,7 @@ class DataPipeline:
             管道实例（支持链式调用）
         """
         self.processors.append(processor)
+        self._plan = None
         self.logger.info(f"添加处理器: {processor.name}")
         return self
 
@@ -129,6 +426,7 @@ class DataPipeline:
         for i, processor in enumerate(self.processors):
             if processor.name == processor_name:
                 removed = self.processors.pop(i)
+                self._plan = None
                 self.logger.info(f"移除处理器: {removed.name}")
                 return True
         return False
@@ -136,80 +434,692 @@ class DataPipeline:
     def clear_processors(self) -> None:
         """清空所有处理器"""
         self.processors.clear()
+        self._plan = None
         self.logger.info("清空所有处理器")
 
     def get_processor_names(self) -> list[str]:
         """获取所有处理器名称"""
         return [processor.name for processor in self.processors]
 
-    def process(self, data: BaseDataModel) -> ProcessingResult:
-        """执行处理管道
+    def compile(self) -> ExecutionPlan:
+        """编译不可变的执行计划
+
+        预先解析每个处理器的类型过滤、钩子和处理方法：
+        - 声明了 supported_types 的处理器按数据类型分组，执行时不再调用 can_process
+        - 未重写的 pre_process/post_process 钩子在执行时直接跳过
+
+        增删处理器会使计划失效，下次执行时自动重新编译；
+        直接修改 processors 列表后需调用 invalidate_plan。
+
+        Returns:
+            执行计划
+        """
+        steps = tuple(
+            PlanStep(
+                index=index,
+                name=processor.name,
+                processor=processor,
+                process=processor.process,
+                accepts=None if processor.supported_types is None else frozenset(processor.supported_types),
+                can_process=processor.can_process,
+                pre_process=None if type(processor).pre_process is DataProcessor.pre_process else processor.pre_process,
+                post_process=(
+                    None if type(processor).post_process is DataProcessor.post_process else processor.post_process
+                ),
+                in_place=processor.in_place,
+            )
+            for index, processor in enumerate(self.processors)
+        )
+        routes = {
+            data_type: tuple(step for step in steps if step.accepts is None or data_type in step.accepts)
+            for data_type in DataType
+        }
+        plan = ExecutionPlan(
+            pipeline_name=self.name,
+            steps=steps,
+            routes=MappingProxyType(routes),
+            dynamic_steps=tuple(step for step in steps if step.accepts is None),
+        )
+        self._plan = plan
+        return plan
+
+    def enable_cache(self, cache: ResultCache, processor_names: list[str] | None = None) -> "DataPipeline":
+        """为处理器启用结果缓存
 
         Args:
-            data: 输入数据
+            cache: 结果缓存
+            processor_names: 需要缓存的处理器名称，None 表示所有处理器
 
         Returns:
-            最终处理结果
+            管道实例（支持链式调用）
         """
-        if not self.processors:
-            self.logger.warning("管道中没有处理器")
-            return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+        for i, processor in enumerate(self.processors):
+            if processor_names is not None and processor.name not in processor_names:
+                continue
+            if isinstance(processor, CachedProcessor):
+                processor = processor.processor
+            self.processors[i] = CachedProcessor(processor, cache)
+            self.logger.info(f"处理器 {processor.name} 启用结果缓存")
+        self._plan = None
+        return self
 
-        start_time = time.time()
-        current_data = data
-        processed_count = 0
+    def disable_cache(self) -> None:
+        """关闭所有处理器的结果缓存"""
+        self.processors = [p.processor if isinstance(p, CachedProcessor) else p for p in self.processors]
+        self._plan = None
+        self.logger.info("关闭结果缓存")
 
-        try:
-            for processor in self.processors:
-                if not processor.can_process(current_data):
-                    self.logger.debug(f"处理器 {processor.name} 跳过数据类型 {current_data.type}")
-                    continue
+    def enable_metrics(self, track_allocations: bool = False) -> PipelineMetrics:
+        """开启运行指标（重置已有指标）
 
-                self.logger.debug(f"执行处理器: {processor.name}")
-                processor_start = time.time()
+        Args:
+            track_allocations: 是否记录每次调用新增的内存块数
 
-                try:
-                    # 预处理
-                    preprocessed_data = processor.pre_process(current_data)
+        Returns:
+            管道指标
+        """
+        self.metrics = PipelineMetrics(self.name, track_allocations=track_allocations)
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        """关闭运行指标"""
+        self.metrics = None
+
+    def export_metrics(self, prefix: str = "daoji") -> str:
+        """以Prometheus文本格式导出运行指标"""
+        return self.metrics.to_prometheus(prefix) if self.metrics is not None else ""
+
+    def enable_profiling(
+        self,
+        output_dir: str | Path,
+        cpu: bool = True,
+        memory: bool = False,
+        sample_rate: int = 1,
+        top_n: int = 25,
+    ) -> PipelineProfiler:
+        """开启剖析模式
+
+        对每 sample_rate 次执行中的一次，逐个处理器启用 cProfile 和/或 tracemalloc，
+        结果按处理器归属，调用 disable_profiling 或 profiler.dump 写入 output_dir。
+        只剖析同步执行（process、process_batch、stream），aprocess 和 astream 不剖析。
+
+        Args:
+            output_dir: 剖析结果输出目录
+            cpu: 是否启用 cProfile CPU 剖析
+            memory: 是否启用 tracemalloc 内存分配剖析
+            sample_rate: 每 N 次执行剖析一次
+            top_n: 内存报告中列出的分配位置数
+
+        Returns:
+            管道剖析器
+        """
+        if self.profiler is not None:
+            self.profiler.close()
+        self.profiler = PipelineProfiler(
+            output_dir, name=self.name, cpu=cpu, memory=memory, sample_rate=sample_rate, top_n=top_n
+        )
+        self.logger.info(f"开启剖析模式，输出目录 {output_dir}，采样率 1/{sample_rate}")
+        return self.profiler
+
+    def disable_profiling(self, dump: bool = True) -> list[Path]:
+        """关闭剖析模式
+
+        Args:
+            dump: 是否将已收集的剖析结果写入输出目录
+
+        Returns:
+            写入的文件路径列表
+        """
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return []
+
+        profiler.close()
+        self.logger.info("关闭剖析模式")
+        return profiler.dump() if dump else []
+
+    def set_failure_policy(
+        self,
+        policy: FailurePolicy | str,
+        dead_letter: DeadLetterSink | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> "DataPipeline":
+        """设置批量/流式处理的失败策略
+
+        作用于 process_batch、stream 和 astream：
+        - continue: 失败记录以错误结果原位返回（默认）
+        - fail_fast: 遇到失败记录立即抛出 ProcessingError
+        - skip: 失败记录从输出中移除
+        - dead_letter: 失败记录连同原始输入写入死信输出，并从输出中移除
+
+        retry 同样作用于这三种模式（单条 process/aprocess 不重试）：每个处理器对错误代码属于临时性错误的记录
+        按退避策略重试，只重新执行失败的处理器，重试耗尽后的失败再交给失败策略处理。
+
+        Args:
+            policy: 失败策略
+            dead_letter: 死信输出，dead_letter 策略必须提供
+            retry: 临时性错误的重试策略，None 表示不重试
+
+        Returns:
+            管道实例（支持链式调用）
+        """
+        policy = FailurePolicy(policy)
+        if policy == FailurePolicy.DEAD_LETTER and dead_letter is None:
+            raise ValueError("dead_letter 策略需要提供死信输出")
+
+        self.failure_policy = policy
+        self.dead_letter = dead_letter
+        self.retry_policy = retry
+        self.logger.info(f"失败策略: {policy.value}，重试: {'开启' if retry is not None else '关闭'}")
+        return self
+
+    def invalidate_plan(self) -> None:
+        """使已编译的执行计划失效"""
+        self._plan = None
 
-                    # 核心处理
-                    result = processor.process(preprocessed_data)
+    def get_plan(self) -> ExecutionPlan:
+        """获取当前执行计划，未编译时自动编译"""
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        return plan
 
-                    # 后处理
-                    result = processor.post_process(result)
+    def _execute(
+        self, data: BaseDataModel, profile: bool = True
+    ) -> Generator[tuple[PlanStep, Any], ProcessingResult, ProcessingResult]:
+        """process/aprocess 共用的执行流程
+
+        依次产出 (步骤, 预处理后的数据)，调用方执行处理器后用 send 传回结果、用 throw 传回异常；
+        生成器返回最终处理结果。跳过、原地修改、计时区间、运行指标和剖析都在这里记录，
+        同步和异步版本只在调用处理器的方式上不同。
+
+        Args:
+            data: 输入数据
+            profile: 是否按采样率剖析处理器（剖析区间覆盖调用方执行处理器的整个过程）
 
-                    processor_time = time.time() - processor_start
-                    self.logger.debug(f"处理器 {processor.name} 完成，耗时 {processor_time:.3f}s")
+        Returns:
+            驱动执行的生成器
+        """
+        plan = self.get_plan()
+        pipeline_span, token = enter_span(self.name)
+        try:
+            if not plan.steps:
+                self.logger.warning("管道中没有处理器")
+                pipeline_span.finish()
+                return ProcessingResult.trusted_success(
+                    data=data, processing_time=pipeline_span.duration, processor_name=self.name, timing=pipeline_span
+                )
+
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            metrics = self.metrics
+            pipeline_mark = metrics.mark() if metrics is not None else None
+            profiler = self._sample_profiler() if profile else None
+            current_data = data
+            processed_count = 0
+
+            try:
+                data_type = current_data.type
+                steps = plan.steps_for(data_type)
+                position = 0
+                while position < len(steps):
+                    step = steps[position]
+                    position += 1
+
+                    if step.accepts is None and not step.can_process(current_data):
+                        if metrics is not None:
+                            metrics.record_skip(step.name)
+                        if debug_enabled:
+                            self.logger.debug(f"处理器 {step.name} 跳过数据类型 {current_data.type}")
+                        continue
+
+                    if debug_enabled:
+                        self.logger.debug(f"执行处理器: {step.name}")
+                    if step.in_place and current_data is data:
+                        current_data = current_data.evolve()
+                    mark = metrics.mark() if metrics is not None else None
+                    step_span, step_token = enter_span(step.name)
+                    active_profile = profiler.start(step.name) if profiler is not None else None
+
+                    try:
+                        try:
+                            # 预处理
+                            preprocessed_data = step.pre_process(current_data) if step.pre_process else current_data
+
+                            # 核心处理（由调用方执行后传回结果或异常）
+                            result = yield step, preprocessed_data
+
+                            # 后处理
+                            if step.post_process:
+                                result = step.post_process(result)
+                        finally:
+                            if active_profile is not None:
+                                active_profile.stop()
+                            exit_span(step_span, step_token)
+
+                    except Exception as e:
+                        error_msg = f"处理器 {step.name} 执行异常: {str(e)}"
+                        self.logger.error(error_msg)
+                        pipeline_span.finish()
+                        if metrics is not None:
+                            metrics.record(step.name, step_span.duration, errors=1, mark=mark)
+                            metrics.record_pipeline(pipeline_span.duration, errors=1, mark=pipeline_mark)
+
+                        return ProcessingResult.trusted_error(
+                            error=error_msg,
+                            processing_time=step_span.duration,
+                            error_code=error_code_for(e),
+                            processor_name=step.name,
+                            timing=pipeline_span,
+                        )
+
+                    if result.timing is not None:
+                        step_span.attach(result.timing)
+                    if metrics is not None:
+                        metrics.record(step.name, step_span.duration, errors=int(not result.success), mark=mark)
+                    if debug_enabled:
+                        self.logger.debug(f"处理器 {step.name} 完成，耗时 {step_span.duration:.3f}s")
 
                     if not result.success:
-                        self.logger.error(f"处理器 {processor.name} 处理失败: {result.error}")
+                        self.logger.error(f"处理器 {step.name} 处理失败: {result.error}")
+                        pipeline_span.finish()
+                        if metrics is not None:
+                            metrics.record_pipeline(pipeline_span.duration, errors=1, mark=pipeline_mark)
+                        result.timing = pipeline_span
                         return result
 
                     current_data = result.data or current_data
                     processed_count += 1
 
+                    if current_data.type != data_type:
+                        data_type = current_data.type
+                        steps, position = plan.resume_after(data_type, step.index)
+
+                pipeline_span.finish()
+                total_time = pipeline_span.duration
+                if metrics is not None:
+                    metrics.record_pipeline(total_time, mark=pipeline_mark)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"管道处理完成，共执行 {processed_count} 个处理器，总耗时 {total_time:.3f}s")
+
+                return ProcessingResult.trusted_success(
+                    data=current_data, processing_time=total_time, processor_name=self.name, timing=pipeline_span
+                )
+
+            except Exception as e:
+                pipeline_span.finish()
+                error_msg = f"管道执行异常: {str(e)}"
+                self.logger.error(error_msg)
+                if metrics is not None:
+                    metrics.record_pipeline(pipeline_span.duration, errors=1, mark=pipeline_mark)
+
+                return ProcessingResult.trusted_error(
+                    error=error_msg,
+                    processing_time=pipeline_span.duration,
+                    error_code=error_code_for(e),
+                    processor_name=self.name,
+                    timing=pipeline_span,
+                )
+        finally:
+            exit_span(pipeline_span, token)
+
+    def process(self, data: BaseDataModel) -> ProcessingResult:
+        """执行处理管道
+
+        结果的 timing 为本次执行的计时树，每个执行过的处理器对应一个子区间。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            最终处理结果
+        """
+        execution = self._execute(data)
+        try:
+            step, step_input = next(execution)
+            while True:
+                try:
+                    result = step.process(step_input)
                 except Exception as e:
-                    processor_time = time.time() - processor_start
-                    error_msg = f"处理器 {processor.name} 执行异常: {str(e)}"
-                    self.logger.error(error_msg)
+                    step, step_input = execution.throw(e)
+                else:
+                    step, step_input = execution.send(result)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            execution.close()
 
-                    return ProcessingResult.error_result(
-                        error=error_msg, processing_time=processor_time, processor_name=processor.name
-                    )
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """异步执行处理管道
 
-            total_time = time.time() - start_time
-            self.logger.info(f"管道处理完成，共执行 {processed_count} 个处理器，总耗时 {total_time:.3f}s")
+        异步处理器直接 await，同步处理器自动卸载到线程池执行。
+        不做剖析：await 期间事件循环线程会运行其他协程，无法归属到单个处理器。
 
-            return ProcessingResult.success_result(
-                data=current_data, processing_time=total_time, processor_name=self.name
-            )
+        结果的 timing 为本次执行的计时树，每个执行过的处理器对应一个子区间。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            最终处理结果
+        """
+        return await self._aprocess(data)
+
+    async def _aprocess(self, data: BaseDataModel, retry: RetryPolicy | None = None) -> ProcessingResult:
+        """异步执行处理管道，retry 不为 None 时每个处理器按退避策略重试临时性失败"""
+        execution = self._execute(data, profile=False)
+        try:
+            step, step_input = next(execution)
+            while True:
+                try:
+                    if retry is None:
+                        result = await step.processor.aprocess(step_input)
+                    else:
+                        result = await retry.arun(step.processor.aprocess, step_input, step.name)
+                except Exception as e:
+                    step, step_input = execution.throw(e)
+                else:
+                    step, step_input = execution.send(result)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            # 取消等异常中断时在当前上下文中关闭生成器，恢复计时区间的上下文变量
+            execution.close()
+
+    async def astream(
+        self, iterable: Iterable[BaseDataModel] | AsyncIterable[BaseDataModel], concurrency: int = 1
+    ) -> AsyncIterator[ProcessingResult]:
+        """异步流式执行处理管道
+
+        最多同时处理 concurrency 条记录，结果按输入顺序产出；
+        在途记录达到上限时暂停读取输入（背压）。失败记录按 set_failure_policy 设置的重试和失败策略处理。
+
+        Args:
+            iterable: 输入数据的同步或异步迭代器
+            concurrency: 最大并发记录数
+
+        Yields:
+            与输入顺序一致的处理结果
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency 必须大于0")
 
+        pending: deque[tuple[BaseDataModel, asyncio.Task[ProcessingResult]]] = deque()
+        retry = self.retry_policy
+        index = 0
+        try:
+            async for item in _aiter(iterable):
+                pending.append((item, asyncio.ensure_future(self._aprocess(item, retry))))
+                if len(pending) >= concurrency:
+                    data, task = pending.popleft()
+                    for result in self._apply_failure_policy([data], [await task], index):
+                        yield result
+                    index += 1
+            while pending:
+                data, task = pending.popleft()
+                for result in self._apply_failure_policy([data], [await task], index):
+                    yield result
+                index += 1
+        finally:
+            for _, task in pending:
+                task.cancel()
+            if self.dead_letter is not None:
+                self.dead_letter.flush()
+
+    def process_batch(self, items: Sequence[BaseDataModel], batch_size: int | None = None) -> list[ProcessingResult]:
+        """批量执行处理管道
+
+        每个处理器对整批数据只调用一次 process_batch，未重写该方法的处理器回退为逐条处理。
+        某条记录失败后不再进入后续处理器，其结果为失败处理器返回的错误结果；
+        成功记录的处理时间为批次总耗时的均摊值。
+
+        失败记录按 set_failure_policy 设置的策略处理，默认原位返回错误结果。
+
+        Args:
+            items: 输入数据序列
+            batch_size: 分块大小，None 表示整批处理
+
+        Returns:
+            处理结果列表；continue 策略下与输入一一对应，skip/dead_letter 策略下只包含成功结果
+        """
+        if batch_size is None:
+            batch_size = max(len(items), 1)
+        elif batch_size <= 0:
+            raise ValueError("batch_size 必须大于0")
+
+        results: list[ProcessingResult] = []
+        try:
+            for offset in range(0, len(items), batch_size):
+                chunk = list(items[offset : offset + batch_size])
+                results.extend(self._apply_failure_policy(chunk, self._process_chunk(chunk), offset))
+        finally:
+            if self.dead_letter is not None:
+                self.dead_letter.flush()
+        return results
+
+    def stream(
+        self, iterable: Iterable[BaseDataModel], batch_size: int = 1, prefetch: int = 0
+    ) -> Iterator[ProcessingResult]:
+        """流式执行处理管道
+
+        逐块惰性消费输入迭代器，每个处理器作为一个生成器阶段串联，
+        任意时刻只持有 prefetch + 每个阶段一个数据块的记录，内存占用与输入规模无关。
+
+        Args:
+            iterable: 输入数据迭代器
+            batch_size: 每个数据块的记录数，大于1时处理器通过 process_batch 整块处理
+            prefetch: 后台预读队列深度，0 表示不预读；队列满时阻塞读取（背压）
+
+        Yields:
+            与输入顺序一致的处理结果（失败记录按失败策略处理）
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于0")
+        if prefetch < 0:
+            raise ValueError("prefetch 不能为负数")
+
+        plan = self.get_plan()
+        if not plan.steps:
+            self.logger.warning("管道中没有处理器")
+
+        source: Iterator[BaseDataModel] = iter(iterable)
+        prefetched = _prefetch(source, prefetch) if prefetch else None
+        if prefetched is not None:
+            source = prefetched
+
+        chunks: Iterator[_Chunk] = (
+            (chunk, list(chunk), [None] * len(chunk), TimingSpan(self.name), self._sample_profiler())
+            for chunk in _chunked(source, batch_size)
+        )
+        for step in plan.steps:
+            chunks = self._stream_stage(step, chunks)
+
+        start_ns = time.perf_counter_ns()
+        total_count = failed_count = 0
+        try:
+            for originals, current, failures, chunk_span, _ in chunks:
+                chunk_span.finish()
+                chunk_failed = sum(1 for failure in failures if failure is not None)
+                if self.metrics is not None:
+                    self.metrics.record_pipeline(chunk_span.duration, errors=chunk_failed, count=len(current))
+                results = self._collect_results(current, failures, chunk_span)
+                yield from self._apply_failure_policy(originals, results, total_count)
+                total_count += len(current)
+                failed_count += chunk_failed
+        finally:
+            if prefetched is not None:
+                # 消费者提前退出时立即结束预读线程
+                prefetched.close()
+            if self.dead_letter is not None:
+                self.dead_letter.flush()
+
+        total_time = (time.perf_counter_ns() - start_ns) / 1e9
+        self.logger.info(f"管道流式处理完成，共 {total_count} 条记录，失败 {failed_count} 条，总耗时 {total_time:.3f}s")
+
+    def _stream_stage(self, step: PlanStep, chunks: Iterator[_Chunk]) -> Iterator[_Chunk]:
+        """将处理步骤包装为生成器阶段"""
+        for originals, current, failures, chunk_span, profiler in chunks:
+            self._run_stage(step, current, failures, chunk_span, profiler, originals)
+            yield originals, current, failures, chunk_span, profiler
+
+    def _process_chunk(self, items: list[BaseDataModel]) -> list[ProcessingResult]:
+        """处理单个数据块"""
+        if not items:
+            return []
+
+        plan = self.get_plan()
+        metrics = self.metrics
+        pipeline_mark = metrics.mark() if metrics is not None else None
+        current = list(items)
+        failures: list[ProcessingResult | None] = [None] * len(items)
+
+        profiler = self._sample_profiler()
+        pipeline_span, token = enter_span(self.name)
+        try:
+            if not plan.steps:
+                self.logger.warning("管道中没有处理器")
+            for step in plan.steps:
+                self._run_stage(step, current, failures, pipeline_span, profiler, items)
+        finally:
+            exit_span(pipeline_span, token)
+
+        total_time = pipeline_span.duration
+        failed_total = sum(1 for failure in failures if failure is not None)
+        if metrics is not None:
+            metrics.record_pipeline(total_time, errors=failed_total, count=len(items), mark=pipeline_mark)
+        self.logger.info(f"管道批处理完成，共 {len(items)} 条记录，失败 {failed_total} 条，总耗时 {total_time:.3f}s")
+
+        return self._collect_results(current, failures, pipeline_span)
+
+    def _run_stage(
+        self,
+        step: PlanStep,
+        current: list[BaseDataModel],
+        failures: list[ProcessingResult | None],
+        parent_span: TimingSpan,
+        profiler: PipelineProfiler | None = None,
+        originals: list[BaseDataModel] | None = None,
+    ) -> None:
+        """对数据块执行单个处理步骤，原地更新数据和失败结果
+
+        originals 为调用方传入的原始数据，原地修改的处理器执行前对仍是原始对象的数据做写时复制。
+        """
+        processor = step.processor
+        metrics = self.metrics
+        pending = [i for i, failure in enumerate(failures) if failure is None]
+        indices = [i for i in pending if step.applies_to(current[i])]
+        if metrics is not None and len(indices) < len(pending):
+            metrics.record_skip(step.name, len(pending) - len(indices))
+        if not indices:
+            return
+
+        if step.in_place and originals is not None:
+            for i in indices:
+                if current[i] is originals[i]:
+                    current[i] = current[i].evolve()
+
+        mark = metrics.mark() if metrics is not None else None
+        step_span, token = enter_span(step.name, parent=parent_span)
+        active_profile = profiler.start(step.name) if profiler is not None else None
+        try:
+            try:
+                batch = [current[i] for i in indices]
+                if self.retry_policy is None:
+                    results = processor.process_batch(batch)
+                else:
+                    results = self.retry_policy.run_batch(processor.process_batch, batch, processor.name)
+            finally:
+                if active_profile is not None:
+                    active_profile.stop()
+                exit_span(step_span, token)
+            if len(results) != len(indices):
+                raise ValueError(f"返回结果数({len(results)})与输入数({len(indices)})不匹配")
         except Exception as e:
-            total_time = time.time() - start_time
-            error_msg = f"管道执行异常: {str(e)}"
+            processor_time = step_span.duration
+            error_msg = f"处理器 {processor.name} 批处理异常: {str(e)}"
             self.logger.error(error_msg)
+            if metrics is not None:
+                metrics.record(step.name, processor_time, errors=len(indices), count=len(indices), mark=mark)
+            for i in indices:
+                failures[i] = ProcessingResult.trusted_error(
+                    error=error_msg,
+                    processing_time=processor_time,
+                    error_code=error_code_for(e),
+                    processor_name=processor.name,
+                )
+            return
+
+        failed_count = 0
+        for i, result in zip(indices, results, strict=True):
+            if result.success:
+                current[i] = result.data or current[i]
+            else:
+                failures[i] = result
+                failed_count += 1
+
+        processor_time = step_span.duration
+        if metrics is not None:
+            metrics.record(step.name, processor_time, errors=failed_count, count=len(indices), mark=mark)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"处理器 {processor.name} 批处理完成，{len(indices)} 条记录，失败 {failed_count} 条，耗时 {processor_time:.3f}s"
+            )
+
+    def _sample_profiler(self) -> PipelineProfiler | None:
+        """本次执行需要剖析时返回剖析器"""
+        profiler = self.profiler
+        return profiler if profiler is not None and profiler.should_sample() else None
+
+    def _collect_results(
+        self, current: list[BaseDataModel], failures: list[ProcessingResult | None], chunk_span: TimingSpan
+    ) -> list[ProcessingResult]:
+        """汇总数据块的最终结果
+
+        同一数据块的结果共享该块的计时树，成功记录的处理时间为块耗时的均摊值。
+        """
+        item_time = chunk_span.duration / len(current)
+        results = []
+        for data, failure in zip(current, failures, strict=True):
+            if failure is None:
+                results.append(
+                    ProcessingResult.trusted_success(
+                        data=data, processing_time=item_time, processor_name=self.name, timing=chunk_span
+                    )
+                )
+            else:
+                failure.timing = chunk_span
+                results.append(failure)
+        return results
+
+    def _apply_failure_policy(
+        self, items: list[BaseDataModel], results: list[ProcessingResult], offset: int
+    ) -> list[ProcessingResult]:
+        """按失败策略处理数据块的结果
 
-            return ProcessingResult.error_result(error=error_msg, processing_time=total_time, processor_name=self.name)
+        Args:
+            items: 数据块的原始输入
+            results: 与输入一一对应的处理结果
+            offset: 数据块第一条记录在整个输入中的序号
+
+        Returns:
+            需要输出的结果
+        """
+        policy = self.failure_policy
+        if policy == FailurePolicy.CONTINUE:
+            return results
+
+        kept = []
+        for i, (data, result) in enumerate(zip(items, results, strict=True)):
+            if result.success:
+                kept.append(result)
+            elif policy == FailurePolicy.FAIL_FAST:
+                raise ProcessingError(
+                    f"第 {offset + i} 条记录处理失败: {result.error}",
+                    processor_name=result.processor_name,
+                    error_code=result.error_code or "PROCESSING_ERROR",
+                )
+            elif policy == FailurePolicy.DEAD_LETTER and self.dead_letter is not None:
+                self.dead_letter.write(DeadLetter(offset + i, data, result, self.name))
+        return kept
 
     def validate_pipeline(self) -> list[str]:
         """验证管道配置
@@ -235,6 +1145,12 @@ class DataPipeline:
         return {
             "name": self.name,
             "processor_count": len(self.processors),
+            "compiled": self._plan is not None,
+            "cache": {p.name: p.cache.get_stats() for p in self.processors if isinstance(p, CachedProcessor)},
+            "metrics": self.metrics.snapshot() if self.metrics is not None else None,
+            "profiling": self.profiler.get_summary() if self.profiler is not None else None,
+            "failure_policy": self.failure_policy.value,
+            "retry": self.retry_policy is not None,
             "processors": [{"name": p.name, "description": p.get_description()} for p in self.processors],
         }
 
@@ -257,43 +1173,181 @@ class ConditionalProcessor(DataProcessor):
     def process(self, data: BaseDataModel) -> ProcessingResult:
         """条件满足时执行内部处理器"""
         if not self.condition(data):
-            return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+            return ProcessingResult.trusted_success(data=data, processing_time=0.0, processor_name=self.name)
 
         return self.processor.process(data)
 
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """条件满足时异步执行内部处理器"""
+        if not self.condition(data):
+            return ProcessingResult.trusted_success(data=data, processing_time=0.0, processor_name=self.name)
+
+        return await self.processor.aprocess(data)
+
+
+class MergeStrategy(str, Enum):
+    """并行分支结果合并策略"""
+
+    FIRST = "first"  # 按声明顺序取第一个成功结果
+    LAST = "last"  # 按声明顺序取最后一个成功结果
+    MERGE_METADATA = "merge_metadata"  # 保留输入数据，合并所有分支输出的元数据
+
+
+MergeFunc = Callable[[BaseDataModel, list[ProcessingResult]], BaseDataModel]
+
 
 class ParallelProcessor(DataProcessor):
-    """并行处理器（未来扩展）
+    """并行处理器
 
-    同时执行多个处理器并合并结果
+    将同一份数据同时分发给多个处理器并合并结果：
+    - 可插拔的执行后端（线程池、进程池、asyncio）
+    - 分支级超时
+    - 可配置的合并策略
+    - 分支耗时记录在结果的 branch_timings 中
     """
 
-    def __init__(self, processors: list[DataProcessor], name: str | None = None):
+    def __init__(
+        self,
+        processors: list[DataProcessor],
+        name: str | None = None,
+        backend: ExecutionBackend | str = ExecutionBackend.THREAD,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        merge_strategy: MergeStrategy | str | MergeFunc = MergeStrategy.LAST,
+        allow_partial: bool = False,
+    ):
+        """
+        Args:
+            processors: 分支处理器列表
+            name: 处理器名称
+            backend: 执行后端
+            max_workers: 最大并发数，None 表示使用执行器默认值
+            timeout: 单个分支的超时时间（秒），None 表示不限制
+            merge_strategy: 合并策略，或接收 (输入数据, 成功结果列表) 并返回合并数据的函数
+            allow_partial: 为 True 时忽略失败/超时的分支，仅合并成功结果
+        """
         super().__init__(name)
         self.processors = processors
+        self.timeout = timeout
+        self.allow_partial = allow_partial
+        self.merge_strategy = merge_strategy if callable(merge_strategy) else MergeStrategy(merge_strategy)
+        self.engine = ExecutionEngine(backend=backend, max_workers=max_workers)
 
     def can_process(self, data: BaseDataModel) -> bool:
         """至少有一个处理器可以处理"""
         return any(p.can_process(data) for p in self.processors)
 
     def process(self, data: BaseDataModel) -> ProcessingResult:
-        """顺序执行所有可用处理器（暂时不实现真正的并行）"""
-        start_time = time.time()
-        results = []
-
-        for processor in self.processors:
-            if processor.can_process(data):
-                result = processor.process(data)
-                results.append(result)
-                if not result.success:
-                    return result
+        """并发执行所有可用处理器并合并结果"""
+        span, token = enter_span(self.name)
+        try:
+            tasks = [
+                BranchTask(
+                    name=processor.name,
+                    func=processor.process,
+                    args=(data.evolve() if processor.in_place else data,),
+                    timeout=self.timeout,
+                )
+                for processor in self.processors
+                if processor.can_process(data)
+            ]
+
+            outcomes = self.engine.run(tasks)
+        finally:
+            exit_span(span, token)
+        return self._merge_outcomes(data, outcomes, span)
+
+    async def aprocess(self, data: BaseDataModel) -> ProcessingResult:
+        """在事件循环中并发执行所有可用处理器并合并结果"""
+        span, token = enter_span(self.name)
+        try:
+            tasks = [
+                BranchTask(
+                    name=processor.name,
+                    func=processor.aprocess if isinstance(processor, AsyncDataProcessor) else processor.process,
+                    args=(data.evolve() if processor.in_place else data,),
+                    timeout=self.timeout,
+                )
+                for processor in self.processors
+                if processor.can_process(data)
+            ]
+
+            outcomes = await self.engine.arun(tasks)
+        finally:
+            exit_span(span, token)
+        return self._merge_outcomes(data, outcomes, span)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭执行后端"""
+        self.engine.shutdown(wait=wait)
+
+    def _merge_outcomes(self, data: BaseDataModel, outcomes: list[BranchOutcome], span: TimingSpan) -> ProcessingResult:
+        """根据合并策略汇总分支结果
+
+        每个分支在计时树中对应一个子区间，起点为分支实际开始执行的时刻（不早于父区间），
+        分支结果自带的计时树挂载在其下。
+        """
+        processing_time = span.duration
+        branch_timings = {}
+        for outcome in outcomes:
+            branch_timings[outcome.name] = outcome.elapsed
+            start_ns = span.start_ns if outcome.start_ns is None else max(span.start_ns, outcome.start_ns)
+            branch_span = TimingSpan.from_elapsed(outcome.name, start_ns, outcome.elapsed)
+            if outcome.result.timing is not None:
+                branch_span.attach(outcome.result.timing)
+            span.attach(branch_span)
+        successes = [outcome.result for outcome in outcomes if outcome.result.success]
+        failures = [outcome.result for outcome in outcomes if not outcome.result.success]
+
+        if failures and (not self.allow_partial or not successes):
+            failure = failures[0]
+            failure.processing_time = processing_time
+            failure.branch_timings = branch_timings
+            failure.timing = span
+            return failure
+
+        if not successes:
+            return ProcessingResult.trusted_success(
+                data=data, processing_time=processing_time, processor_name=self.name, timing=span
+            )
 
-        processing_time = time.time() - start_time
+        try:
+            merged_data = self._merge_data(data, successes)
+        except Exception as e:
+            return ProcessingResult.trusted_error(
+                error=f"合并分支结果失败: {str(e)}",
+                processing_time=processing_time,
+                error_code="MERGE_ERROR",
+                processor_name=self.name,
+                timing=span,
+            )
 
-        # 简单返回最后一个成功结果
-        if results:
-            last_result = results[-1]
-            last_result.processing_time = processing_time
-            return last_result
+        result = ProcessingResult.trusted_success(
+            data=merged_data, processing_time=processing_time, processor_name=self.name, timing=span
+        )
+        result.branch_timings = branch_timings
+        for failure in failures:
+            result.add_warning(f"分支 {failure.processor_name} 已忽略: {failure.error}")
+        for success in successes:
+            result.warnings.extend(success.warnings)
+        return result
 
-        return ProcessingResult.success_result(data=data, processing_time=processing_time, processor_name=self.name)
+    def _merge_data(self, data: BaseDataModel, successes: list[ProcessingResult]) -> BaseDataModel:
+        """合并成功分支的输出数据"""
+        if callable(self.merge_strategy):
+            merged = self.merge_strategy(data, successes)
+            if not isinstance(merged, (BaseDataModel, BaseRecord)):
+                raise TypeError(f"合并函数应返回数据模型，实际为 {type(merged).__name__}")
+            return merged
+
+        if self.merge_strategy == MergeStrategy.FIRST:
+            return successes[0].data or data
+
+        if self.merge_strategy == MergeStrategy.MERGE_METADATA:
+            metadata = dict(data.metadata)
+            for success in successes:
+                if success.data is not None:
+                    metadata.update(success.data.metadata)
+            return data.evolve(metadata=metadata)
+
+        return successes[-1].data or data
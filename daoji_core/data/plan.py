@@ -0,0 +1,63 @@
+"""
+管道执行计划
+提供预解析处理器分发的不可变执行计划
+"""
+
+from bisect import bisect_right
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .models import BaseDataModel, DataType, ProcessingResult
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """执行计划中的单个处理步骤
+
+    accepts 为 None 表示处理器未声明 supported_types，执行时需调用 can_process；
+    pre_process/post_process 为 None 表示处理器未重写对应钩子，执行时直接跳过；
+    in_place 为 True 表示处理器原地修改输入，执行前需确保数据归本次执行所有。
+    """
+
+    index: int
+    name: str
+    processor: Any
+    process: Callable[[BaseDataModel], ProcessingResult]
+    accepts: frozenset[DataType] | None
+    can_process: Callable[[BaseDataModel], bool]
+    pre_process: Callable[[BaseDataModel], BaseDataModel] | None
+    post_process: Callable[[ProcessingResult], ProcessingResult] | None
+    in_place: bool = False
+
+    def applies_to(self, data: BaseDataModel) -> bool:
+        """检查该步骤是否处理指定数据"""
+        if self.accepts is not None:
+            return data.type in self.accepts
+        return self.can_process(data)
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """不可变的管道执行计划
+
+    按数据类型预先分组处理步骤，执行时只需一次字典查找即可得到需要运行的步骤；
+    处理器改变数据类型时通过 resume_after 切换到新类型的步骤序列。
+    """
+
+    pipeline_name: str
+    steps: tuple[PlanStep, ...]
+    routes: Mapping[DataType, tuple[PlanStep, ...]]
+    dynamic_steps: tuple[PlanStep, ...]
+
+    def steps_for(self, data_type: DataType) -> tuple[PlanStep, ...]:
+        """获取指定数据类型可能需要执行的步骤"""
+        return self.routes.get(data_type, self.dynamic_steps)
+
+    def resume_after(self, data_type: DataType, index: int) -> tuple[tuple[PlanStep, ...], int]:
+        """获取新数据类型的步骤序列及第一个位于 index 之后的步骤位置"""
+        steps = self.steps_for(data_type)
+        return steps, bisect_right([step.index for step in steps], index)
+
+    def __len__(self) -> int:
+        return len(self.steps)
@@ -0,0 +1,337 @@
+"""
+运行剖析
+提供按处理器归属的 cProfile CPU 剖析和 tracemalloc 内存分配剖析
+"""
+
+import cProfile
+import itertools
+import logging
+import pstats
+import re
+import threading
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# cProfile 和 tracemalloc 都是进程级工具，所有剖析器共用同一把锁，保证同一时刻只剖析一个阶段
+_PROFILE_LOCK = threading.Lock()
+
+# 关闭时有阶段正在剖析、需要等该阶段结束后再停止 tracemalloc 的剖析器（持有 _PROFILE_LOCK 时处理）
+_PENDING_TRACEMALLOC_STOPS: list["PipelineProfiler"] = []
+
+# 内存快照中排除剖析工具自身的分配
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class StageProfile:
+    """单个处理阶段的累计剖析数据"""
+
+    name: str
+    samples: int = 0
+    cpu_stats: pstats.Stats | None = None
+    allocated_bytes: int = 0
+    allocations: dict[str, list[int]] = field(default_factory=dict)
+
+    def add_cpu(self, profile: cProfile.Profile) -> None:
+        """合并一次 CPU 剖析结果"""
+        if self.cpu_stats is None:
+            self.cpu_stats = pstats.Stats(profile)
+        else:
+            self.cpu_stats.add(profile)
+
+    def add_memory(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> None:
+        """合并一次内存快照差异（按源码行累计）"""
+        for diff in after.compare_to(before, "lineno"):
+            if not diff.size_diff and not diff.count_diff:
+                continue
+            frame = diff.traceback[0]
+            entry = self.allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            entry[0] += diff.size_diff
+            entry[1] += diff.count_diff
+            self.allocated_bytes += diff.size_diff
+
+    def top_allocations(self, limit: int) -> list[tuple[str, int, int]]:
+        """按新增字节数排序的分配位置 (位置, 字节数, 块数)"""
+        ranked = sorted(self.allocations.items(), key=lambda item: item[1][0], reverse=True)
+        return [(location, size, count) for location, (size, count) in ranked[:limit]]
+
+    def get_summary(self) -> dict[str, Any]:
+        """获取阶段剖析摘要"""
+        return {
+            "samples": self.samples,
+            "cpu_time": self.cpu_stats.total_tt if self.cpu_stats is not None else 0.0,
+            "allocated_bytes": self.allocated_bytes,
+        }
+
+
+class ActiveProfile:
+    """正在进行中的单次阶段剖析"""
+
+    __slots__ = ("profiler", "stage", "profile", "snapshot")
+
+    def __init__(
+        self,
+        profiler: "PipelineProfiler",
+        stage: StageProfile,
+        profile: cProfile.Profile | None,
+        snapshot: tracemalloc.Snapshot | None,
+    ):
+        self.profiler = profiler
+        self.stage = stage
+        self.profile = profile
+        self.snapshot = snapshot
+
+    def stop(self) -> None:
+        """结束剖析并合并结果"""
+        self.profiler.stop(self)
+
+
+class PipelineProfiler:
+    """管道剖析器
+
+    对被采样的执行逐个处理阶段启用 cProfile 和/或 tracemalloc，
+    统计结果归属到对应的处理器（或模块），可导出为 .pstats 文件和内存分配报告。
+
+    cProfile 和 tracemalloc 都是进程级工具，进程内同一时刻只剖析一个阶段（包括不同剖析器之间）；
+    并发执行时其他阶段直接跳过剖析，不会阻塞。CPU 剖析只覆盖调用线程，
+    卸载到线程池或进程池中的工作不会被计入。
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        name: str = "pipeline",
+        cpu: bool = True,
+        memory: bool = False,
+        sample_rate: int = 1,
+        top_n: int = 25,
+    ):
+        """
+        Args:
+            output_dir: 剖析结果输出目录
+            name: 输出文件名前缀
+            cpu: 是否启用 cProfile CPU 剖析
+            memory: 是否启用 tracemalloc 内存分配剖析
+            sample_rate: 每 N 次执行剖析一次
+            top_n: 内存报告中列出的分配位置数
+        """
+        if sample_rate <= 0:
+            raise ValueError("sample_rate 必须大于0")
+        if not cpu and not memory:
+            raise ValueError("cpu 和 memory 至少启用一项")
+
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.cpu = cpu
+        self.memory = memory
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self.enabled = True
+        self.stages: dict[str, StageProfile] = {}
+        self._counter = itertools.count()
+        self._stages_lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def enable(self) -> None:
+        """开启剖析"""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """暂停剖析（保留已收集的数据）"""
+        self.enabled = False
+        self._stop_tracemalloc()
+
+    def should_sample(self) -> bool:
+        """判断本次执行是否需要剖析"""
+        return self.enabled and next(self._counter) % self.sample_rate == 0
+
+    def start(self, stage_name: str) -> ActiveProfile | None:
+        """开始剖析一个阶段
+
+        已有阶段正在剖析时返回 None（跳过本次剖析）。
+
+        Returns:
+            剖析句柄，结束时调用其 stop 方法
+        """
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            return None
+
+        try:
+            snapshot = None
+            if self.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracemalloc = True
+                snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+            profile = None
+            if self.cpu:
+                profile = cProfile.Profile()
+                profile.enable()
+        except Exception as e:
+            _PROFILE_LOCK.release()
+            logger.warning(f"开始剖析阶段 {stage_name} 失败: {e}")
+            return None
+
+        return ActiveProfile(self, self._get_stage(stage_name), profile, snapshot)
+
+    def stop(self, active: ActiveProfile) -> None:
+        """结束阶段剖析并合并结果"""
+        try:
+            if active.profile is not None:
+                active.profile.disable()
+                active.stage.add_cpu(active.profile)
+            if active.snapshot is not None:
+                after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                active.stage.add_memory(active.snapshot, after)
+            active.stage.samples += 1
+        except Exception as e:
+            logger.warning(f"结束剖析阶段 {active.stage.name} 失败: {e}")
+        finally:
+            _drain_pending_stops()
+            _PROFILE_LOCK.release()
+
+    def wrap(self, stage_name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """包装函数，调用时剖析为指定阶段"""
+
+        def profiled(*args: Any) -> T:
+            active = self.start(stage_name)
+            try:
+                return func(*args)
+            finally:
+                if active is not None:
+                    active.stop()
+
+        return profiled
+
+    def dump(self, output_dir: str | Path | None = None) -> list[Path]:
+        """将累计的剖析结果写入目录
+
+        每个阶段生成 {name}.{阶段}.pstats 和 {name}.{阶段}.alloc.txt，
+        另外生成合并所有阶段的 {name}.all.pstats。
+
+        Args:
+            output_dir: 输出目录，None 表示使用构造时指定的目录
+
+        Returns:
+            写入的文件路径列表
+        """
+        directory = Path(output_dir) if output_dir is not None else self.output_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        prefix = _safe_filename(self.name)
+        written: list[Path] = []
+        combined: pstats.Stats | None = None
+
+        for stage in list(self.stages.values()):
+            stage_prefix = f"{prefix}.{_safe_filename(stage.name)}"
+            if stage.cpu_stats is not None:
+                path = directory / f"{stage_prefix}.pstats"
+                stage.cpu_stats.dump_stats(path)
+                written.append(path)
+                if combined is None:
+                    combined = pstats.Stats(str(path))
+                else:
+                    combined.add(str(path))
+            if stage.allocations:
+                path = directory / f"{stage_prefix}.alloc.txt"
+                path.write_text(self._format_allocations(stage), encoding="utf-8")
+                written.append(path)
+
+        if combined is not None:
+            path = directory / f"{prefix}.all.pstats"
+            combined.dump_stats(path)
+            written.append(path)
+
+        logger.info(f"剖析结果已写入 {directory}，共 {len(written)} 个文件")
+        return written
+
+    def reset(self) -> None:
+        """清空已收集的剖析数据"""
+        with self._stages_lock:
+            self.stages = {}
+
+    def close(self) -> None:
+        """停止剖析并释放 tracemalloc
+
+        可以在被剖析的阶段内调用：此时 tracemalloc 在该阶段结束时停止。
+        """
+        self.enabled = False
+        self._stop_tracemalloc()
+
+    def get_summary(self) -> dict[str, Any]:
+        """获取剖析摘要"""
+        return {
+            "enabled": self.enabled,
+            "cpu": self.cpu,
+            "memory": self.memory,
+            "sample_rate": self.sample_rate,
+            "stages": {name: stage.get_summary() for name, stage in list(self.stages.items())},
+        }
+
+    def _get_stage(self, stage_name: str) -> StageProfile:
+        """获取阶段剖析数据，不存在时创建"""
+        stage = self.stages.get(stage_name)
+        if stage is None:
+            with self._stages_lock:
+                stage = self.stages.setdefault(stage_name, StageProfile(stage_name))
+        return stage
+
+    def _format_allocations(self, stage: StageProfile) -> str:
+        """格式化内存分配报告"""
+        lines = [
+            f"# {self.name} / {stage.name}",
+            f"# 采样次数: {stage.samples}，累计新增: {stage.allocated_bytes / 1024:.1f} KiB",
+            f"{'新增(KiB)':>12} {'块数':>10}  位置",
+        ]
+        for location, size, count in stage.top_allocations(self.top_n):
+            lines.append(f"{size / 1024:>12.1f} {count:>10}  {location}")
+        return "\n".join(lines) + "\n"
+
+    def _stop_tracemalloc(self) -> None:
+        """停止由剖析器启动的 tracemalloc
+
+        有阶段正在剖析时（可能正是调用方所在的阶段）不等待锁，改由该阶段结束时停止。
+        """
+        if not self._started_tracemalloc:
+            return
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            _PENDING_TRACEMALLOC_STOPS.append(self)
+            # 正在剖析的阶段可能在登记前已经结束，再尝试一次避免遗漏
+            if not _PROFILE_LOCK.acquire(blocking=False):
+                return
+        try:
+            self._release_tracemalloc()
+            _drain_pending_stops()
+        finally:
+            _PROFILE_LOCK.release()
+
+    def _release_tracemalloc(self) -> None:
+        """停止由本剖析器启动的 tracemalloc（调用方持有 _PROFILE_LOCK）"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+def _drain_pending_stops() -> None:
+    """停止所有等待中的 tracemalloc（调用方持有 _PROFILE_LOCK）"""
+    while _PENDING_TRACEMALLOC_STOPS:
+        _PENDING_TRACEMALLOC_STOPS.pop()._release_tracemalloc()
+
+
+def _safe_filename(name: str) -> str:
+    """将阶段名称转换为安全的文件名"""
+    return re.sub(r"[^\w.-]+", "_", name)
@@ -0,0 +1,249 @@
+"""
+模块输入队列
+为 DataFlowManager 的模块提供有界输入队列、工作线程池、背压和过载丢弃策略
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any
+
+from .metrics import LatencyHistogram
+from .models import BaseDataModel, ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """队列已满时的处理策略"""
+
+    BLOCK = "block"  # 阻塞生产者直到有空位（可设置最长等待时间）
+    DROP_OLDEST = "drop_oldest"  # 丢弃队首最旧的记录，为新记录腾出空位
+    REJECT = "reject"  # 拒绝新记录，返回 QUEUE_FULL 错误结果
+
+
+class _QueuedItem:
+    """队列中的待处理记录"""
+
+    __slots__ = ("data", "future", "enqueued_ns")
+
+    def __init__(self, data: BaseDataModel, future: "Future[ProcessingResult]"):
+        self.data = data
+        self.future = future
+        self.enqueued_ns = time.perf_counter_ns()
+
+
+def _settle(future: "Future[ProcessingResult]", result: ProcessingResult) -> None:
+    """以结果完成尚未开始执行的 Future（已被取消时忽略）"""
+    if future.set_running_or_notify_cancel():
+        future.set_result(result)
+
+
+class ModuleQueue:
+    """模块有界输入队列
+
+    生产者通过 submit 投递记录并立即得到 Future，固定数量的工作线程从队列取出记录
+    调用 handler 处理。队列满时按 policy 施加背压或丢弃负载：
+    - block: 生产者阻塞等待空位，超过 block_timeout 后返回 QUEUE_FULL
+    - drop_oldest: 队首最旧的记录以 QUEUE_DROPPED 结束，新记录入队
+    - reject: 新记录直接以 QUEUE_FULL 结束
+
+    统计排队深度、峰值深度、排队等待时间和处理时间分布。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[BaseDataModel], ProcessingResult],
+        maxsize: int = 128,
+        workers: int = 1,
+        policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        block_timeout: float | None = None,
+    ):
+        """
+        Args:
+            name: 队列名称（通常为模块名称）
+            handler: 处理单条记录的函数
+            maxsize: 队列容量（不含正在处理的记录）
+            workers: 工作线程数
+            policy: 队列满时的处理策略
+            block_timeout: block 策略下生产者的最长等待时间（秒），None 表示一直等待
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize 必须大于0")
+        if workers <= 0:
+            raise ValueError("workers 必须大于0")
+
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.block_timeout = block_timeout
+        self._items: deque[_QueuedItem] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.active = 0
+        self.peak_depth = 0
+        self.wait_time = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"daoji-queue-{name}-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def depth(self) -> int:
+        """当前排队的记录数"""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """队列是否已关闭"""
+        return self._closed
+
+    def submit(self, data: BaseDataModel) -> "Future[ProcessingResult]":
+        """投递一条记录
+
+        block 策略下队列满时阻塞调用线程；被拒绝、被丢弃或队列已关闭时
+        Future 以错误结果（QUEUE_FULL/QUEUE_DROPPED/QUEUE_CLOSED）完成，不会抛出异常。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            处理结果的 Future
+        """
+        item = _QueuedItem(data, Future())
+        evicted = None
+        with self._lock:
+            if not self._closed and len(self._items) >= self.maxsize:
+                if self.policy == OverflowPolicy.DROP_OLDEST:
+                    evicted = self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == OverflowPolicy.BLOCK:
+                    self._not_full.wait_for(
+                        lambda: self._closed or len(self._items) < self.maxsize, timeout=self.block_timeout
+                    )
+
+            if self._closed:
+                refusal = self._refusal("QUEUE_CLOSED", f"模块 {self.name} 的输入队列已关闭")
+            elif len(self._items) >= self.maxsize:
+                self.rejected += 1
+                refusal = self._refusal("QUEUE_FULL", f"模块 {self.name} 的输入队列已满（容量 {self.maxsize}）")
+            else:
+                refusal = None
+                self._items.append(item)
+                self.submitted += 1
+                self.peak_depth = max(self.peak_depth, len(self._items))
+                self._not_empty.notify()
+
+        if evicted is not None:
+            logger.debug(f"模块 {self.name} 的输入队列已满，丢弃最旧的记录 {evicted.data.id}")
+            _settle(evicted.future, self._refusal("QUEUE_DROPPED", f"模块 {self.name} 的输入队列已满，记录被丢弃"))
+        if refusal is not None:
+            _settle(item.future, refusal)
+        return item.future
+
+    async def asubmit(self, data: BaseDataModel) -> "Future[ProcessingResult]":
+        """异步投递一条记录（block 策略下在线程中等待空位，不阻塞事件循环）"""
+        if self.policy == OverflowPolicy.BLOCK and len(self._items) >= self.maxsize:
+            return await asyncio.to_thread(self.submit, data)
+        return self.submit(data)
+
+    def close(self, wait: bool = True, drain: bool = True) -> None:
+        """关闭队列
+
+        Args:
+            wait: 是否等待工作线程退出
+            drain: 是否处理完已排队的记录；为 False 时排队记录以 QUEUE_CLOSED 结束
+        """
+        with self._lock:
+            self._closed = True
+            pending = []
+            if not drain:
+                pending = list(self._items)
+                self._items.clear()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        for item in pending:
+            _settle(item.future, self._refusal("QUEUE_CLOSED", f"模块 {self.name} 的输入队列已关闭"))
+        if wait:
+            for worker in self._workers:
+                if worker is not threading.current_thread():
+                    worker.join()
+        logger.debug(f"关闭模块 {self.name} 的输入队列")
+
+    def get_statistics(self) -> dict[str, Any]:
+        """获取队列统计信息（等待和处理时间单位为秒）"""
+        with self._lock:
+            return {
+                "policy": self.policy.value,
+                "maxsize": self.maxsize,
+                "workers": len(self._workers),
+                "depth": len(self._items),
+                "peak_depth": self.peak_depth,
+                "active": self.active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+                "closed": self._closed,
+                "wait_time": self.wait_time.to_dict(),
+                "service_time": self.service_time.to_dict(),
+            }
+
+    def _refusal(self, error_code: str, error: str) -> ProcessingResult:
+        """构造未能入队/出队处理的错误结果"""
+        return ProcessingResult.trusted_error(
+            error=error, processing_time=0.0, error_code=error_code, processor_name=self.name
+        )
+
+    def _worker(self) -> None:
+        """工作线程：依次取出记录并调用 handler"""
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                self.active += 1
+                self._not_full.notify()
+
+            started_ns = time.perf_counter_ns()
+            ran = item.future.set_running_or_notify_cancel()
+            result = error = None
+            if ran:
+                try:
+                    result = self.handler(item.data)
+                except Exception as e:
+                    logger.error(f"模块 {self.name} 的队列工作线程处理异常: {e}")
+                    error = e
+            finished_ns = time.perf_counter_ns()
+
+            # 先更新统计再完成 Future，等待结果的调用方随后读取的统计已包含本条记录
+            with self._lock:
+                self.active -= 1
+                if ran:
+                    self.completed += 1
+                    self.wait_time.observe((started_ns - item.enqueued_ns) / 1e9)
+                    self.service_time.observe((finished_ns - started_ns) / 1e9)
+
+            if error is not None:
+                item.future.set_exception(error)
+            elif ran:
+                item.future.set_result(result)
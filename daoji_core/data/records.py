@@ -0,0 +1,171 @@
+"""
+轻量数据记录
+提供基于 __slots__ 的快速记录类型，可与Pydantic数据模型无损互转
+"""
+
+from typing import Any
+
+from .image_io import ImageBuffer
+from .models import BaseDataModel, BaseRecord, DataType, ImageData, TableData, TextData
+
+
+class TextRecord(BaseRecord):
+    """轻量文本记录（word_count 在首次访问时计算）"""
+
+    __slots__ = ("content", "language", "encoding", "_word_count")
+
+    type = DataType.TEXT
+    model_class = TextData
+    _fields = ("content", "language", "encoding", "word_count")
+
+    def __init__(
+        self,
+        content: str,
+        language: str | None = None,
+        encoding: str = "utf-8",
+        word_count: int | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.content = content
+        self.language = language
+        self.encoding = encoding
+        self._word_count = word_count
+
+    @property
+    def word_count(self) -> int | None:
+        """词数统计"""
+        if self._word_count is None and self.content:
+            self._word_count = len(self.content.split())
+        return self._word_count
+
+    @word_count.setter
+    def word_count(self, value: int | None) -> None:
+        self._word_count = value
+
+    def get_preview(self, max_length: int = 100) -> str:
+        """获取文本预览"""
+        if len(self.content) <= max_length:
+            return self.content
+        return self.content[:max_length] + "..."
+
+    def is_empty(self) -> bool:
+        """检查文本是否为空"""
+        return not self.content.strip()
+
+    def evolve(self, **changes: Any) -> "TextRecord":
+        """派生副本，修改 content 且未指定 word_count 时词数重新惰性计算"""
+        if "content" in changes and "word_count" not in changes:
+            changes["word_count"] = None
+        return super().evolve(**changes)
+
+
+class TableRecord(BaseRecord):
+    """轻量表格记录（构造时不校验行列数，可调用 validate 或转换为模型时校验）"""
+
+    __slots__ = ("headers", "rows", "column_schema")
+
+    type = DataType.TABLE
+    model_class = TableData
+    _fields = ("headers", "rows", "column_schema")
+
+    def __init__(
+        self,
+        headers: list[str],
+        rows: list[list[Any]],
+        column_schema: dict[str, str] | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.headers = headers
+        self.rows = rows
+        self.column_schema = column_schema
+
+    def validate(self) -> None:
+        """验证表格数据一致性"""
+        if not self.headers:
+            raise ValueError("表头不能为空")
+
+        header_count = len(self.headers)
+        for i, row in enumerate(self.rows):
+            if len(row) != header_count:
+                raise ValueError(f"第{i + 1}行数据列数({len(row)})与表头列数({header_count})不匹配")
+
+    def get_row_count(self) -> int:
+        """获取行数"""
+        return len(self.rows)
+
+    def get_column_count(self) -> int:
+        """获取列数"""
+        return len(self.headers)
+
+    def get_column_data(self, column_name: str) -> list[Any]:
+        """获取指定列的数据"""
+        if column_name not in self.headers:
+            raise ValueError(f"列 '{column_name}' 不存在")
+
+        column_index = self.headers.index(column_name)
+        return [row[column_index] for row in self.rows]
+
+    def add_row(self, row: list[Any]) -> None:
+        """添加数据行"""
+        if len(row) != len(self.headers):
+            raise ValueError(f"行数据列数({len(row)})与表头列数({len(self.headers)})不匹配")
+        self.rows.append(row)
+
+    def to_dict_list(self) -> list[dict[str, Any]]:
+        """转换为字典列表格式"""
+        return [dict(zip(self.headers, row, strict=False)) for row in self.rows]
+
+
+class ImageRecord(BaseRecord):
+    """轻量图像记录（data 可以是任意 buffer 对象，不会被复制）"""
+
+    __slots__ = ("file_path", "data", "format", "width", "height", "size_bytes")
+
+    type = DataType.IMAGE
+    model_class = ImageData
+    _fields = ("file_path", "data", "format", "width", "height", "size_bytes")
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        data: ImageBuffer | None = None,
+        format: str | None = None,
+        width: int | None = None,
+        height: int | None = None,
+        size_bytes: int | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.file_path = file_path
+        self.data = data
+        self.format = format
+        self.width = width
+        self.height = height
+        self.size_bytes = size_bytes
+
+    def has_file(self) -> bool:
+        """检查是否有文件路径"""
+        return bool(self.file_path)
+
+    def has_data(self) -> bool:
+        """检查是否有二进制数据"""
+        return self.data is not None and len(self.data) > 0
+
+
+DataRecord = BaseDataModel | BaseRecord
+
+
+def as_record(data: DataRecord) -> BaseRecord:
+    """将数据转换为轻量记录（已是记录时原样返回）"""
+    if isinstance(data, BaseRecord):
+        return data
+    return BaseRecord.from_model(data)
+
+
+def as_model(data: DataRecord) -> BaseDataModel:
+    """将数据转换为Pydantic数据模型（已是模型时原样返回）"""
+    if isinstance(data, BaseRecord):
+        return data.to_model()
+    return data
@@ -0,0 +1,379 @@
+"""
+多进程分片执行
+将输入流按数据块分发到多个工作进程，每个进程持有一条独立构造的处理管道，绕开GIL利用多核
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from ..utils.exceptions import ProcessingError
+from .models import BaseDataModel, ProcessingResult
+from .pipeline import DataPipeline
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的管道（由初始化函数构造，每个进程一份）
+_worker_pipeline: DataPipeline | None = None
+
+
+def _init_worker(factory: Callable[[], DataPipeline], warmup: Sequence[BaseDataModel]) -> None:
+    """工作进程初始化：构造管道并预热"""
+    global _worker_pipeline
+    _worker_pipeline = factory()
+    if warmup:
+        _worker_pipeline._process_chunk(list(warmup))
+
+
+def _ping() -> int:
+    """确认工作进程已完成初始化"""
+    return os.getpid()
+
+
+def _process_shard(items: list[BaseDataModel]) -> list[ProcessingResult]:
+    """在工作进程中处理一个数据块（模块级函数，便于进程池pickle）
+
+    结果须与输入一一对应，因此不经过管道的失败策略，失败记录以错误结果返回。
+    """
+    if _worker_pipeline is None:
+        raise RuntimeError("工作进程未初始化")
+    return _worker_pipeline._process_chunk(items)
+
+
+@dataclass
+class _Shard:
+    """待处理的数据块"""
+
+    start: int
+    items: list[BaseDataModel]
+    attempts: int = 0
+
+
+@dataclass
+class ShardStats:
+    """分片执行统计"""
+
+    items: int = 0
+    shards: int = 0
+    failed_items: int = 0
+    crashes: int = 0
+    restarts: int = 0
+    crashed_items: int = 0
+    warmup_time: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {
+            "items": self.items,
+            "shards": self.shards,
+            "failed_items": self.failed_items,
+            "crashes": self.crashes,
+            "restarts": self.restarts,
+            "crashed_items": self.crashed_items,
+            "warmup_time": self.warmup_time,
+        }
+
+
+class ShardedRunner:
+    """多进程分片执行器
+
+    纯Python处理器受GIL限制，单条管道只能使用一个CPU核心。ShardedRunner 启动 workers 个工作进程，
+    每个进程调用 pipeline_factory 构造自己的管道，输入流按 chunk_size 切分为数据块分发给空闲进程，
+    以数据块为单位pickle以摊薄进程间通信开销；进程内通过 DataPipeline.process_batch 整块处理。
+
+    - 有序模式按输入顺序产出结果，无序模式按完成顺序产出（吞吐更高，内存占用更低）
+    - 在途数据块数量不超过 max_inflight，输入流按需读取（背压）
+    - 工作进程崩溃时重建进程池并重新提交在途数据块；可疑数据块逐个隔离执行并二分，
+      定位到导致崩溃的单条记录后重试 max_retries 次，仍崩溃则返回 WORKER_CRASHED 错误结果
+
+    pipeline_factory 必须可被pickle（模块级函数或 functools.partial），输入数据和处理结果同样需要可pickle。
+
+    Example:
+        def build_pipeline() -> DataPipeline:
+            pipeline = DataPipeline("tokenize")
+            pipeline.add_processor(Tokenizer())
+            return pipeline
+
+        with ShardedRunner(build_pipeline, workers=32) as runner:
+            for result in runner.imap(read_records()):
+                ...
+    """
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[], DataPipeline],
+        workers: int | None = None,
+        chunk_size: int = 64,
+        ordered: bool = True,
+        max_inflight: int | None = None,
+        max_retries: int = 1,
+        max_restarts: int = 16,
+        warmup_data: Sequence[BaseDataModel] | None = None,
+        mp_context: str | None = None,
+    ):
+        """
+        Args:
+            pipeline_factory: 构造处理管道的可pickle工厂函数，在每个工作进程中调用一次
+            workers: 工作进程数，None 表示CPU核心数
+            chunk_size: 每个数据块的记录数
+            ordered: 是否按输入顺序产出结果
+            max_inflight: 最大在途数据块数，None 表示 workers 的2倍
+            max_retries: 单条记录导致进程崩溃后的重试次数
+            max_restarts: 进程池最大重建次数，超过后抛出 ProcessingError
+            warmup_data: 工作进程启动后预先处理的样本数据（触发懒加载、填充缓存）
+            mp_context: 进程启动方式（fork/spawn/forkserver），None 表示平台默认
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size 必须大于0")
+        if workers is not None and workers <= 0:
+            raise ValueError("workers 必须大于0")
+        if max_inflight is not None and max_inflight <= 0:
+            raise ValueError("max_inflight 必须大于0")
+        if max_retries < 0 or max_restarts < 0:
+            raise ValueError("max_retries 和 max_restarts 不能为负数")
+
+        self.pipeline_factory = pipeline_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.max_inflight = max_inflight or self.workers * 2
+        self.max_retries = max_retries
+        self.max_restarts = max_restarts
+        self.warmup_data = list(warmup_data or [])
+        self.mp_context = mp_context
+        self.stats = ShardStats()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        """启动并预热所有工作进程（可选，首次处理时会自动启动）"""
+        self._get_executor()
+
+    def imap(self, items: Iterable[BaseDataModel]) -> Iterator[ProcessingResult]:
+        """分片处理输入流
+
+        Args:
+            items: 输入数据迭代器
+
+        Yields:
+            处理结果；有序模式与输入顺序一致，无序模式按完成顺序
+        """
+        if not self.ordered:
+            for _, result in self._run(items):
+                yield result
+            return
+
+        buffer: dict[int, ProcessingResult] = {}
+        next_index = 0
+        for index, result in self._run(items):
+            buffer[index] = result
+            while next_index in buffer:
+                yield buffer.pop(next_index)
+                next_index += 1
+
+    def imap_indexed(self, items: Iterable[BaseDataModel]) -> Iterator[tuple[int, ProcessingResult]]:
+        """按完成顺序产出 (输入序号, 处理结果)，用于无序模式下关联输入"""
+        yield from self._run(items)
+
+    def map(self, items: Iterable[BaseDataModel]) -> list[ProcessingResult]:
+        """分片处理全部输入
+
+        Returns:
+            与输入一一对应的处理结果列表（不受 ordered 影响）
+        """
+        results: list[ProcessingResult | None] = []
+        for index, result in self._run(items):
+            if index >= len(results):
+                results.extend([None] * (index + 1 - len(results)))
+            results[index] = result
+        return results  # type: ignore[return-value]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作进程"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取执行统计"""
+        return {
+            **self.stats.to_dict(),
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "ordered": self.ordered,
+            "running": self._executor is not None,
+        }
+
+    def _run(self, items: Iterable[BaseDataModel]) -> Iterator[tuple[int, ProcessingResult]]:
+        """调度数据块并按完成顺序产出 (输入序号, 处理结果)"""
+        source = iter(items)
+        next_index = 0
+        exhausted = False
+        # 崩溃后待隔离执行的可疑数据块（逐个提交，直到全部通过）
+        suspects: deque[_Shard] = deque()
+        inflight: dict[Future[list[ProcessingResult]], _Shard] = {}
+        start_time = time.perf_counter()
+        total = failed = 0
+
+        try:
+            while True:
+                executor = self._get_executor()
+                if suspects:
+                    if not inflight:
+                        shard = suspects.popleft()
+                        inflight[executor.submit(_process_shard, shard.items)] = shard
+                else:
+                    while not exhausted and len(inflight) < self.max_inflight:
+                        chunk = list(islice(source, self.chunk_size))
+                        if not chunk:
+                            exhausted = True
+                            break
+                        shard = _Shard(next_index, chunk)
+                        next_index += len(chunk)
+                        inflight[executor.submit(_process_shard, shard.items)] = shard
+
+                if not inflight:
+                    break
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                crashed: list[_Shard] = []
+                for future in done:
+                    shard = inflight.pop(future)
+                    try:
+                        results = future.result()
+                        if len(results) != len(shard.items):
+                            raise ValueError(f"返回结果数({len(results)})与输入数({len(shard.items)})不匹配")
+                    except BrokenProcessPool:
+                        crashed.append(shard)
+                        continue
+                    except Exception as e:
+                        logger.error(f"数据块 [{shard.start}, {shard.start + len(shard.items)}) 处理失败: {e}")
+                        results = [self._error_result(f"数据块处理失败: {str(e)}", "SHARD_ERROR") for _ in shard.items]
+
+                    self.stats.shards += 1
+                    for offset, result in enumerate(results):
+                        total += 1
+                        failed += not result.success
+                        yield shard.start + offset, result
+
+                if crashed:
+                    # 进程池崩溃后所有在途数据块都会失败，先收集已完成的结果，再统一处理可疑数据块
+                    wait(inflight)
+                    for future, shard in list(inflight.items()):
+                        del inflight[future]
+                        try:
+                            results = future.result()
+                        except Exception:
+                            crashed.append(shard)
+                            continue
+                        self.stats.shards += 1
+                        for offset, result in enumerate(results):
+                            total += 1
+                            failed += not result.success
+                            yield shard.start + offset, result
+
+                    for index, result in self._recover(crashed, suspects):
+                        total += 1
+                        failed += 1
+                        yield index, result
+        finally:
+            for future in inflight:
+                future.cancel()
+            self.stats.items += total
+            self.stats.failed_items += failed
+
+        logger.info(
+            f"分片处理完成，共 {total} 条记录，失败 {failed} 条，"
+            f"{self.workers} 个工作进程，总耗时 {time.perf_counter() - start_time:.3f}s"
+        )
+
+    def _recover(self, crashed: list[_Shard], suspects: deque[_Shard]) -> list[tuple[int, ProcessingResult]]:
+        """处理崩溃的数据块并重建进程池
+
+        多个数据块同时在途时无法确定是哪一个导致崩溃，全部放入隔离队列逐个重跑；
+        隔离执行（单独在途）时崩溃的数据块即为元凶，多条记录时二分，单条记录时计入重试次数。
+
+        Returns:
+            超过重试次数的记录的错误结果
+        """
+        self.stats.crashes += 1
+        self._discard_executor()
+
+        abandoned: list[tuple[int, ProcessingResult]] = []
+        if len(crashed) > 1:
+            logger.warning(f"工作进程崩溃，{len(crashed)} 个在途数据块将逐个隔离重跑")
+            suspects.extendleft(reversed(crashed))
+        else:
+            shard = crashed[0]
+            if len(shard.items) > 1:
+                middle = len(shard.items) // 2
+                suspects.extendleft(
+                    [
+                        _Shard(shard.start + middle, shard.items[middle:], shard.attempts),
+                        _Shard(shard.start, shard.items[:middle], shard.attempts),
+                    ]
+                )
+            elif shard.attempts < self.max_retries:
+                shard.attempts += 1
+                suspects.appendleft(shard)
+            else:
+                logger.error(f"第 {shard.start} 条记录导致工作进程崩溃 {shard.attempts + 1} 次，已放弃")
+                self.stats.crashed_items += 1
+                abandoned.append((shard.start, self._error_result("处理该记录时工作进程崩溃", "WORKER_CRASHED")))
+
+        if self.stats.restarts >= self.max_restarts:
+            raise ProcessingError(f"工作进程崩溃次数超过上限({self.max_restarts})", error_code="SHARD_RESTART_LIMIT")
+        self.stats.restarts += 1
+        return abandoned
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """懒加载进程池并等待所有工作进程完成初始化"""
+        if self._executor is not None:
+            return self._executor
+
+        context = multiprocessing.get_context(self.mp_context) if self.mp_context else None
+        start_time = time.perf_counter()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.pipeline_factory, self.warmup_data),
+        )
+        try:
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except Exception as e:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise ProcessingError(f"工作进程初始化失败: {e}", error_code="SHARD_INIT_ERROR") from e
+
+        self.stats.warmup_time += time.perf_counter() - start_time
+        logger.info(f"已启动 {self.workers} 个工作进程，预热耗时 {time.perf_counter() - start_time:.3f}s")
+        self._executor = executor
+        return executor
+
+    def _discard_executor(self) -> None:
+        """丢弃已崩溃的进程池"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _error_result(self, error: str, error_code: str) -> ProcessingResult:
+        """构造分片执行层面的错误结果"""
+        return ProcessingResult.trusted_error(error=error, processing_time=0.0, error_code=error_code)
+
+    def __enter__(self) -> "ShardedRunner":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"ShardedRunner(workers={self.workers}, chunk_size={self.chunk_size}, ordered={self.ordered})"
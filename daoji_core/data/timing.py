@@ -0,0 +1,154 @@
+"""
+计时工具
+提供基于 perf_counter_ns 的单调高精度计时和嵌套计时区间
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+_current_span: ContextVar["TimingSpan | None"] = ContextVar("daoji_timing_span", default=None)
+
+
+@dataclass(slots=True, eq=False)
+class TimingSpan:
+    """计时区间
+
+    使用 perf_counter_ns 记录起止时间，不受系统时钟调整影响；
+    子区间构成计时树（管道 → 处理器 → 模块调用），可用于延迟预算分析。
+    """
+
+    name: str
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    end_ns: int | None = None
+    children: list["TimingSpan"] = field(default_factory=list)
+    attached: bool = field(default=False, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """是否已结束"""
+        return self.end_ns is not None
+
+    @property
+    def duration_ns(self) -> int:
+        """持续时间（纳秒），未结束时为当前已耗时"""
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return end_ns - self.start_ns
+
+    @property
+    def duration(self) -> float:
+        """持续时间（秒）"""
+        return self.duration_ns / 1e9
+
+    @property
+    def self_time_ns(self) -> int:
+        """扣除子区间后的自身耗时（纳秒）"""
+        return max(0, self.duration_ns - sum(child.duration_ns for child in self.children))
+
+    def finish(self) -> "TimingSpan":
+        """结束计时（重复调用无效）"""
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+        return self
+
+    def child(self, name: str) -> "TimingSpan":
+        """创建并挂载一个从当前时刻开始的子区间"""
+        span = TimingSpan(name)
+        self.attach(span)
+        return span
+
+    def attach(self, span: "TimingSpan") -> None:
+        """挂载已有区间为子区间（已挂载到其他区间的不会重复挂载）"""
+        if span.attached or span is self:
+            return
+        span.attached = True
+        self.children.append(span)
+
+    def find(self, name: str) -> "TimingSpan | None":
+        """深度优先查找指定名称的区间"""
+        for span in self.walk():
+            if span.name == name:
+                return span
+        return None
+
+    def walk(self) -> Iterator["TimingSpan"]:
+        """深度优先遍历计时树"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def flatten(self, separator: str = "/") -> dict[str, float]:
+        """展开为 路径 → 耗时（秒）的映射，同一路径出现多次时累加"""
+        flat: dict[str, float] = {}
+
+        def visit(span: TimingSpan, prefix: str) -> None:
+            path = f"{prefix}{separator}{span.name}" if prefix else span.name
+            flat[path] = flat.get(path, 0.0) + span.duration
+            for child in span.children:
+                visit(child, path)
+
+        visit(self, "")
+        return flat
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "name": self.name,
+            "duration_ns": self.duration_ns,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_elapsed(cls, name: str, start_ns: int, elapsed: float) -> "TimingSpan":
+        """根据起始时间和耗时（秒）构造已结束的区间（用于在其他线程或进程中执行的调用）"""
+        return cls(name, start_ns=start_ns, end_ns=start_ns + int(elapsed * 1e9))
+
+
+def current_span() -> TimingSpan | None:
+    """获取当前上下文中的计时区间"""
+    return _current_span.get()
+
+
+def enter_span(name: str, parent: TimingSpan | None = None) -> tuple[TimingSpan, Token]:
+    """开始计时区间并设为当前区间
+
+    新区间挂载到 parent 下，未指定时挂载到当前区间下，都不存在时作为根区间。
+    必须与 exit_span 成对调用。
+
+    Args:
+        name: 区间名称
+        parent: 父区间
+
+    Returns:
+        (计时区间, 上下文令牌)
+    """
+    if parent is None:
+        parent = _current_span.get()
+    span = parent.child(name) if parent is not None else TimingSpan(name)
+    return span, _current_span.set(span)
+
+
+def exit_span(span: TimingSpan, token: Token) -> TimingSpan:
+    """结束计时区间并恢复上一个当前区间"""
+    span.finish()
+    _current_span.reset(token)
+    return span
+
+
+@contextmanager
+def timed(name: str) -> Iterator[TimingSpan]:
+    """计时上下文管理器
+
+    Example:
+        with timed("tokenize") as span:
+            ...
+        span.duration
+    """
+    span, token = enter_span(name)
+    try:
+        yield span
+    finally:
+        exit_span(span, token)
@@ -4,9 +4,22 @@
 """
 
 from .base import BaseModule
-from .registry import ModuleRegistry
+from .health import HealthMonitor, HealthState
+from .isolation import IsolatedModule, ModuleProcessPool, ProcessIsolation
+from .registry import ModuleRegistry, RegistrySnapshot
+from .startup import ModuleStartRecord, StartupReport
+from .warmup import WarmupPool
 
 __all__ = [
     "BaseModule",
+    "HealthMonitor",
+    "HealthState",
+    "IsolatedModule",
+    "ModuleProcessPool",
+    "ProcessIsolation",
     "ModuleRegistry",
+    "RegistrySnapshot",
+    "ModuleStartRecord",
+    "StartupReport",
+    "WarmupPool",
 ]
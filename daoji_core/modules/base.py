@@ -3,13 +3,47 @@
 提供所有功能模块的基础抽象类和通用功能
 """
 
+import asyncio
+import functools
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from ..config import BaseConfig
-from ..data import BaseDataModel, DataModule, DataType, ProcessingResult
+from ..data import BaseDataModel, BaseRecord, DataModule, DataType, ProcessingResult, timed
+
+if TYPE_CHECKING:
+    from .isolation import ProcessIsolation
+
+
+def _guard_process_data(func: Callable[..., ProcessingResult]) -> Callable[..., ProcessingResult]:
+    """包装子类的 process_data：延迟初始化的模块在首次调用时先完成初始化"""
+
+    @functools.wraps(func)
+    def process_data(self: "BaseModule", data: BaseDataModel) -> ProcessingResult:
+        if not self._initialized and self.lazy_init and not self.ensure_initialized("first_use"):
+            return self._init_failed_result()
+        return func(self, data)
+
+    process_data._lazy_guarded = True
+    return process_data
+
+
+def _guard_aprocess_data(func: Callable[..., Any]) -> Callable[..., Any]:
+    """包装子类的 aprocess_data：首次调用时在线程中完成初始化，不阻塞事件循环"""
+
+    @functools.wraps(func)
+    async def aprocess_data(self: "BaseModule", data: BaseDataModel) -> ProcessingResult:
+        if not self._initialized and self.lazy_init:
+            if not await asyncio.to_thread(self.ensure_initialized, "first_use"):
+                return self._init_failed_result()
+        return await func(self, data)
+
+    aprocess_data._lazy_guarded = True
+    return aprocess_data
 
 
 class BaseModule(ABC, DataModule):
@@ -21,14 +55,51 @@ class BaseModule(ABC, DataModule):
     - 日志记录
     - 生命周期管理
     - 数据处理接口
+
+    dependencies 声明启动前必须已启动的模块名称，start_timeout 为启动超时时间（秒），
+    由 ModuleRegistry.start_all_modules 按依赖关系调度时使用。
+
+    lazy_init 为 True 时 start() 不调用 initialize()，而是在首次 process_data/aprocess_data
+    调用时初始化（并发的首次调用只会初始化一次，其余调用等待结果）；_start_internal 仍在
+    start() 中执行，不能依赖 initialize() 的结果。warmup_priority 不为 None 时，
+    ModuleRegistry 启动模块后会按该优先级（数值越小越先）在后台预热。
+
+    isolation 不为 None 时，ModuleRegistry 注册的是该模块的 IsolatedModule 代理：
+    process_data 在独立的工作进程池中执行，模块在每个工作进程中初始化一次，
+    主进程不调用其 initialize；此时模块在初始化前须可 pickle（spawn/forkserver 启动方式下）。
     """
 
+    dependencies: tuple[str, ...] = ()
+    start_timeout: float | None = None
+    lazy_init: bool = False
+    warmup_priority: int | None = None
+    isolation: "ProcessIsolation | None" = None
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        process_data = cls.__dict__.get("process_data")
+        if process_data is not None and not getattr(process_data, "_lazy_guarded", False):
+            cls.process_data = _guard_process_data(process_data)
+        aprocess_data = cls.__dict__.get("aprocess_data")
+        if aprocess_data is not None and not getattr(aprocess_data, "_lazy_guarded", False):
+            cls.aprocess_data = _guard_aprocess_data(aprocess_data)
+
     def __init__(self, name: str, config: BaseConfig | None = None):
         self.name = name
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{name}")
         self._initialized = False
         self._running = False
+        self._init_lock = threading.Lock()
+        self._init_metrics: dict[str, Any] = {
+            "attempts": 0,
+            "failures": 0,
+            "waiters": 0,
+            "init_time": None,
+            "trigger": None,
+            "initialized_at": None,
+            "last_error": None,
+        }
 
     @abstractmethod
     def initialize(self) -> bool:
@@ -60,6 +131,19 @@ class BaseModule(ABC, DataModule):
         """
         pass
 
+    async def aprocess_data(self, data: BaseDataModel) -> ProcessingResult:
+        """异步处理数据
+
+        默认将 process_data 卸载到线程池执行，I/O密集型模块可重写为原生协程。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            处理结果
+        """
+        return await asyncio.to_thread(self.process_data, data)
+
     @abstractmethod
     def get_supported_types(self) -> list[DataType]:
         """获取支持的数据类型（实现DataModule协议）
@@ -94,7 +178,7 @@ class BaseModule(ABC, DataModule):
     def get_status(self) -> str:
         """获取模块状态"""
         if not self._initialized:
-            return "未初始化"
+            return "运行中（待初始化）" if self._running else "未初始化"
         elif self._running:
             return "运行中"
         else:
@@ -106,11 +190,8 @@ class BaseModule(ABC, DataModule):
         Returns:
             是否启动成功
         """
-        if not self._initialized:
-            if not self.initialize():
-                self.logger.error(f"模块 {self.name} 初始化失败")
-                return False
-            self._initialized = True
+        if not self.lazy_init and not self.ensure_initialized("start"):
+            return False
 
         if self._running:
             self.logger.warning(f"模块 {self.name} 已在运行")
@@ -159,6 +240,61 @@ class BaseModule(ABC, DataModule):
         self.logger.info(f"重启模块: {self.name}")
         return self.stop() and self.start()
 
+    def ensure_initialized(self, trigger: str = "manual") -> bool:
+        """确保模块已初始化（单飞：并发调用只执行一次 initialize，其余调用等待其结果）
+
+        初始化失败后，下一次调用会重新尝试。
+
+        Args:
+            trigger: 触发来源（start/first_use/warmup/manual），记录在初始化指标中
+
+        Returns:
+            是否已初始化
+        """
+        if self._initialized:
+            return True
+
+        waited = not self._init_lock.acquire(blocking=False)
+        if waited:
+            self._init_lock.acquire()
+        try:
+            metrics = self._init_metrics
+            if waited:
+                metrics["waiters"] += 1
+            if self._initialized:
+                return True
+
+            metrics["attempts"] += 1
+            start_time = time.perf_counter()
+            try:
+                success = bool(self.initialize())
+                error = None if success else "initialize 返回失败"
+            except Exception as e:
+                success, error = False, str(e)
+            elapsed = time.perf_counter() - start_time
+
+            if not success:
+                metrics["failures"] += 1
+                metrics["last_error"] = error
+                self.logger.error(f"模块 {self.name} 初始化失败: {error}")
+                return False
+
+            metrics.update(init_time=elapsed, trigger=trigger, initialized_at=time.time())
+            self._initialized = True
+            self.logger.info(f"模块 {self.name} 初始化完成（{trigger}），耗时 {elapsed:.3f}s")
+            return True
+        finally:
+            self._init_lock.release()
+
+    def get_init_metrics(self) -> dict[str, Any]:
+        """获取初始化指标
+
+        Returns:
+            包含是否延迟初始化、尝试/失败次数、等待单飞初始化的调用数、
+            初始化耗时（秒）、触发来源和完成时间戳的字典
+        """
+        return {"initialized": self._initialized, "lazy": self.lazy_init, **self._init_metrics}
+
     def is_initialized(self) -> bool:
         """检查是否已初始化"""
         return self._initialized
@@ -189,15 +325,19 @@ class BaseModule(ABC, DataModule):
     def get_health_status(self) -> dict[str, Any]:
         """获取健康状态
 
+        healthy 表示模块运行中且配置有效（未设置配置的模块不因此判为不健康）。
+
         Returns:
             健康状态信息
         """
+        config_valid = len(self.validate_config()) == 0
         return {
             "name": self.name,
             "initialized": self._initialized,
             "running": self._running,
-            "config_valid": len(self.validate_config()) == 0,
+            "config_valid": config_valid,
             "supported_types": self.get_supported_types(),
+            "healthy": self._running and (config_valid or self.config is None),
         }
 
     def _start_internal(self) -> bool:
@@ -216,6 +356,25 @@ class BaseModule(ABC, DataModule):
         """
         return True
 
+    def _init_failed_result(self) -> ProcessingResult:
+        """延迟初始化失败时的错误结果"""
+        return ProcessingResult.trusted_error(
+            error=f"模块 {self.name} 初始化失败: {self._init_metrics['last_error']}",
+            processing_time=0.0,
+            error_code="MODULE_INIT_FAILED",
+            processor_name=self.name,
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """序列化时去掉初始化锁（进程池分发需要pickle模块）"""
+        state = self.__dict__.copy()
+        state.pop("_init_lock", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_lock = threading.Lock()
+
     def __enter__(self):
         """上下文管理器入口"""
         self.start()
@@ -262,26 +421,38 @@ class SimpleModule(BaseModule):
         return self._supported_types
 
     def process_data(self, data: BaseDataModel) -> ProcessingResult:
-        """处理数据"""
-        if data.type not in self._supported_types:
-            return ProcessingResult.error_result(
-                error=f"不支持的数据类型: {data.type}", processing_time=0.0, error_code="UNSUPPORTED_TYPE"
-            )
+        """处理数据
 
-        if self._process_func is None:
-            return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
-
-        try:
-            import time
-
-            start_time = time.time()
-            result_data = self._process_func(data)
-            processing_time = time.time() - start_time
+        结果的 timing 为本次调用的计时区间，失败时同样记录实际耗时。
+        """
+        with timed(self.name) as span:
+            if data.type not in self._supported_types:
+                return ProcessingResult.trusted_error(
+                    error=f"不支持的数据类型: {data.type}",
+                    processing_time=span.finish().duration,
+                    error_code="UNSUPPORTED_TYPE",
+                    timing=span,
+                )
+
+            if self._process_func is None:
+                return ProcessingResult.trusted_success(
+                    data=data, processing_time=span.finish().duration, processor_name=self.name, timing=span
+                )
 
-            return ProcessingResult.success_result(
-                data=result_data or data, processing_time=processing_time, processor_name=self.name
-            )
-        except Exception as e:
-            return ProcessingResult.error_result(
-                error=f"处理异常: {str(e)}", processing_time=0.0, error_code="PROCESSING_ERROR"
-            )
+            try:
+                result_data = self._process_func(data)
+                if result_data is not None and not isinstance(result_data, (BaseDataModel, BaseRecord)):
+                    raise TypeError(f"处理函数应返回数据模型，实际为 {type(result_data).__name__}")
+                return ProcessingResult.trusted_success(
+                    data=result_data or data,
+                    processing_time=span.finish().duration,
+                    processor_name=self.name,
+                    timing=span,
+                )
+            except Exception as e:
+                return ProcessingResult.trusted_error(
+                    error=f"处理异常: {str(e)}",
+                    processing_time=span.finish().duration,
+                    error_code="PROCESSING_ERROR",
+                    timing=span,
+                )
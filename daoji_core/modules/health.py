@@ -0,0 +1,299 @@
+"""
+模块健康探测
+在后台按固定间隔并发探测模块健康状态，缓存最近一次结果供健康检查接口直接读取
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from enum import Enum
+from itertools import pairwise
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from ..data.metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .base import BaseModule
+
+logger = logging.getLogger(__name__)
+
+
+class HealthState(str, Enum):
+    """模块健康状态"""
+
+    UNKNOWN = "unknown"  # 尚未完成探测
+    HEALTHY = "healthy"
+    UNHEALTHY = "unhealthy"
+    FLAPPING = "flapping"  # 最近的探测结果频繁在健康和不健康之间切换
+
+
+def is_healthy(status: Mapping[str, Any]) -> bool:
+    """根据模块的 get_health_status 结果判断是否健康
+
+    优先使用 healthy 字段，否则要求模块运行中且配置有效（缺少的字段视为满足）。
+    """
+    if "healthy" in status:
+        return bool(status["healthy"])
+    return bool(status.get("running", True)) and bool(status.get("config_valid", True))
+
+
+class ModuleHealth:
+    """单个模块的探测历史
+
+    保存最近 window 次探测结果；窗口内健康状态切换次数达到 flap_threshold 时判定为抖动。
+    """
+
+    def __init__(self, name: str, window: int = 10, flap_threshold: int = 4):
+        self.name = name
+        self.flap_threshold = flap_threshold
+        self.history: deque[bool] = deque(maxlen=window)
+        self.latency = LatencyHistogram()
+        self.state = HealthState.UNKNOWN
+        self.checks = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_latency: float | None = None
+        self.last_checked: float | None = None
+        self.last_changed: float | None = None
+        self.last_error: str | None = None
+        self.details: dict[str, Any] = {}
+
+    @property
+    def transitions(self) -> int:
+        """窗口内健康状态的切换次数"""
+        return sum(previous != current for previous, current in pairwise(self.history))
+
+    def record(
+        self, healthy: bool, latency: float, details: dict[str, Any] | None = None, error: str | None = None
+    ) -> None:
+        """记录一次探测结果"""
+        now = time.time()
+        self.checks += 1
+        self.history.append(healthy)
+        self.latency.observe(latency)
+        self.last_latency = latency
+        self.last_checked = now
+        self.details = details or {}
+        self.last_error = error
+        if healthy:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+        if self.transitions >= self.flap_threshold:
+            state = HealthState.FLAPPING
+        else:
+            state = HealthState.HEALTHY if healthy else HealthState.UNHEALTHY
+        if state != self.state:
+            if self.state != HealthState.UNKNOWN:
+                logger.warning(f"模块 {self.name} 健康状态变化: {self.state.value} -> {state.value}")
+            self.state = state
+            self.last_changed = now
+
+    def to_dict(self) -> dict[str, Any]:
+        """导出健康状态（时间戳为 Unix 时间，延迟单位为秒）"""
+        return {
+            "name": self.name,
+            "state": self.state.value,
+            "healthy": self.state == HealthState.HEALTHY,
+            "checks": self.checks,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "transitions": self.transitions,
+            "last_checked": self.last_checked,
+            "last_changed": self.last_changed,
+            "last_latency": self.last_latency,
+            "latency": self.latency.to_dict(),
+            "error": self.last_error,
+            "details": self.details,
+        }
+
+
+class HealthMonitor:
+    """模块健康监控器
+
+    后台线程每隔 interval 秒并发调用各模块的 get_health_status，结果缓存为不可变快照；
+    get_report/get_module_status 只读取快照，开销与模块数量无关。
+    探测超过 timeout 的模块记为不健康，其探测线程完成前不会重复提交。
+    """
+
+    def __init__(
+        self,
+        modules: Callable[[], Mapping[str, "BaseModule"]],
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        max_workers: int = 8,
+        window: int = 10,
+        flap_threshold: int = 4,
+    ):
+        """
+        Args:
+            modules: 返回当前模块名称到模块实例映射的函数（如注册表快照）
+            interval: 探测间隔（秒）
+            timeout: 单个模块的探测超时时间（秒）
+            max_workers: 并发探测的线程数
+            window: 抖动检测的探测历史窗口
+            flap_threshold: 窗口内状态切换次数达到该值时判定为抖动
+        """
+        if interval <= 0 or timeout <= 0:
+            raise ValueError("interval 和 timeout 必须大于0")
+        self.modules = modules
+        self.interval = interval
+        self.timeout = timeout
+        self.window = window
+        self.flap_threshold = flap_threshold
+        self.max_workers = max_workers
+        self.rounds = 0
+        self._health: dict[str, ModuleHealth] = {}
+        self._inflight: dict[str, tuple[Future, float]] = {}
+        self._report: Mapping[str, Any] = MappingProxyType(
+            {"healthy": False, "checked_at": None, "round_time": None, "modules": MappingProxyType({})}
+        )
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "HealthMonitor":
+        """启动后台探测线程（立即执行第一轮探测）"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="daoji-health-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"启动模块健康监控，间隔 {self.interval}s，超时 {self.timeout}s")
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """停止后台探测"""
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("停止模块健康监控")
+
+    @property
+    def running(self) -> bool:
+        """后台探测是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def probe(self) -> Mapping[str, Any]:
+        """立即执行一轮探测并更新缓存
+
+        只在提交探测和记录结果时持有锁，等待探测完成期间不阻塞 stop 和并发的 probe 调用。
+
+        Returns:
+            本轮探测后的健康报告
+        """
+        with self._lock:
+            modules = dict(self.modules())
+            started = time.perf_counter()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="daoji-health")
+            for name, module in modules.items():
+                # 上一轮超时的探测仍在执行时不重复提交
+                if name not in self._inflight:
+                    self._inflight[name] = (self._executor.submit(_timed_probe, module), time.perf_counter())
+            probes = {name: self._inflight[name] for name in modules}
+
+        wait([future for future, _ in probes.values()], timeout=self.timeout)
+
+        with self._lock:
+            for name, (future, submitted_at) in probes.items():
+                health = self._health.get(name)
+                if health is None:
+                    health = self._health[name] = ModuleHealth(name, self.window, self.flap_threshold)
+
+                if not future.done():
+                    health.record(False, time.perf_counter() - submitted_at, error=f"探测超时（{self.timeout}s）")
+                    continue
+
+                # 并发的 probe 已记录该结果，或监控器已停止（探测被取消）
+                if self._inflight.get(name, (None,))[0] is not future or future.cancelled():
+                    continue
+                del self._inflight[name]
+                healthy, latency, details, error = future.result()
+                health.record(healthy, latency, details, error)
+
+            for name in list(self._health):
+                if name not in modules:
+                    del self._health[name]
+                    self._inflight.pop(name, None)
+
+            self.rounds += 1
+            self._publish(time.perf_counter() - started)
+            return self._report
+
+    def get_report(self) -> Mapping[str, Any]:
+        """获取最近一轮的健康报告（不触发探测）
+
+        Returns:
+            包含整体健康状态、探测时间戳、本轮耗时和各模块状态的只读映射
+        """
+        return self._report
+
+    def get_module_status(self, name: str) -> Mapping[str, Any] | None:
+        """获取单个模块最近的健康状态（不触发探测）"""
+        return self._report["modules"].get(name)
+
+    def is_healthy(self) -> bool:
+        """最近一轮探测中是否所有模块都健康"""
+        return self._report["healthy"]
+
+    def _publish(self, round_time: float) -> None:
+        """生成并替换健康报告快照（调用方持有锁）"""
+        modules = {name: MappingProxyType(health.to_dict()) for name, health in self._health.items()}
+        self._report = MappingProxyType(
+            {
+                "healthy": all(status["healthy"] for status in modules.values()),
+                "checked_at": time.time(),
+                "round_time": round_time,
+                "modules": MappingProxyType(modules),
+            }
+        )
+
+    def _run(self) -> None:
+        """后台探测循环"""
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"模块健康探测异常: {e}")
+            self._stop_event.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def __enter__(self) -> "HealthMonitor":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _timed_probe(module: "BaseModule") -> tuple[bool, float, dict[str, Any], str | None]:
+    """探测单个模块并计时"""
+    start_time = time.perf_counter()
+    try:
+        status = module.get_health_status()
+    except Exception as e:
+        return False, time.perf_counter() - start_time, {}, str(e)
+    latency = time.perf_counter() - start_time
+    return is_healthy(status), latency, {key: _plain(value) for key, value in status.items()}, None
+
+
+def _plain(value: Any) -> Any:
+    """将枚举（包括列表中的枚举）转换为其值，便于健康报告序列化"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
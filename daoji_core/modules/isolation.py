@@ -0,0 +1,550 @@
+"""
+模块进程隔离
+在独立的工作进程中执行计算密集型模块的 process_data，避免其长时间占用API进程的GIL
+"""
+
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from ..data import BaseDataModel, DataType, ProcessingResult
+from ..data.metrics import LatencyHistogram
+from ..utils.exceptions import ModuleError
+from .base import BaseModule
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProcessIsolation:
+    """进程隔离配置"""
+
+    workers: int = 1  # 工作进程数（即该模块的最大并发处理数）
+    max_rss_mb: float | None = None  # 工作进程常驻内存超过该值（MB）时处理完当前记录后重启，None 表示不限制
+    shm_threshold: int = 1 << 20  # 序列化后达到该大小（字节）的数据经共享内存传递，0 表示始终经管道传递
+    call_timeout: float | None = None  # 单次处理超时时间（秒），超时的工作进程会被终止并重启
+    mp_context: str | None = None  # 进程启动方式（fork/spawn/forkserver），None 表示平台默认
+
+    def __post_init__(self) -> None:
+        if self.workers <= 0:
+            raise ValueError("workers 必须大于0")
+        if self.shm_threshold < 0:
+            raise ValueError("shm_threshold 不能小于0")
+
+
+def _current_rss() -> int | None:
+    """当前进程的常驻内存（字节）
+
+    优先读取 /proc/self/statm；其他平台退回 getrusage 的峰值常驻内存，均不可用时返回 None。
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _send(conn: Connection, kind: str, payload: bytes, threshold: int, **meta: Any) -> str | None:
+    """发送一条消息
+
+    payload 达到 threshold 时写入新建的共享内存块，管道只传递块名称，由接收方读取后删除。
+
+    Returns:
+        共享内存块名称（经管道传递时为 None）
+    """
+    if threshold and len(payload) >= threshold:
+        shm = SharedMemory(create=True, size=len(payload))
+        try:
+            shm.buf[: len(payload)] = payload
+        finally:
+            shm.close()
+        conn.send((kind, shm.name, len(payload), meta))
+        return shm.name
+    conn.send((kind, None, len(payload), meta))
+    conn.send_bytes(payload)
+    return None
+
+
+def _recv(conn: Connection) -> tuple[str, Any, dict[str, Any]]:
+    """接收一条消息并反序列化
+
+    Returns:
+        (消息类型, 数据, 附加信息)，经共享内存传递时附加信息包含块名称 shm
+    """
+    kind, shm_name, size, meta = conn.recv()
+    if shm_name is None:
+        return kind, pickle.loads(conn.recv_bytes()), meta
+
+    shm = SharedMemory(name=shm_name)
+    meta["shm"] = shm_name
+    try:
+        with shm.buf[:size] as view:
+            return kind, pickle.loads(view), meta
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard_shm(name: str) -> None:
+    """删除接收方未能读取的共享内存块"""
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _worker_main(conn: Connection, module: BaseModule, threshold: int) -> None:
+    """工作进程入口：初始化并启动模块一次（加载模型），随后循环处理请求直到收到停止消息"""
+    started = False
+    try:
+        started = module.ensure_initialized("worker") and module.start()
+        error = None if started else module.get_init_metrics()["last_error"] or "模块启动失败"
+        _send(conn, "ready", _dumps(started), 0, pid=os.getpid(), rss=_current_rss(), error=error)
+        if not started:
+            return
+
+        while True:
+            kind, data, _ = _recv(conn)
+            if kind == "stop":
+                break
+            try:
+                result = module.process_data(data)
+            except Exception as e:
+                result = ProcessingResult.trusted_error(
+                    error=f"处理异常: {e}",
+                    processing_time=0.0,
+                    error_code="PROCESSING_ERROR",
+                    processor_name=module.name,
+                )
+            _send(conn, "result", _dumps(result), threshold, rss=_current_rss())
+    except (EOFError, OSError):
+        # 主进程已退出或关闭了管道
+        pass
+    finally:
+        if started:
+            module.stop()
+            module.cleanup()
+        conn.close()
+
+
+class _Worker:
+    """主进程中的工作进程句柄"""
+
+    __slots__ = ("process", "conn", "pid", "calls", "rss")
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.pid = process.pid
+        self.calls = 0
+        self.rss: int | None = None
+
+
+class ModuleProcessPool:
+    """模块工作进程池
+
+    每个工作进程持有模块的一份副本，启动时初始化一次（加载模型），之后复用处理请求；
+    每个进程同一时间只处理一条记录，所有进程都忙时调用方等待。
+    数据和结果经 pickle 序列化，达到 shm_threshold 的经共享内存传递。
+    工作进程崩溃、处理超时或常驻内存超过 max_rss_mb 时，在后台启动新的进程替换它；
+    替换进程初始化失败时该进程槽位被移除，所有槽位都被移除后调用直接返回 WORKER_UNAVAILABLE。
+    """
+
+    def __init__(self, module: BaseModule, isolation: ProcessIsolation):
+        """
+        Args:
+            module: 模块实例（未初始化，启动方式为 spawn/forkserver 时须可 pickle）
+            isolation: 进程隔离配置
+        """
+        self.module = module
+        self.isolation = isolation
+        self._context = multiprocessing.get_context(isolation.mp_context)
+        self._rss_limit = None if isolation.max_rss_mb is None else int(isolation.max_rss_mb * 1024 * 1024)
+        self._idle: deque[_Worker] = deque()
+        self._workers: dict[int, _Worker] = {}
+        self._slots = 0
+        self._closed = True
+        self._condition = threading.Condition()
+        self._sequence = 0
+        self.last_error: str | None = None
+
+        self.calls = 0
+        self.errors = 0
+        self.crashes = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.restarts = 0
+        self.shm_transfers = 0
+        self.service_time = LatencyHistogram()
+
+    def start(self) -> bool:
+        """启动所有工作进程并等待其完成初始化
+
+        Returns:
+            是否所有工作进程都初始化成功（任一失败时全部终止）
+        """
+        if os.name == "posix":
+            # 在创建工作进程前启动资源跟踪进程，使主进程和工作进程共享同一个跟踪进程，
+            # 避免工作进程退出时误删尚未被读取的共享内存块
+            resource_tracker.ensure_running()
+
+        start_time = time.perf_counter()
+        workers = [self._spawn() for _ in range(self.isolation.workers)]
+        ready = [self._await_ready(worker) for worker in workers]
+        if not all(ready):
+            for worker in workers:
+                self._stop(worker)
+            return False
+
+        with self._condition:
+            self._closed = False
+            self._slots = len(workers)
+            self._idle.extend(workers)
+            self._workers.update((worker.pid, worker) for worker in workers)
+        logger.info(
+            f"模块 {self.module.name} 已启动 {len(workers)} 个工作进程，耗时 {time.perf_counter() - start_time:.3f}s"
+        )
+        return True
+
+    def call(self, data: BaseDataModel) -> ProcessingResult:
+        """在空闲的工作进程中处理一条记录
+
+        工作进程崩溃或超时时返回 WORKER_CRASHED/MODULE_TIMEOUT 错误结果，不会抛出异常。
+
+        Args:
+            data: 输入数据
+
+        Returns:
+            处理结果
+        """
+        start_time = time.perf_counter()
+        try:
+            payload = _dumps(data)
+        except Exception as e:
+            return self._error_result(f"数据无法序列化: {e}", "SERIALIZATION_ERROR", start_time)
+
+        worker = self._acquire()
+        if worker is None:
+            return self._error_result(f"模块 {self.module.name} 没有可用的工作进程", "WORKER_UNAVAILABLE", start_time)
+
+        shm_name = None
+        try:
+            shm_name = _send(worker.conn, "process", payload, self.isolation.shm_threshold)
+            timeout = self.isolation.call_timeout
+            if timeout is not None and not worker.conn.poll(timeout):
+                raise TimeoutError
+            _, result, meta = _recv(worker.conn)
+        except TimeoutError:
+            self._retire(worker, "timeout", shm_name)
+            return self._error_result(
+                f"模块 {self.module.name} 处理超时（{self.isolation.call_timeout}s）", "MODULE_TIMEOUT", start_time
+            )
+        except (EOFError, OSError) as e:
+            self._retire(worker, "crash", shm_name)
+            return self._error_result(f"模块 {self.module.name} 的工作进程崩溃: {e!r}", "WORKER_CRASHED", start_time)
+        except Exception as e:
+            # 消息已完整读取，工作进程状态正常
+            self._release(worker)
+            return self._error_result(f"处理结果无法反序列化: {e}", "SERIALIZATION_ERROR", start_time)
+
+        worker.calls += 1
+        worker.rss = meta.get("rss")
+        with self._condition:
+            self.calls += 1
+            self.errors += not result.success
+            self.shm_transfers += (shm_name is not None) + (meta.get("shm") is not None)
+            self.service_time.observe(time.perf_counter() - start_time)
+
+        if self._rss_limit is not None and worker.rss is not None and worker.rss > self._rss_limit:
+            self._retire(worker, "rss")
+        else:
+            self._release(worker)
+        return result
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """停止所有工作进程
+
+        空闲的进程立即停止，正在处理的进程在当前记录处理完后停止。
+
+        Args:
+            timeout: 等待每个进程正常退出的时间（秒），超时后强制终止
+        """
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for worker in idle:
+            self._stop(worker, timeout)
+        logger.info(f"模块 {self.module.name} 的工作进程池已关闭")
+
+    @property
+    def alive(self) -> int:
+        """可用（含正在重启）的工作进程槽位数"""
+        return self._slots
+
+    def get_statistics(self) -> dict[str, Any]:
+        """获取进程池统计信息（常驻内存单位为字节，处理时间单位为秒）"""
+        with self._condition:
+            return {
+                "workers": self.isolation.workers,
+                "alive": self._slots,
+                "idle": len(self._idle),
+                "closed": self._closed,
+                "calls": self.calls,
+                "errors": self.errors,
+                "crashes": self.crashes,
+                "timeouts": self.timeouts,
+                "recycled": self.recycled,
+                "restarts": self.restarts,
+                "shm_transfers": self.shm_transfers,
+                "processes": {pid: {"calls": w.calls, "rss": w.rss} for pid, w in self._workers.items()},
+                "service_time": self.service_time.to_dict(),
+            }
+
+    def _spawn(self) -> _Worker:
+        """创建一个工作进程（不等待初始化完成）"""
+        self._sequence += 1
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.module, self.isolation.shm_threshold),
+            name=f"daoji-{self.module.name}-{self._sequence}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _await_ready(self, worker: _Worker) -> bool:
+        """等待工作进程完成模块初始化"""
+        try:
+            _, ready, meta = _recv(worker.conn)
+        except (EOFError, OSError) as e:
+            ready, meta = False, {"error": f"工作进程初始化时退出: {e!r}"}
+        if not ready:
+            self.last_error = meta.get("error")
+            logger.error(f"模块 {self.module.name} 的工作进程初始化失败: {self.last_error}")
+            return False
+        worker.rss = meta.get("rss")
+        return True
+
+    def _acquire(self) -> _Worker | None:
+        """取出一个空闲的工作进程（都在忙时等待），进程池已关闭或没有可用槽位时返回 None"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._idle or self._closed or self._slots == 0)
+            if self._closed or not self._idle:
+                return None
+            return self._idle.popleft()
+
+    def _release(self, worker: _Worker) -> None:
+        """归还工作进程（进程池已关闭时停止它）"""
+        with self._condition:
+            if not self._closed:
+                self._idle.append(worker)
+                self._condition.notify()
+                return
+        self._stop(worker)
+
+    def _retire(self, worker: _Worker, reason: str, shm_name: str | None = None) -> None:
+        """淘汰工作进程并在后台启动替换进程
+
+        Args:
+            worker: 工作进程
+            reason: crash/timeout/rss
+            shm_name: 工作进程未能读取的请求共享内存块
+        """
+        with self._condition:
+            self._workers.pop(worker.pid, None)
+            if reason == "crash":
+                self.crashes += 1
+            elif reason == "timeout":
+                self.timeouts += 1
+            else:
+                self.recycled += 1
+
+        if reason == "rss":
+            logger.warning(
+                f"模块 {self.module.name} 的工作进程 {worker.pid} 常驻内存 {worker.rss / 1024 / 1024:.1f}MB "
+                f"超过上限 {self.isolation.max_rss_mb}MB，重启该进程"
+            )
+        else:
+            logger.error(f"模块 {self.module.name} 的工作进程 {worker.pid} 异常（{reason}），重启该进程")
+        threading.Thread(
+            target=self._replace, args=(worker, reason, shm_name), name=f"daoji-restart-{self.module.name}", daemon=True
+        ).start()
+
+    def _replace(self, worker: _Worker, reason: str, shm_name: str | None) -> None:
+        """停止旧进程，启动并初始化新进程后放回空闲队列"""
+        if reason == "rss":
+            self._stop(worker)
+        else:
+            self._kill(worker)
+        if shm_name is not None:
+            _discard_shm(shm_name)
+
+        replacement = None
+        if not self._closed:
+            try:
+                replacement = self._spawn()
+            except Exception as e:
+                logger.error(f"模块 {self.module.name} 的替换工作进程启动失败: {e}")
+        if replacement is not None and not self._await_ready(replacement):
+            self._kill(replacement)
+            replacement = None
+
+        with self._condition:
+            if replacement is not None and not self._closed:
+                self.restarts += 1
+                self._workers[replacement.pid] = replacement
+                self._idle.append(replacement)
+            else:
+                self._slots -= 1
+                if self._slots == 0 and not self._closed:
+                    logger.error(f"模块 {self.module.name} 没有可用的工作进程")
+            self._condition.notify_all()
+
+        if replacement is not None and self._closed:
+            self._stop(replacement)
+
+    def _stop(self, worker: _Worker, timeout: float = 5.0) -> None:
+        """通知工作进程正常退出（清理模块资源），超时后强制终止"""
+        try:
+            _send(worker.conn, "stop", _dumps(None), 0)
+        except (OSError, ValueError):
+            pass
+        worker.process.join(timeout)
+        self._kill(worker)
+
+    def _kill(self, worker: _Worker) -> None:
+        """强制终止工作进程并关闭管道"""
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(1.0)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        worker.conn.close()
+
+    def _error_result(self, error: str, error_code: str, start_time: float) -> ProcessingResult:
+        """构造进程池层面的错误结果"""
+        with self._condition:
+            self.errors += 1
+        return ProcessingResult.trusted_error(
+            error=error,
+            processing_time=time.perf_counter() - start_time,
+            error_code=error_code,
+            processor_name=self.module.name,
+        )
+
+    def __repr__(self) -> str:
+        return f"ModuleProcessPool(module='{self.module.name}', workers={self.isolation.workers}, alive={self._slots})"
+
+
+class IsolatedModule(BaseModule):
+    """进程隔离模块代理
+
+    与被代理模块同名，对外提供相同的接口，process_data 转发到 ModuleProcessPool 的工作进程执行。
+    被代理模块只在工作进程中初始化（每个进程一次），主进程不加载其模型等资源；
+    代理的 initialize 启动工作进程池，cleanup 关闭进程池。
+    由 ModuleRegistry.register_module 根据模块的 isolation 配置自动创建。
+    """
+
+    def __init__(self, module: BaseModule, isolation: ProcessIsolation | None = None):
+        """
+        Args:
+            module: 被代理的模块实例（不应已初始化）
+            isolation: 进程隔离配置，None 表示使用模块的 isolation（未设置时使用默认配置）
+        """
+        super().__init__(module.name, module.config)
+        self.module = module
+        self.isolation = isolation or module.isolation or ProcessIsolation()
+        self.dependencies = module.dependencies
+        self.start_timeout = module.start_timeout
+        self.lazy_init = module.lazy_init
+        self.warmup_priority = module.warmup_priority
+        self._pool: ModuleProcessPool | None = None
+
+    def initialize(self) -> bool:
+        """启动工作进程池（每个工作进程初始化一次被代理模块）
+
+        Raises:
+            ModuleError: 工作进程初始化失败
+        """
+        pool = ModuleProcessPool(self.module, self.isolation)
+        if not pool.start():
+            raise ModuleError(
+                f"工作进程初始化失败: {pool.last_error}", module_name=self.name, error_code="WORKER_INIT_FAILED"
+            )
+        self._pool = pool
+        return True
+
+    def cleanup(self) -> bool:
+        """关闭工作进程池（工作进程退出前清理被代理模块）"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+        self._initialized = False
+        return True
+
+    def process_data(self, data: BaseDataModel) -> ProcessingResult:
+        """在工作进程中处理数据"""
+        pool = self._pool
+        if pool is None:
+            return ProcessingResult.trusted_error(
+                error=f"模块 {self.name} 的工作进程未启动",
+                processing_time=0.0,
+                error_code="MODULE_NOT_INITIALIZED",
+                processor_name=self.name,
+            )
+        return pool.call(data)
+
+    def get_supported_types(self) -> list[DataType]:
+        return self.module.get_supported_types()
+
+    def get_description(self) -> str:
+        return self.module.get_description()
+
+    def get_version(self) -> str:
+        return self.module.get_version()
+
+    def get_module_info(self) -> dict[str, str]:
+        info = super().get_module_info()
+        info.update(type=type(self.module).__name__, isolation="process")
+        return info
+
+    def get_process_statistics(self) -> dict[str, Any] | None:
+        """获取工作进程池统计信息（进程池未启动时为 None）"""
+        pool = self._pool
+        return None if pool is None else pool.get_statistics()
+
+    def get_health_status(self) -> dict[str, Any]:
+        """获取健康状态（进程池已启动但没有可用的工作进程时判为不健康）"""
+        status = super().get_health_status()
+        pool = self._pool
+        if pool is not None:
+            status["workers_alive"] = pool.alive
+            status["healthy"] = status["healthy"] and pool.alive > 0
+        return status
@@ -4,13 +4,51 @@
 """
 
 import logging
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Optional
 
+from ..utils.exceptions import ModuleError
 from .base import BaseModule
+from .health import HealthMonitor
+from .isolation import IsolatedModule, ProcessIsolation
+from .startup import StartupReport, dependency_levels, start_in_dependency_order
+from .warmup import WarmupPool
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """模块注册表的不可变快照
+
+    持有快照的调用方可以安全地遍历，不受并发注册/注销的影响。
+    """
+
+    version: int
+    names: tuple[str, ...]
+    modules: Mapping[str, BaseModule]
+    module_types: Mapping[str, type[BaseModule]]
+    dependencies: Mapping[str, tuple[str, ...]]
+
+
+class _SnapshotCache:
+    """注册表版本号和缓存的快照
+
+    放在独立对象中而不是类属性上：每次写操作都会更新它们，
+    频繁给类属性赋值会使类型的属性查找缓存失效。
+    """
+
+    __slots__ = ("version", "snapshot")
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.snapshot: RegistrySnapshot | None = None
+
+
 class ModuleRegistry:
     """模块注册器
 
@@ -18,47 +56,118 @@ class ModuleRegistry:
     - 模块注册和注销
     - 模块发现和查找
     - 批量操作
-    - 依赖管理
+    - 依赖管理（按依赖关系并行启动、逆序停止）
+    - 进程隔离（配置了 isolation 的模块以 IsolatedModule 代理注册，在工作进程中处理数据）
+
+    线程安全：写操作（注册、注销、设置依赖、清空）持有注册表锁；
+    按名称查找不加锁（单次字典读取是原子的）；遍历和批量操作基于不可变快照，
+    快照在每次写操作后的首次读取时复制一次并缓存，写操作本身保持 O(1)。
     """
 
     _instance: Optional["ModuleRegistry"] = None
+    _instance_lock = threading.Lock()
+    _lock = threading.RLock()
     _modules: dict[str, BaseModule] = {}
     _module_types: dict[str, type[BaseModule]] = {}
+    _dependencies: dict[str, tuple[str, ...]] = {}
+    _cache = _SnapshotCache()
+    _startup_report: StartupReport | None = None
+    _warmup_pool: WarmupPool | None = None
+    _warmups: dict[str, Future] = {}
+    _health_monitor: HealthMonitor | None = None
 
     def __new__(cls) -> "ModuleRegistry":
-        """单例模式"""
+        """单例模式（双重检查加锁，并发首次调用只创建一个实例）"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.logger = logging.getLogger(__name__)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.logger = logging.getLogger(__name__)
+                    cls._instance = instance
         return cls._instance
 
     @classmethod
     def get_instance(cls) -> "ModuleRegistry":
         """获取单例实例"""
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        instance = cls._instance
+        return instance if instance is not None else cls()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """获取注册表的不可变快照
 
-    def register_module(self, module: BaseModule) -> bool:
+        注册表未变更时直接返回缓存的快照（不加锁）。
+
+        Returns:
+            当前版本的注册表快照
+        """
+        cache = self._cache
+        snapshot = cache.snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if cache.snapshot is None:
+                cache.snapshot = RegistrySnapshot(
+                    version=cache.version,
+                    names=tuple(self._modules),
+                    modules=MappingProxyType(dict(self._modules)),
+                    module_types=MappingProxyType(dict(self._module_types)),
+                    dependencies=MappingProxyType(dict(self._dependencies)),
+                )
+            return cache.snapshot
+
+    def _invalidate(self) -> None:
+        """写操作后递增版本并丢弃缓存的快照（调用方持有锁）"""
+        cache = self._cache
+        cache.version += 1
+        cache.snapshot = None
+
+    def register_module(
+        self,
+        module: BaseModule,
+        depends_on: Iterable[str] | None = None,
+        lazy: bool | None = None,
+        warmup_priority: int | None = None,
+        isolation: ProcessIsolation | None = None,
+    ) -> bool:
         """注册模块
 
         Args:
             module: 模块实例
+            depends_on: 额外的依赖模块名称，与模块类声明的 dependencies 合并
+            lazy: 是否延迟到首次调用时初始化，None 表示沿用模块的 lazy_init
+            warmup_priority: 后台预热优先级（数值越小越先），None 表示沿用模块的 warmup_priority
+            isolation: 进程隔离配置，None 表示沿用模块的 isolation；设置时注册的是模块的
+                IsolatedModule 代理，get_module 返回代理，get_module_type 返回原模块类型
 
         Returns:
             是否注册成功
         """
-        if not isinstance(module, BaseModule):
+        # 用 issubclass 检查：BaseModule 的元类是 Protocol 元类，其 isinstance 检查为纯Python实现，开销较大
+        if not issubclass(type(module), BaseModule):
             self.logger.error(f"模块必须继承自BaseModule: {type(module)}")
             return False
 
         name = module.name
-        if name in self._modules:
-            self.logger.warning(f"模块 {name} 已存在，将被覆盖")
-
-        self._modules[name] = module
-        self._module_types[name] = type(module)
-        self.logger.info(f"注册模块: {name} ({type(module).__name__})")
+        if lazy is not None:
+            module.lazy_init = lazy
+        if warmup_priority is not None:
+            module.warmup_priority = warmup_priority
+        dependencies = tuple(dict.fromkeys([*module.dependencies, *(depends_on or ())]))
+
+        isolation = isolation if isolation is not None else module.isolation
+        if isolation is not None and not issubclass(type(module), IsolatedModule):
+            module = IsolatedModule(module, isolation)
+        module_type = type(module.module) if issubclass(type(module), IsolatedModule) else type(module)
+
+        with self._lock:
+            if name in self._modules:
+                self.logger.warning(f"模块 {name} 已存在，将被覆盖")
+            self._modules[name] = module
+            self._module_types[name] = module_type
+            self._dependencies[name] = dependencies
+            self._invalidate()
+        suffix = "，进程隔离" if isolation is not None else ""
+        self.logger.info(f"注册模块: {name} ({module_type.__name__}{suffix})")
         return True
 
     def unregister_module(self, name: str) -> bool:
@@ -70,11 +179,20 @@ class ModuleRegistry:
         Returns:
             是否注销成功
         """
-        if name not in self._modules:
-            self.logger.warning(f"模块 {name} 不存在")
-            return False
-
-        module = self._modules[name]
+        # 先从注册表移除，并发注销同一模块时只有一个调用会执行停止和清理
+        with self._lock:
+            module = self._modules.pop(name, None)
+            if module is None:
+                self.logger.warning(f"模块 {name} 不存在")
+                return False
+            del self._module_types[name]
+            self._dependencies.pop(name, None)
+            warmup = self._warmups.pop(name, None)
+            self._invalidate()
+
+        # 取消尚未开始的预热
+        if warmup is not None:
+            warmup.cancel()
 
         # 停止模块
         if module.is_running():
@@ -83,10 +201,6 @@ class ModuleRegistry:
         # 清理资源
         module.cleanup()
 
-        # 从注册表移除
-        del self._modules[name]
-        del self._module_types[name]
-
         self.logger.info(f"注销模块: {name}")
         return True
 
@@ -118,7 +232,7 @@ class ModuleRegistry:
         Returns:
             模块名称列表
         """
-        return list(self._modules.keys())
+        return list(self.snapshot().names)
 
     def list_module_info(self) -> dict[str, dict[str, Any]]:
         """列出所有模块的详细信息
@@ -126,7 +240,7 @@ class ModuleRegistry:
         Returns:
             模块信息字典
         """
-        return {name: module.get_module_info() for name, module in self._modules.items()}
+        return {name: module.get_module_info() for name, module in self.snapshot().modules.items()}
 
     def find_modules_by_type(self, module_type: type[BaseModule]) -> list[BaseModule]:
         """根据类型查找模块
@@ -137,7 +251,10 @@ class ModuleRegistry:
         Returns:
             匹配的模块列表
         """
-        return [module for module in self._modules.values() if isinstance(module, module_type)]
+        snapshot = self.snapshot()
+        return [
+            module for name, module in snapshot.modules.items() if issubclass(snapshot.module_types[name], module_type)
+        ]
 
     def find_modules_by_status(self, running: bool) -> list[BaseModule]:
         """根据运行状态查找模块
@@ -148,7 +265,7 @@ class ModuleRegistry:
         Returns:
             匹配的模块列表
         """
-        return [module for module in self._modules.values() if module.is_running() == running]
+        return [module for module in self.snapshot().modules.values() if module.is_running() == running]
 
     def start_module(self, name: str) -> bool:
         """启动指定模块
@@ -198,32 +315,176 @@ class ModuleRegistry:
 
         return module.restart()
 
-    def start_all_modules(self) -> dict[str, bool]:
-        """启动所有模块
+    def set_dependencies(self, name: str, depends_on: Iterable[str]) -> None:
+        """设置模块的依赖（替换已有依赖）
+
+        Args:
+            name: 模块名称
+            depends_on: 依赖模块名称
+
+        Raises:
+            ModuleError: 模块不存在
+        """
+        dependencies = tuple(dict.fromkeys(depends_on))
+        with self._lock:
+            if name not in self._modules:
+                raise ModuleError("模块不存在", module_name=name, error_code="MODULE_NOT_FOUND")
+            self._dependencies[name] = dependencies
+            self._invalidate()
+
+    def get_dependencies(self, name: str) -> list[str]:
+        """获取模块的依赖模块名称"""
+        return list(self._dependencies.get(name, ()))
+
+    def get_dependents(self, name: str) -> list[str]:
+        """获取直接依赖指定模块的模块名称"""
+        return [module_name for module_name, deps in self.snapshot().dependencies.items() if name in deps]
+
+    def resolve_start_order(self) -> list[list[str]]:
+        """按依赖关系计算启动顺序
+
+        Returns:
+            分层的模块名称列表，同一层的模块互不依赖
+
+        Raises:
+            ModuleError: 存在未注册的依赖或循环依赖
+        """
+        snapshot = self.snapshot()
+        for name, deps in snapshot.dependencies.items():
+            missing = [dep for dep in deps if dep not in snapshot.modules]
+            if missing:
+                raise ModuleError(f"依赖模块未注册: {missing}", module_name=name, error_code="DEPENDENCY_MISSING")
+
+        levels, cyclic = dependency_levels(snapshot.dependencies)
+        if cyclic:
+            raise ModuleError(f"模块存在循环依赖: {cyclic}", error_code="DEPENDENCY_CYCLE")
+        return levels
+
+    def start_modules(
+        self, max_workers: int | None = None, timeout: float | None = None, warmup: bool = True
+    ) -> StartupReport:
+        """按依赖关系并行启动所有模块
+
+        模块在其依赖全部启动成功后立即启动，互不依赖的模块并发启动；
+        依赖启动失败、超时、未注册或循环依赖的模块不会被启动。
+        延迟初始化的模块启动时不初始化，设置了 warmup_priority 的会在启动后提交后台预热。
+
+        Args:
+            max_workers: 最大并发启动数，None 使用线程池默认值
+            timeout: 默认的单个模块启动超时时间（秒），模块的 start_timeout 优先
+            warmup: 是否为设置了 warmup_priority 的延迟初始化模块提交后台预热
+
+        Returns:
+            启动报告（包含每个模块的启动耗时和关键路径）
+        """
+        snapshot = self.snapshot()
+        modules = snapshot.modules
+        report = start_in_dependency_order(
+            {name: module.start for name, module in modules.items()},
+            snapshot.dependencies,
+            timeouts={
+                name: module.start_timeout if module.start_timeout is not None else timeout
+                for name, module in modules.items()
+            },
+            max_workers=max_workers,
+        )
+        ModuleRegistry._startup_report = report
+
+        for name, record in report.records.items():
+            if not record.success:
+                self.logger.error(f"启动模块 {name} 失败 [{record.error_code}]: {record.error}")
+        self.logger.info(
+            f"启动 {len(modules)} 个模块完成，耗时 {report.total_time:.3f}s，"
+            f"关键路径: {' -> '.join(report.critical_path) or '无'} ({report.critical_path_time:.3f}s)"
+        )
+
+        if warmup:
+            names = [
+                name
+                for name, module in modules.items()
+                if report.records[name].success and module.lazy_init and module.warmup_priority is not None
+            ]
+            if names:
+                self.warm_up(names)
+        return report
+
+    def warm_up(
+        self, names: Iterable[str] | None = None, priority: int | None = None, workers: int = 1
+    ) -> dict[str, Future]:
+        """在后台预热（初始化）模块
+
+        Args:
+            names: 模块名称，None 表示所有设置了 warmup_priority 且未初始化的模块
+            priority: 预热优先级，None 表示使用模块的 warmup_priority（未设置时为 0）
+            workers: 首次创建预热线程池时的线程数
+
+        Returns:
+            模块名称到初始化结果 Future 的映射（已初始化或不存在的模块不包含在内）
+        """
+        modules = self.snapshot().modules
+        if names is None:
+            names = [name for name, module in modules.items() if module.warmup_priority is not None]
+
+        # 按优先级排序后提交，避免先提交的低优先级任务在高优先级任务入队前被取走
+        candidates = []
+        for name in names:
+            module = modules.get(name)
+            if module is not None and not module.is_initialized():
+                candidates.append((priority if priority is not None else (module.warmup_priority or 0), name, module))
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        futures = {}
+        with self._lock:
+            if self._warmup_pool is None:
+                ModuleRegistry._warmup_pool = WarmupPool(workers=workers)
+            for module_priority, name, module in candidates:
+                pending = self._warmups.get(name)
+                if pending is not None and not pending.done():
+                    futures[name] = pending
+                    continue
+                futures[name] = self._warmups[name] = self._warmup_pool.schedule(module, module_priority)
+                self.logger.debug(f"提交模块 {name} 的后台预热，优先级 {module_priority}")
+        return futures
+
+    def get_init_metrics(self) -> dict[str, dict[str, Any]]:
+        """获取所有模块的初始化指标（见 BaseModule.get_init_metrics）"""
+        return {name: module.get_init_metrics() for name, module in self.snapshot().modules.items()}
+
+    def start_all_modules(self, max_workers: int | None = None, timeout: float | None = None) -> dict[str, bool]:
+        """启动所有模块（按依赖关系并行启动，详见 start_modules）
+
+        Args:
+            max_workers: 最大并发启动数
+            timeout: 默认的单个模块启动超时时间（秒）
 
         Returns:
             模块名称到启动结果的映射
         """
-        results = {}
-        for name, module in self._modules.items():
-            try:
-                results[name] = module.start()
-            except Exception as e:
-                self.logger.error(f"启动模块 {name} 异常: {e}")
-                results[name] = False
+        return self.start_modules(max_workers=max_workers, timeout=timeout).results
 
-        return results
+    def get_startup_report(self) -> StartupReport | None:
+        """获取最近一次批量启动的报告"""
+        return self._startup_report
 
     def stop_all_modules(self) -> dict[str, bool]:
         """停止所有模块
 
+        按启动顺序的逆序停止：依赖其他模块的模块先停止，被依赖的模块最后停止。
+
         Returns:
             模块名称到停止结果的映射
         """
+        return self._stop_modules(self.snapshot())
+
+    def _stop_modules(self, snapshot: RegistrySnapshot) -> dict[str, bool]:
+        """按依赖关系逆序停止快照中的模块"""
+        levels, cyclic = dependency_levels(snapshot.dependencies)
+        order = [name for level in levels for name in level] + cyclic
+
         results = {}
-        for name, module in self._modules.items():
+        for name in reversed(order):
             try:
-                results[name] = module.stop()
+                results[name] = snapshot.modules[name].stop()
             except Exception as e:
                 self.logger.error(f"停止模块 {name} 异常: {e}")
                 results[name] = False
@@ -238,7 +499,7 @@ class ModuleRegistry:
         """
         validation_results = {}
 
-        for name, module in self._modules.items():
+        for name, module in self.snapshot().modules.items():
             try:
                 errors = module.validate_config()
                 validation_results[name] = errors
@@ -248,14 +509,14 @@ class ModuleRegistry:
         return validation_results
 
     def get_health_status(self) -> dict[str, dict[str, Any]]:
-        """获取所有模块的健康状态
+        """获取所有模块的健康状态（同步逐个调用模块，缓存的结果见 get_health_report）
 
         Returns:
             模块健康状态信息
         """
         health_status = {}
 
-        for name, module in self._modules.items():
+        for name, module in self.snapshot().modules.items():
             try:
                 health_status[name] = module.get_health_status()
             except Exception as e:
@@ -263,22 +524,89 @@ class ModuleRegistry:
 
         return health_status
 
+    def start_health_monitor(
+        self,
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        max_workers: int = 8,
+        window: int = 10,
+        flap_threshold: int = 4,
+    ) -> HealthMonitor:
+        """启动后台健康监控（替换已有的监控器）
+
+        监控器每隔 interval 秒并发探测所有已注册模块，get_health_report 直接返回缓存的结果。
+
+        Args:
+            interval: 探测间隔（秒）
+            timeout: 单个模块的探测超时时间（秒）
+            max_workers: 并发探测的线程数
+            window: 抖动检测的探测历史窗口
+            flap_threshold: 窗口内状态切换次数达到该值时判定为抖动
+
+        Returns:
+            健康监控器
+        """
+        monitor = HealthMonitor(
+            lambda: self.snapshot().modules,
+            interval=interval,
+            timeout=timeout,
+            max_workers=max_workers,
+            window=window,
+            flap_threshold=flap_threshold,
+        )
+        with self._lock:
+            previous, ModuleRegistry._health_monitor = self._health_monitor, monitor
+        if previous is not None:
+            previous.stop(wait=False)
+        return monitor.start()
+
+    def stop_health_monitor(self) -> None:
+        """停止后台健康监控"""
+        with self._lock:
+            monitor, ModuleRegistry._health_monitor = self._health_monitor, None
+        if monitor is not None:
+            monitor.stop()
+
+    def get_health_report(self, refresh: bool = False) -> Mapping[str, Any]:
+        """获取健康报告（适用于 /health 接口）
+
+        后台监控运行时直接返回最近一轮的缓存结果，开销与模块数量无关；
+        未启动监控或 refresh 为 True 时同步执行一轮并发探测。
+
+        Args:
+            refresh: 是否立即重新探测
+
+        Returns:
+            包含整体健康状态、探测时间戳和各模块状态（状态、心跳延迟、抖动检测等）的只读映射
+        """
+        monitor = self._health_monitor
+        if monitor is not None and monitor.running and not refresh:
+            return monitor.get_report()
+        if monitor is None:
+            with self._lock:
+                if self._health_monitor is None:
+                    ModuleRegistry._health_monitor = HealthMonitor(lambda: self.snapshot().modules)
+                monitor = self._health_monitor
+        return monitor.probe()
+
     def get_registry_statistics(self) -> dict[str, Any]:
         """获取注册表统计信息
 
         Returns:
             统计信息字典
         """
-        running_count = len(self.find_modules_by_status(True))
-        stopped_count = len(self.find_modules_by_status(False))
-
+        snapshot = self.snapshot()
+        modules = snapshot.modules
+        running_count = 0
         type_counts = {}
-        for module in self._modules.values():
-            module_type = type(module).__name__
+        for name, module in modules.items():
+            running_count += module.is_running()
+            module_type = snapshot.module_types[name].__name__
             type_counts[module_type] = type_counts.get(module_type, 0) + 1
+        stopped_count = len(modules) - running_count
 
         return {
-            "total_modules": len(self._modules),
+            "total_modules": len(modules),
             "running_modules": running_count,
             "stopped_modules": stopped_count,
             "module_types": type_counts,
@@ -286,19 +614,30 @@ class ModuleRegistry:
 
     def clear_registry(self) -> None:
         """清空注册表（主要用于测试）"""
+        # 先清空注册表，再停止和清理被移除的模块
+        with self._lock:
+            snapshot = self.snapshot()
+            self._modules.clear()
+            self._module_types.clear()
+            self._dependencies.clear()
+            self._invalidate()
+
+            # 关闭预热线程池，取消尚未开始的预热
+            if self._warmup_pool is not None:
+                self._warmup_pool.shutdown(wait=False)
+                ModuleRegistry._warmup_pool = None
+            self._warmups.clear()
+
         # 停止所有模块
-        self.stop_all_modules()
+        self._stop_modules(snapshot)
 
         # 清理所有模块
-        for module in self._modules.values():
+        for module in snapshot.modules.values():
             try:
                 module.cleanup()
             except Exception as e:
                 self.logger.error(f"清理模块异常: {e}")
 
-        # 清空注册表
-        self._modules.clear()
-        self._module_types.clear()
         self.logger.info("清空模块注册表")
 
     def export_module_config(self) -> dict[str, dict[str, Any]]:
@@ -309,7 +648,7 @@ class ModuleRegistry:
         """
         configs = {}
 
-        for name, module in self._modules.items():
+        for name, module in self.snapshot().modules.items():
             if module.config is not None:
                 try:
                     configs[name] = module.config.dict()
@@ -329,9 +668,9 @@ class ModuleRegistry:
         """检查模块是否已注册"""
         return name in self._modules
 
-    def __iter__(self):
-        """迭代所有模块"""
-        return iter(self._modules.values())
+    def __iter__(self) -> Iterator[BaseModule]:
+        """迭代所有模块（基于快照，迭代期间的注册/注销不影响本次迭代）"""
+        return iter(self.snapshot().modules.values())
 
     def __repr__(self) -> str:
         return f"ModuleRegistry(modules={len(self._modules)})"
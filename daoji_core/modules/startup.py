@@ -0,0 +1,238 @@
+"""
+模块启动调度
+按模块间的依赖关系并行启动模块，记录每个模块的启动耗时并计算关键路径
+"""
+
+import logging
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModuleStartRecord:
+    """单个模块的启动记录（时间单位为秒，started_at 相对于调度开始）"""
+
+    name: str
+    success: bool = False
+    started_at: float | None = None
+    duration: float = 0.0
+    error: str | None = None
+    error_code: str | None = None
+
+    @property
+    def finished_at(self) -> float:
+        """启动结束时间（未开始启动时为 0）"""
+        return (self.started_at or 0.0) + self.duration
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+
+@dataclass
+class StartupReport:
+    """模块启动报告
+
+    critical_path 为决定总启动时间的依赖链：从最后完成的模块出发，
+    逐级回溯到其最晚完成的依赖模块。
+    """
+
+    records: dict[str, ModuleStartRecord]
+    total_time: float
+    critical_path: list[str] = field(default_factory=list)
+
+    @property
+    def results(self) -> dict[str, bool]:
+        """模块名称到启动结果的映射"""
+        return {name: record.success for name, record in self.records.items()}
+
+    @property
+    def success(self) -> bool:
+        """是否所有模块都启动成功"""
+        return all(record.success for record in self.records.values())
+
+    @property
+    def critical_path_time(self) -> float:
+        """关键路径上各模块启动耗时之和"""
+        return sum(self.records[name].duration for name in self.critical_path)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {
+            "success": self.success,
+            "total_time": self.total_time,
+            "critical_path": list(self.critical_path),
+            "critical_path_time": self.critical_path_time,
+            "modules": {name: record.to_dict() for name, record in self.records.items()},
+        }
+
+
+def dependency_levels(dependencies: Mapping[str, Iterable[str]]) -> tuple[list[list[str]], list[str]]:
+    """按依赖关系对模块分层（Kahn 算法）
+
+    同一层的模块互不依赖，可以并行启动；不在 dependencies 中的依赖被忽略。
+
+    Args:
+        dependencies: 模块名称到其依赖模块名称的映射（保持插入顺序）
+
+    Returns:
+        (分层后的模块名称列表, 因循环依赖无法排序的模块名称列表)
+    """
+    remaining = {name: {dep for dep in deps if dep in dependencies} for name, deps in dependencies.items()}
+    levels = []
+    while remaining:
+        level = [name for name, deps in remaining.items() if not deps]
+        if not level:
+            break
+        levels.append(level)
+        for name in level:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(level)
+    return levels, list(remaining)
+
+
+def _timed_start(start: Callable[[], bool], origin: float) -> tuple[bool, float, float, str | None]:
+    """在工作线程中执行启动函数并计时"""
+    started_at = time.perf_counter() - origin
+    try:
+        success = bool(start())
+        error = None if success else "启动失败"
+    except Exception as e:
+        success, error = False, f"启动异常: {e}"
+    return success, started_at, time.perf_counter() - origin - started_at, error
+
+
+def _critical_path(records: dict[str, ModuleStartRecord], dependencies: Mapping[str, Iterable[str]]) -> list[str]:
+    """从最后完成的模块回溯关键路径"""
+    started = {name: record for name, record in records.items() if record.started_at is not None}
+    if not started:
+        return []
+
+    path = [max(started, key=lambda name: started[name].finished_at)]
+    while True:
+        deps = [dep for dep in dependencies.get(path[-1], ()) if dep in started]
+        if not deps:
+            break
+        path.append(max(deps, key=lambda name: started[name].finished_at))
+    path.reverse()
+    return path
+
+
+def start_in_dependency_order(
+    starters: Mapping[str, Callable[[], bool]],
+    dependencies: Mapping[str, Iterable[str]],
+    timeouts: Mapping[str, float | None] | None = None,
+    max_workers: int | None = None,
+) -> StartupReport:
+    """按依赖关系并行启动模块
+
+    模块在其所有依赖启动成功后立即提交到线程池，互不依赖的模块并发启动。
+    依赖启动失败、超时、未注册或存在循环依赖的模块不会被启动。
+    超时从模块提交启动时开始计算；超时的模块被记为失败，但其启动线程无法被中断，会在后台继续执行。
+
+    Args:
+        starters: 模块名称到启动函数的映射，启动函数返回是否成功
+        dependencies: 模块名称到依赖模块名称的映射
+        timeouts: 模块名称到启动超时时间（秒）的映射，None 表示不限制
+        max_workers: 最大并发启动数，None 使用线程池默认值
+
+    Returns:
+        启动报告
+    """
+    timeouts = timeouts or {}
+    records = {name: ModuleStartRecord(name=name) for name in starters}
+    pending = {name: set(dependencies.get(name, ())) for name in starters}
+    dependents: dict[str, list[str]] = {name: [] for name in starters}
+    for name, deps in pending.items():
+        for dep in deps:
+            if dep in dependents:
+                dependents[dep].append(name)
+
+    finished: set[str] = set()
+
+    def fail(name: str, error: str, error_code: str) -> None:
+        """记录失败并传递给所有（间接）依赖它的模块"""
+        stack = [(name, error, error_code)]
+        while stack:
+            current, current_error, current_code = stack.pop()
+            if current in finished:
+                continue
+            finished.add(current)
+            record = records[current]
+            record.success, record.error, record.error_code = False, current_error, current_code
+            stack.extend(
+                (dependent, f"依赖模块 {current} 未能启动", "DEPENDENCY_FAILED") for dependent in dependents[current]
+            )
+
+    for name, deps in pending.items():
+        missing = sorted(dep for dep in deps if dep not in starters)
+        if missing:
+            fail(name, f"依赖模块未注册: {missing}", "DEPENDENCY_MISSING")
+
+    origin = time.perf_counter()
+    ready = [name for name, deps in pending.items() if not deps and name not in finished]
+    running: dict[Future, str] = {}
+    submitted: dict[str, float] = {}
+    deadlines: dict[str, float] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="daoji-start")
+    try:
+        while True:
+            for name in ready:
+                running[executor.submit(_timed_start, starters[name], origin)] = name
+                submitted[name] = time.perf_counter() - origin
+                timeout = timeouts.get(name)
+                if timeout is not None:
+                    deadlines[name] = origin + submitted[name] + timeout
+            ready = []
+            if not running:
+                break
+
+            wait_time = max(0.0, min(deadlines.values()) - time.perf_counter()) if deadlines else None
+            done, _ = wait(running, timeout=wait_time, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                deadlines.pop(name, None)
+                success, started_at, duration, error = future.result()
+                record = records[name]
+                record.started_at, record.duration = started_at, duration
+                if not success:
+                    fail(name, error or "启动失败", "START_FAILED")
+                    continue
+                record.success = True
+                finished.add(name)
+                for dependent in dependents[name]:
+                    pending[dependent].discard(name)
+                    if not pending[dependent] and dependent not in finished:
+                        ready.append(dependent)
+
+            now = time.perf_counter()
+            for future, name in list(running.items()):
+                deadline = deadlines.get(name)
+                if deadline is None or deadline > now:
+                    continue
+                del running[future]
+                del deadlines[name]
+                record = records[name]
+                record.started_at = submitted[name]
+                record.duration = now - origin - submitted[name]
+                fail(name, f"启动超时（{timeouts[name]}s）", "START_TIMEOUT")
+                logger.warning(f"模块 {name} 启动超时（{timeouts[name]}s），启动线程将在后台继续执行")
+    finally:
+        executor.shutdown(wait=False)
+
+    # 剩余的模块处于循环依赖中或依赖了循环中的模块
+    for name, record in records.items():
+        if name not in finished:
+            record.error, record.error_code = "存在循环依赖", "DEPENDENCY_CYCLE"
+
+    return StartupReport(
+        records=records,
+        total_time=time.perf_counter() - origin,
+        critical_path=_critical_path(records, dependencies),
+    )
@@ -0,0 +1,99 @@
+"""
+模块预热
+在后台线程中按优先级初始化延迟初始化的模块
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseModule
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupPool:
+    """后台预热线程池
+
+    按优先级（数值越小越先执行，相同优先级按提交顺序）调用模块的 ensure_initialized；
+    模块已被首次调用初始化时预热直接返回。
+    """
+
+    def __init__(self, workers: int = 1):
+        """
+        Args:
+            workers: 预热线程数
+        """
+        if workers <= 0:
+            raise ValueError("workers 必须大于0")
+        self._heap: list[tuple[int, int, BaseModule, Future[bool]]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"daoji-warmup-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def schedule(self, module: "BaseModule", priority: int = 0) -> "Future[bool]":
+        """提交预热任务
+
+        Args:
+            module: 模块实例
+            priority: 优先级，数值越小越先执行
+
+        Returns:
+            初始化是否成功的 Future（可通过 cancel 取消尚未开始的预热）
+        """
+        future: Future[bool] = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("预热线程池已关闭")
+            heapq.heappush(self._heap, (priority, next(self._counter), module, future))
+            self._condition.notify()
+        return future
+
+    @property
+    def pending(self) -> int:
+        """尚未开始的预热任务数"""
+        return len(self._heap)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True) -> None:
+        """关闭线程池
+
+        Args:
+            wait: 是否等待预热线程退出
+            cancel_pending: 是否取消尚未开始的预热任务
+        """
+        with self._condition:
+            self._closed = True
+            if cancel_pending:
+                for _, _, _, future in self._heap:
+                    future.cancel()
+                self._heap.clear()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _worker(self) -> None:
+        """预热线程：依次取出优先级最高的任务执行"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._heap or self._closed)
+                if not self._heap:
+                    return
+                priority, _, module, future = heapq.heappop(self._heap)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            logger.debug(f"预热模块 {module.name}（优先级 {priority}）")
+            try:
+                future.set_result(module.ensure_initialized("warmup"))
+            except Exception as e:
+                future.set_exception(e)
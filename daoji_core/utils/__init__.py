@@ -3,7 +3,7 @@
 提供通用的工具函数和辅助类
 """
 
-from .exceptions import ConfigError, DaojiCoreError, DataError, ModuleError
+from .exceptions import ConfigError, DaojiCoreError, DataError, ModuleError, ProcessingError, TransientError
 from .logging import get_logger, setup_logging
 
 __all__ = [
@@ -13,4 +13,6 @@ __all__ = [
     "ConfigError",
     "ModuleError",
     "DataError",
+    "ProcessingError",
+    "TransientError",
 ]
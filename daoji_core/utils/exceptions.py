@@ -81,3 +81,10 @@ class ProcessingError(DaojiCoreError):
         if self.processor_name:
             return f"处理错误 [{self.processor_name}]: {self.message}"
         return f"处理错误: {self.message}"
+
+
+class TransientError(ProcessingError):
+    """临时性处理异常（网络抖动、限流、超时等），重试可能成功"""
+
+    def __init__(self, message: str, processor_name: str = None, error_code: str = "TRANSIENT_ERROR"):
+        super().__init__(message, processor_name, error_code)
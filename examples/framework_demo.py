@@ -58,7 +58,7 @@ class DemoProcessor(DataProcessor):
         if isinstance(data, TextData):
             # 简单的文本处理：转换为大写
             processed_content = data.content.upper()
-            result_data = TextData(content=processed_content, source="DemoProcessor")
+            result_data = data.evolve(content=processed_content, source="DemoProcessor")
             return ProcessingResult.success_result(data=result_data, processing_time=0.001, processor_name=self.name)
         return ProcessingResult.error_result(error="不支持的数据类型", processing_time=0.0, processor_name=self.name)
 
@@ -81,7 +81,7 @@ class DemoModule(BaseModule):
         if isinstance(data, TextData):
             # 添加前缀
             processed_content = f"[DemoModule处理] {data.content}"
-            result_data = TextData(content=processed_content, source="DemoModule")
+            result_data = data.evolve(content=processed_content, source="DemoModule")
             return ProcessingResult.success_result(data=result_data, processing_time=0.002, processor_name=self.name)
         return ProcessingResult.error_result(error="不支持的数据类型", processing_time=0.0, processor_name=self.name)
 
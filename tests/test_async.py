@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+from daoji_core.data import AsyncDataProcessor, DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+
+
+class SyncProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name="sync"):
+        super().__init__(name)
+        self.threads = []
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        self.threads.append(threading.get_ident())
+        return ProcessingResult.success_result(
+            data=data.evolve(content=f"{data.content}|{self.name}"), processing_time=0.0, processor_name=self.name
+        )
+
+
+class SleepProcessor(AsyncDataProcessor):
+    """按元数据中的 delay 异步等待，记录并发数、所在线程和被取消的记录"""
+
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name="sleep"):
+        super().__init__(name)
+        self.threads = []
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = []
+
+    def can_process(self, data):
+        return True
+
+    async def aprocess(self, data):
+        self.threads.append(threading.get_ident())
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(data.metadata.get("delay", 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(data.content)
+            raise
+        finally:
+            self.running -= 1
+        return ProcessingResult.success_result(
+            data=data.evolve(content=f"{data.content}|{self.name}"), processing_time=0.0, processor_name=self.name
+        )
+
+
+def test_aprocess_awaits_async_and_offloads_sync_processors():
+    async_processor = SleepProcessor()
+    sync_processor = SyncProcessor()
+    pipeline = DataPipeline("async").add_processor(async_processor).add_processor(sync_processor)
+
+    async def main():
+        result = await pipeline.aprocess(TextData(content="x"))
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(main())
+    assert result.success
+    assert result.data.content == "x|sleep|sync"
+    assert async_processor.threads == [loop_thread]
+    assert sync_processor.threads and sync_processor.threads[0] != loop_thread
+    assert [child.name for child in result.timing.children] == ["sleep", "sync"]
+
+
+def test_astream_keeps_order_with_bounded_concurrency():
+    processor = SleepProcessor()
+    pipeline = DataPipeline("async").add_processor(processor)
+    # 越靠前的记录越晚完成
+    items = [TextData(content=f"r{i}", metadata={"delay": 0.01 * (10 - i)}) for i in range(10)]
+
+    async def main():
+        return [result async for result in pipeline.astream(items, concurrency=4)]
+
+    results = asyncio.run(main())
+    assert [result.data.content for result in results] == [f"r{i}|sleep" for i in range(10)]
+    assert processor.max_running == 4
+
+
+def test_astream_cancels_pending_tasks_when_consumer_stops():
+    processor = SleepProcessor()
+    pipeline = DataPipeline("async").add_processor(processor)
+
+    async def source():
+        yield TextData(content="first")
+        for i in range(10):
+            yield TextData(content=f"slow{i}", metadata={"delay": 10})
+
+    async def main():
+        stream = pipeline.astream(source(), concurrency=3)
+        first = await anext(stream)
+        await stream.aclose()
+        # 让被取消的任务执行到 CancelledError
+        await asyncio.sleep(0.05)
+        return first
+
+    first = asyncio.run(main())
+    assert first.data.content == "first|sleep"
+    assert sorted(processor.cancelled) == ["slow0", "slow1"]
+    assert processor.running == 0
@@ -0,0 +1,110 @@
+import pytest
+
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+from daoji_core.utils.exceptions import DataError
+
+
+class RaisingProcessor(DataProcessor):
+    """未重写 process_batch，按内容抛出不同异常"""
+
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name="raising"):
+        super().__init__(name)
+        self.calls = []
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        self.calls.append(data.content)
+        if data.content == "timeout":
+            raise TimeoutError("slow")
+        if data.content == "conn":
+            raise ConnectionError("down")
+        if data.content == "bad":
+            raise DataError("bad data")
+        if data.content == "other":
+            raise RuntimeError("other")
+        return ProcessingResult.success_result(
+            data=data.evolve(content=data.content.upper()), processing_time=0.0, processor_name=self.name
+        )
+
+
+class BatchProcessor(DataProcessor):
+    """整批处理，记录每次调用的批次"""
+
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name="batch"):
+        super().__init__(name)
+        self.batches = []
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        raise AssertionError("批处理路径不应逐条调用 process")
+
+    def process_batch(self, items):
+        self.batches.append([item.content for item in items])
+        # 倒序计算再按输入顺序返回
+        results = {
+            id(item): ProcessingResult.success_result(
+                data=item.evolve(content=f"{item.content}!"), processing_time=0.0, processor_name=self.name
+            )
+            for item in reversed(items)
+        }
+        return [results[id(item)] for item in items]
+
+
+def test_default_process_batch_falls_back_to_process():
+    processor = RaisingProcessor()
+    pipeline = DataPipeline("batch").add_processor(processor)
+    results = pipeline.process_batch([TextData(content="a"), TextData(content="other"), TextData(content="b")])
+
+    assert processor.calls == ["a", "other", "b"]
+    assert [result.success for result in results] == [True, False, True]
+    assert results[0].data.content == "A"
+    assert results[2].data.content == "B"
+    assert results[1].processor_name == "raising"
+
+
+def test_exceptions_map_to_error_codes_per_item():
+    contents = ["ok", "timeout", "conn", "bad", "other"]
+    results = (
+        DataPipeline("batch")
+        .add_processor(RaisingProcessor())
+        .process_batch([TextData(content=content) for content in contents])
+    )
+    assert [result.error_code for result in results] == [None, "TIMEOUT", "CONNECTION_ERROR", "DATA_ERROR", None]
+    assert results[0].success
+    assert not any(result.success for result in results[1:])
+
+
+def test_failed_items_skip_later_processors():
+    batch = BatchProcessor()
+    pipeline = DataPipeline("batch").add_processor(RaisingProcessor()).add_processor(batch)
+    results = pipeline.process_batch([TextData(content="a"), TextData(content="bad"), TextData(content="b")])
+
+    assert batch.batches == [["A", "B"]]
+    assert [result.data.content if result.success else result.error_code for result in results] == [
+        "A!",
+        "DATA_ERROR",
+        "B!",
+    ]
+
+
+def test_results_keep_input_order_across_chunks():
+    batch = BatchProcessor()
+    items = [TextData(content=str(i)) for i in range(7)]
+    results = DataPipeline("batch").add_processor(batch).process_batch(items, batch_size=3)
+
+    assert batch.batches == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert [result.data.content for result in results] == [f"{i}!" for i in range(7)]
+    assert [result.data.id for result in results] == [item.id for item in items]
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        DataPipeline("batch").add_processor(BatchProcessor()).process_batch([TextData(content="a")], batch_size=0)
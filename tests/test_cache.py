@@ -0,0 +1,115 @@
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+from daoji_core.data.cache import ResultCache
+from daoji_core.data.pipeline import CachedProcessor
+
+
+class UpperProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name: str = "upper"):
+        super().__init__(name)
+        self.calls = 0
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        self.calls += 1
+        return ProcessingResult.success_result(
+            data=data.evolve(content=data.content.upper(), metadata={**data.metadata, "upper": True}),
+            processing_time=0.0,
+            processor_name=self.name,
+        )
+
+
+class CountProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+    in_place = True
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        data.metadata["n"] = data.metadata.get("n", 0) + 1
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+def test_cache_hit_keeps_record_identity():
+    inner = UpperProcessor()
+    pipeline = DataPipeline("cache").add_processor(CachedProcessor(inner, ResultCache()))
+    pipeline.add_processor(CountProcessor("count"))
+
+    a = TextData(content="hello", metadata={"tag": "x"})
+    b = TextData(content="hello", metadata={"tag": "x"})
+    ra = pipeline.process(a)
+    rb = pipeline.process(b)
+
+    assert inner.calls == 1
+    assert ra.data is not rb.data
+    assert (ra.data.id, ra.data.timestamp) == (a.id, a.timestamp)
+    assert (rb.data.id, rb.data.timestamp) == (b.id, b.timestamp)
+    assert ra.data.content == rb.data.content == "HELLO"
+    assert ra.data.metadata == rb.data.metadata == {"tag": "x", "upper": True, "n": 1}
+
+    # 后续命中不受之前的原地修改影响
+    rc = pipeline.process(TextData(content="hello", metadata={"tag": "x"}))
+    assert rc.data.metadata["n"] == 1
+    assert ra.data.metadata["n"] == 1
+
+
+def test_cache_returns_independent_copies():
+    cache = ResultCache()
+    result = ProcessingResult.success_result(data=TextData(content="a"), processing_time=0.0)
+    cache.set("k", result)
+    result.data.metadata["changed"] = True
+
+    first = cache.get("k")
+    first.data.metadata["hit"] = 1
+    first.add_warning("w")
+    second = cache.get("k")
+    assert second.data is not first.data
+    assert second.data.metadata == {}
+    assert second.warnings == []
+
+
+class VersionedProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+    __version__ = "1.0"
+
+    def __init__(self, name: str = "versioned"):
+        super().__init__(name)
+        self.calls = 0
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        self.calls += 1
+        return ProcessingResult.success_result(
+            data=data.evolve(content=f"{data.content}@{self.get_version()}"),
+            processing_time=0.0,
+            processor_name=self.name,
+        )
+
+
+def test_version_bump_invalidates_cached_results(tmp_path):
+    data = TextData(content="a")
+    assert ResultCache.make_key("p", "1.0", data) != ResultCache.make_key("p", "2.0", data)
+
+    inner = VersionedProcessor()
+    pipeline = DataPipeline("versions").add_processor(inner).enable_cache(ResultCache(disk_path=tmp_path / "c.db"))
+    assert pipeline.process(TextData(content="a")).data.content == "a@1.0"
+    assert pipeline.process(TextData(content="a")).data.content == "a@1.0"
+    assert inner.calls == 1
+
+    inner.__version__ = "2.0"
+    assert pipeline.process(TextData(content="a")).data.content == "a@2.0"
+    assert pipeline.process(TextData(content="a")).data.content == "a@2.0"
+    assert inner.calls == 2
+
+    # 磁盘层同样按版本区分，重启后旧版本的条目不会被新版本使用
+    restarted = VersionedProcessor()
+    restarted.__version__ = "3.0"
+    pipeline = DataPipeline("versions").add_processor(restarted).enable_cache(ResultCache(disk_path=tmp_path / "c.db"))
+    assert pipeline.process_batch([TextData(content="a")])[0].data.content == "a@3.0"
+    assert restarted.calls == 1
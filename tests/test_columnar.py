@@ -0,0 +1,25 @@
+import pickle
+
+from daoji_core.data import TableData
+from daoji_core.data.columnar import ArrowTableData
+from daoji_core.data.records import TableRecord, as_record
+
+
+def test_arrow_table_rows_follow_table():
+    data = ArrowTableData.from_rows(headers=["a", "b"], rows=[[1, 2], [3, 4]])
+    assert isinstance(data, TableData)
+    assert data.rows == [[1, 2], [3, 4]]
+    assert data.get_row_count() == 2
+
+    data.add_rows([[5, 6]])
+    assert data.rows == [[1, 2], [3, 4], [5, 6]]
+    assert data.model_dump()["rows"] == data.rows
+    assert pickle.loads(pickle.dumps(data)).rows == data.rows
+
+
+def test_arrow_table_as_record():
+    data = ArrowTableData.from_rows(headers=["a", "b"], rows=[[1, 2], [3, 4]])
+    record = as_record(data)
+    assert isinstance(record, TableRecord)
+    assert record.rows == [[1, 2], [3, 4]]
+    assert record.get_row_count() == data.get_row_count()
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from daoji_core.data import DataFlowManager, DataType, ProcessingResult, TextData
+
+
+class SleepModule:
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+
+    def process_data(self, data):
+        time.sleep(self.delay)
+        return ProcessingResult.success_result(
+            data=data.evolve(content=f"{data.content}|{self.name}"), processing_time=self.delay
+        )
+
+    def get_supported_types(self):
+        return [DataType.TEXT]
+
+    def get_module_info(self):
+        return {"name": self.name}
+
+
+@pytest.fixture
+def manager():
+    managers = []
+
+    def build(**kwargs):
+        manager = DataFlowManager(**kwargs)
+        manager.register_module("fast", SleepModule("fast"))
+        manager.register_module("slow", SleepModule("slow", delay=0.3))
+        manager.register_module("medium", SleepModule("medium", delay=0.02))
+        managers.append(manager)
+        return manager
+
+    yield build
+    for manager in managers:
+        manager.shutdown(wait=True)
+
+
+@pytest.mark.parametrize("backend", ["sequential", "thread", "asyncio"])
+def test_module_timeout_returns_partial_results(manager, backend):
+    flow = manager(dispatch_backend=backend, module_timeout=0.1)
+    start = time.perf_counter()
+    results = flow.auto_route_data(TextData(content="x"))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.25
+    assert [result.success for result in results] == [True, False, True]
+    assert results[0].data.content == "x|fast"
+    assert results[2].data.content == "x|medium"
+    assert results[1].error_code == "MODULE_TIMEOUT"
+    assert results[1].processor_name == "slow"
+    assert set(results[0].branch_timings) == {"fast"}
+
+
+def test_per_module_timeout_overrides_default(manager):
+    flow = manager(module_timeout=0.1)
+    flow.set_module_timeout("slow", 1.0)
+    flow.set_module_timeout("medium", 0.001)
+    results = flow.auto_route_data(TextData(content="x"))
+    assert [result.error_code for result in results] == [None, None, "MODULE_TIMEOUT"]
+
+    flow.set_module_timeout("slow", None)
+    results = flow.auto_route_data(TextData(content="x"))
+    assert results[1].error_code == "MODULE_TIMEOUT"
+
+
+def test_sequential_without_timeout_runs_inline(manager):
+    flow = manager()
+    results = flow.auto_route_data(TextData(content="x"))
+    assert all(result.success for result in results)
+    assert flow.dispatch_engine._executor is None
+
+
+def test_thread_backend_dispatches_concurrently(manager):
+    flow = manager()
+    flow.set_dispatch_mode("thread", max_in_flight=3)
+    flow.register_module("slow2", SleepModule("slow2", delay=0.3))
+    start = time.perf_counter()
+    results = flow.auto_route_data(TextData(content="x"))
+    assert time.perf_counter() - start < 0.55
+    assert [result.data.content for result in results] == ["x|fast", "x|slow", "x|medium", "x|slow2"]
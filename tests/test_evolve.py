@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from daoji_core.data import (
+    DataPipeline,
+    DataProcessor,
+    DataType,
+    ImageData,
+    ParallelProcessor,
+    ProcessingResult,
+    TableData,
+    TextData,
+)
+
+
+class UpperInPlace(DataProcessor):
+    """原地修改输入：改写 content 并写入元数据"""
+
+    supported_types = (DataType.TEXT,)
+    in_place = True
+
+    def __init__(self, name, return_data=True):
+        super().__init__(name)
+        self.return_data = return_data
+        self.inputs = []
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        self.inputs.append(data)
+        data.content = data.content.upper()
+        data.add_metadata(self.name, True)
+        return ProcessingResult.success_result(
+            data=data if self.return_data else None, processing_time=0.0, processor_name=self.name
+        )
+
+
+class TagProcessor(DataProcessor):
+    """按约定返回 evolve 派生的副本"""
+
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        return ProcessingResult.success_result(
+            data=data.evolve(metadata={**data.metadata, "tag": self.name}),
+            processing_time=0.0,
+            processor_name=self.name,
+        )
+
+
+def snapshot(data):
+    return data.content, dict(data.metadata)
+
+
+def test_evolve_keeps_identity_and_shares_fields():
+    text = TextData(content="a b", metadata={"k": 1}, source="s")
+    derived = text.evolve(language="en")
+    assert (derived.id, derived.timestamp, derived.source) == (text.id, text.timestamp, text.source)
+    assert derived.content is text.content
+    assert derived.language == "en" and text.language is None
+
+    table = TableData(headers=["a"], rows=[[1], [2]])
+    assert table.evolve(source="s").rows is table.rows
+
+    payload = b"\x89PNG" + bytes(64)
+    image = ImageData(data=payload)
+    derived_image = image.evolve(format="png")
+    assert derived_image.data is payload
+    assert (derived_image.id, derived_image.timestamp) == (image.id, image.timestamp)
+
+
+def test_evolve_copies_metadata():
+    text = TextData(content="a", metadata={"k": 1})
+    derived = text.evolve()
+    assert derived is not text
+    assert derived.metadata == text.metadata and derived.metadata is not text.metadata
+
+    derived.add_metadata("new", True)
+    assert text.metadata == {"k": 1}
+
+    replaced = text.evolve(metadata={"other": 2})
+    assert (replaced.metadata, text.metadata) == ({"other": 2}, {"k": 1})
+
+
+def test_text_evolve_recounts_words():
+    text = TextData(content="a b c")
+    assert text.evolve(content="x y").word_count == 2
+    assert text.evolve(content="x y", word_count=7).word_count == 7
+    assert text.evolve(source="s").word_count == text.word_count
+
+
+@pytest.mark.parametrize("tagged", [True, False])
+@pytest.mark.parametrize("return_data", [True, False])
+def test_in_place_processor_does_not_mutate_caller_input(return_data, tagged):
+    pipeline = DataPipeline("cow")
+    if tagged:
+        pipeline.add_processor(TagProcessor("tag"))
+    pipeline.add_processor(UpperInPlace("first", return_data=return_data)).add_processor(UpperInPlace("second"))
+
+    item = TextData(content="abc", metadata={"k": 1})
+    before = snapshot(item)
+    result = pipeline.process(item)
+    assert snapshot(item) == before
+    assert result.data.content == "ABC"
+    expected = {"k": 1, "tag": "tag"} if tagged else {"k": 1}
+    assert result.data.metadata == {**expected, "first": True, "second": True}
+    assert result.data.id == item.id
+
+    items = [TextData(content="x"), TextData(content="y")]
+    befores = [snapshot(data) for data in items]
+    results = pipeline.process_batch(items)
+    assert [snapshot(data) for data in items] == befores
+    assert [result.data.content for result in results] == ["X", "Y"]
+
+    items = [TextData(content="x"), TextData(content="y")]
+    streamed = list(pipeline.stream(items, batch_size=1))
+    assert [snapshot(data) for data in items] == befores
+    assert [result.data.content for result in streamed] == ["X", "Y"]
+
+    item = TextData(content="async")
+    result = asyncio.run(pipeline.aprocess(item))
+    assert snapshot(item) == ("async", {})
+    assert result.data.content == "ASYNC"
+
+
+def test_in_place_first_processor_gets_a_copy():
+    first = UpperInPlace("first")
+    pipeline = DataPipeline("cow").add_processor(first).add_processor(UpperInPlace("second"))
+    item = TextData(content="abc")
+    pipeline.process(item)
+    assert item.content == "abc"
+    assert first.inputs[0] is not item
+    # 写时复制只发生一次，后续原地处理器直接修改同一个副本
+    assert pipeline.processors[1].inputs[0] is first.inputs[0]
+
+    first.inputs.clear()
+    items = [TextData(content="x")]
+    pipeline.process_batch(items)
+    assert first.inputs[0] is not items[0]
+    assert items[0].content == "x"
+
+
+def test_parallel_in_place_branches_get_their_own_copy():
+    item = TextData(content="abc", metadata={"k": 1})
+    parallel = ParallelProcessor([UpperInPlace("left"), UpperInPlace("right")], merge_strategy="first")
+    result = parallel.process(item)
+    assert result.success
+    assert snapshot(item) == ("abc", {"k": 1})
+    left, right = parallel.processors
+    assert left.inputs[0] is not item and right.inputs[0] is not item
+    assert left.inputs[0] is not right.inputs[0]
@@ -0,0 +1,207 @@
+import asyncio
+import json
+
+import pytest
+
+from daoji_core.data import (
+    DataPipeline,
+    DataProcessor,
+    DataType,
+    JsonlDeadLetterSink,
+    ProcessingResult,
+    RetryPolicy,
+    TextData,
+)
+from daoji_core.utils.exceptions import ProcessingError, TransientError
+
+NO_WAIT = RetryPolicy(max_attempts=3, backoff=0.0, jitter=0.0)
+
+
+class FailingProcessor(DataProcessor):
+    """内容为 bad 的记录返回错误结果"""
+
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        if data.content == "bad":
+            return ProcessingResult.error_result(
+                error="bad record", processing_time=0.0, error_code="BAD_RECORD", processor_name=self.name
+            )
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+class FlakyProcessor(DataProcessor):
+    """每条记录前 failures 次调用抛出 TransientError"""
+
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name, failures, error=TransientError):
+        super().__init__(name)
+        self.failures = failures
+        self.error = error
+        self.calls = {}
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        calls = self.calls[data.content] = self.calls.get(data.content, 0) + 1
+        if calls <= self.failures:
+            raise self.error("flaky")
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+class CountingProcessor(FailingProcessor):
+    def __init__(self, name):
+        super().__init__(name)
+        self.seen = []
+
+    def process(self, data):
+        self.seen.append(data.content)
+        return super().process(data)
+
+
+def records(*contents):
+    return [TextData(content=content) for content in contents]
+
+
+def contents(results):
+    return [result.data.content for result in results]
+
+
+def collect(pipeline, items):
+    async def run():
+        return [result async for result in pipeline.astream(items, concurrency=2)]
+
+    return asyncio.run(run())
+
+
+def test_continue_keeps_failures_in_place():
+    pipeline = DataPipeline("failures").add_processor(FailingProcessor("check"))
+    results = pipeline.process_batch(records("a", "bad", "b"))
+    assert [result.success for result in results] == [True, False, True]
+    assert results[1].error_code == "BAD_RECORD"
+
+
+def test_fail_fast_raises_with_index():
+    pipeline = DataPipeline("failures").add_processor(FailingProcessor("check")).set_failure_policy("fail_fast")
+    with pytest.raises(ProcessingError) as info:
+        pipeline.process_batch(records("a", "b", "bad"))
+    assert "第 2 条记录" in str(info.value)
+    assert info.value.error_code == "BAD_RECORD"
+
+    # 流式处理在失败记录之前的结果已经产出
+    produced = []
+    with pytest.raises(ProcessingError):
+        for result in pipeline.stream(records("a", "bad", "b"), batch_size=1):
+            produced.append(result.data.content)
+    assert produced == ["a"]
+
+    with pytest.raises(ProcessingError):
+        collect(pipeline, records("a", "bad"))
+
+
+def test_skip_drops_failures():
+    pipeline = DataPipeline("failures").add_processor(FailingProcessor("check")).set_failure_policy("skip")
+    assert contents(pipeline.process_batch(records("a", "bad", "b"))) == ["a", "b"]
+    assert contents(pipeline.stream(records("bad", "a", "bad", "b"), batch_size=2)) == ["a", "b"]
+    assert contents(collect(pipeline, records("a", "bad", "b"))) == ["a", "b"]
+
+
+def test_dead_letter_requires_sink():
+    with pytest.raises(ValueError):
+        DataPipeline("failures").set_failure_policy("dead_letter")
+
+
+def test_jsonl_dead_letter_round_trip(tmp_path):
+    path = tmp_path / "dead.jsonl"
+    sink = JsonlDeadLetterSink(path)
+    pipeline = DataPipeline("dead letters").add_processor(FailingProcessor("check"))
+    pipeline.set_failure_policy("dead_letter", dead_letter=sink)
+
+    items = records("a", "bad", "b", "bad")
+    items[3].metadata["source"] = "s3"
+    assert contents(pipeline.stream(items, batch_size=3)) == ["a", "b"]
+    assert sink.count == 2
+    sink.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["index"] for line in lines] == [1, 3]
+    assert [line["data_id"] for line in lines] == [items[1].id, items[3].id]
+    first = lines[0]
+    assert (first["pipeline"], first["processor_name"]) == ("dead letters", "check")
+    assert (first["error"], first["error_code"], first["data_type"]) == ("bad record", "BAD_RECORD", "text")
+    assert first["data"]["content"] == "bad"
+    assert lines[1]["data"]["metadata"] == {"source": "s3"}
+    # 原始输入可以从死信记录中重建
+    assert TextData(**lines[1]["data"]).metadata == {"source": "s3"}
+
+
+def test_retry_transient_errors_in_batch_and_stream():
+    flaky = FlakyProcessor("flaky", failures=2)
+    after = CountingProcessor("after")
+    pipeline = DataPipeline("retry").add_processor(CountingProcessor("before")).add_processor(flaky)
+    pipeline.add_processor(after).set_failure_policy("fail_fast", retry=NO_WAIT)
+
+    results = pipeline.process_batch(records("a", "b"))
+    assert all(result.success for result in results)
+    assert flaky.calls == {"a": 3, "b": 3}
+    # 只重新执行失败的处理器
+    assert pipeline.processors[0].seen == ["a", "b"]
+    assert after.seen == ["a", "b"]
+
+    flaky.calls = {}
+    assert contents(pipeline.stream(records("c", "d"), batch_size=1)) == ["c", "d"]
+    assert flaky.calls == {"c": 3, "d": 3}
+
+
+def test_astream_retries_each_record():
+    flaky = FlakyProcessor("flaky", failures=2)
+    before = CountingProcessor("before")
+    pipeline = DataPipeline("retry").add_processor(before).add_processor(flaky)
+    pipeline.set_failure_policy("skip", retry=NO_WAIT)
+
+    assert contents(collect(pipeline, records("a", "b", "c"))) == ["a", "b", "c"]
+    assert flaky.calls == {"a": 3, "b": 3, "c": 3}
+    assert sorted(before.seen) == ["a", "b", "c"]
+
+    # 单条 aprocess 不重试
+    flaky.calls = {}
+    result = asyncio.run(pipeline.aprocess(TextData(content="d")))
+    assert not result.success
+    assert result.error_code == "TRANSIENT_ERROR"
+    assert flaky.calls == {"d": 1}
+
+
+def test_retry_gives_up_after_max_attempts():
+    flaky = FlakyProcessor("flaky", failures=5)
+    pipeline = DataPipeline("retry").add_processor(flaky).set_failure_policy("continue", retry=NO_WAIT)
+
+    result = pipeline.process_batch(records("a"))[0]
+    assert result.error_code == "TRANSIENT_ERROR"
+    assert flaky.calls == {"a": 3}
+
+    flaky.calls = {}
+    assert collect(pipeline, records("a"))[0].error_code == "TRANSIENT_ERROR"
+    assert flaky.calls == {"a": 3}
+
+
+def test_non_transient_errors_are_not_retried():
+    flaky = FlakyProcessor("flaky", failures=1, error=ValueError)
+    pipeline = DataPipeline("retry").add_processor(flaky).set_failure_policy("continue", retry=NO_WAIT)
+
+    assert not pipeline.process_batch(records("a"))[0].success
+    assert not collect(pipeline, records("b"))[0].success
+    assert flaky.calls == {"a": 1, "b": 1}
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=0.1, multiplier=2.0, max_backoff=0.3, jitter=0.0)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == pytest.approx([0.1, 0.2, 0.3])
+    jittered = RetryPolicy(backoff=1.0, jitter=0.1)
+    assert all(0.9 <= jittered.delay(1) <= 1.1 for _ in range(20))
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
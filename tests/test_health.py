@@ -0,0 +1,32 @@
+import threading
+import time
+
+from daoji_core.data import DataType
+from daoji_core.modules import HealthMonitor
+from daoji_core.modules.base import SimpleModule
+
+
+class SlowHealthModule(SimpleModule):
+    def get_health_status(self):
+        time.sleep(0.5)
+        return super().get_health_status()
+
+
+def test_probe_does_not_hold_lock_while_waiting():
+    fast = SimpleModule("fast", [DataType.TEXT])
+    fast.start()
+    slow = SlowHealthModule("slow", [DataType.TEXT])
+    monitor = HealthMonitor(lambda: {"fast": fast, "slow": slow}, timeout=2.0)
+
+    thread = threading.Thread(target=monitor.probe)
+    thread.start()
+    time.sleep(0.1)
+    started = time.perf_counter()
+    monitor.stop()
+    assert time.perf_counter() - started < 0.3
+    thread.join()
+
+    report = monitor.probe()
+    assert report["modules"]["fast"]["healthy"]
+    assert not report["modules"]["slow"]["healthy"]
+    monitor.stop()
@@ -0,0 +1,104 @@
+import mmap
+import pickle
+import struct
+
+import pytest
+
+from daoji_core.data import ImageData
+
+
+def png_bytes(width, height, body=1024):
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height)
+    return header + bytes(body)
+
+
+def jpeg_bytes(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + bytes(14)
+    sof0 = b"\xff\xc0" + struct.pack(">HBHH", 11, 8, height, width) + bytes(6)
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+
+@pytest.fixture
+def png_file(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(png_bytes(640, 480))
+    return path
+
+
+def test_load_maps_file(png_file):
+    image = ImageData(file_path=str(png_file))
+    assert image.data is None
+
+    image.load()
+    assert isinstance(image.data, mmap.mmap)
+    assert image.size_bytes == png_file.stat().st_size
+    with image.get_buffer() as view:
+        assert view.obj is image.data
+        assert bytes(view[:4]) == b"\x89PNG"
+    # 已加载时不会重新映射
+    mapped = image.data
+    assert image.load().data is mapped
+    image.release()
+
+    eager = ImageData(file_path=str(png_file)).load(use_mmap=False)
+    assert isinstance(eager.data, bytes)
+    assert eager.get_bytes() == png_file.read_bytes()
+
+
+def test_empty_file_loads_as_empty_bytes(tmp_path):
+    path = tmp_path / "empty.png"
+    path.write_bytes(b"")
+    image = ImageData(file_path=str(path)).load()
+    assert image.data == b""
+    assert not image.has_data()
+
+
+def test_probe_metadata_reads_header_without_loading(png_file):
+    image = ImageData(file_path=str(png_file)).probe_metadata()
+    assert image.data is None
+    assert (image.format, image.width, image.height) == ("png", 640, 480)
+    assert image.size_bytes == png_file.stat().st_size
+
+    jpeg = ImageData(data=jpeg_bytes(320, 200)).probe_metadata()
+    assert (jpeg.format, jpeg.width, jpeg.height) == ("jpeg", 320, 200)
+
+    gif = ImageData(data=b"GIF89a" + struct.pack("<HH", 7, 9) + bytes(16)).probe_metadata()
+    assert (gif.format, gif.width, gif.height) == ("gif", 7, 9)
+
+    unknown = ImageData(data=b"not an image").probe_metadata()
+    assert unknown.format is None
+    assert unknown.size_bytes == 12
+
+
+def test_release_closes_map(png_file):
+    image = ImageData(file_path=str(png_file)).load()
+    mapped = image.data
+    clone = image.evolve(metadata={"k": 1})
+    assert clone.data is mapped
+
+    # 派生对象不拥有内存映射
+    clone.release()
+    assert not mapped.closed
+
+    image.release()
+    assert mapped.closed
+    assert image.data is None
+    image.release()
+
+
+def test_pickle_converts_map_to_bytes(png_file):
+    image = ImageData(file_path=str(png_file), metadata={"k": "v"}).load()
+    restored = pickle.loads(pickle.dumps(image))
+
+    assert isinstance(restored.data, bytes)
+    assert restored.data == png_file.read_bytes()
+    assert (restored.id, restored.metadata) == (image.id, {"k": "v"})
+    assert restored._mapped is None
+    # 原对象不受影响
+    assert isinstance(image.data, mmap.mmap)
+    image.release()
+
+
+def test_rejects_non_buffer_data():
+    with pytest.raises(ValueError):
+        ImageData(data="text")
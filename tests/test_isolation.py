@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+
+from daoji_core.data import DataType, ImageData, ProcessingResult, TextData
+from daoji_core.modules import BaseModule, IsolatedModule, ModuleRegistry, ProcessIsolation
+
+
+class PidModule(BaseModule):
+    """返回处理进程的PID和初始化时记录的PID；内容为 crash 时结束工作进程"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.loaded_pid = None
+
+    def initialize(self):
+        self.loaded_pid = os.getpid()
+        return True
+
+    def cleanup(self):
+        return True
+
+    def get_supported_types(self):
+        return [DataType.TEXT, DataType.IMAGE]
+
+    def process_data(self, data):
+        if data.type == DataType.TEXT and data.content == "crash":
+            os._exit(1)
+        size = len(data.get_bytes()) if data.type == DataType.IMAGE else len(data.content)
+        output = TextData(content=f"{os.getpid()}:{self.loaded_pid}:{size}")
+        return ProcessingResult.trusted_success(data=output, processing_time=0.0, processor_name=self.name)
+
+
+class BrokenModule(PidModule):
+    def initialize(self):
+        return False
+
+
+@pytest.fixture
+def registry():
+    registry = ModuleRegistry.get_instance()
+    registry.clear_registry()
+    yield registry
+    registry.clear_registry()
+
+
+def _pids(result):
+    pid, loaded_pid, size = result.data.content.split(":")
+    return int(pid), int(loaded_pid), int(size)
+
+
+def test_isolated_module_round_trip(registry):
+    module = PidModule("isolated")
+    registry.register_module(module, isolation=ProcessIsolation(workers=1, shm_threshold=1024))
+    proxy = registry.get_module("isolated")
+    assert isinstance(proxy, IsolatedModule)
+    assert registry.get_module_type("isolated") is PidModule
+    assert registry.start_all_modules() == {"isolated": True}
+    assert module.loaded_pid is None
+
+    pid, loaded_pid, size = _pids(proxy.process_data(TextData(content="hello")))
+    assert pid == loaded_pid != os.getpid()
+    assert size == 5
+
+    # 大数据经共享内存传递，仍由同一个（只初始化一次的）工作进程处理
+    result = proxy.process_data(ImageData(data=b"\0" * 100_000))
+    assert _pids(result) == (pid, loaded_pid, 100_000)
+    stats = proxy.get_process_statistics()
+    assert stats["shm_transfers"] >= 1
+    assert stats["calls"] == 2
+
+
+def test_crashed_worker_is_replaced(registry):
+    registry.register_module(PidModule("crashy"), isolation=ProcessIsolation(workers=1))
+    registry.start_all_modules()
+    proxy = registry.get_module("crashy")
+    first_pid, _, _ = _pids(proxy.process_data(TextData(content="a")))
+
+    crashed = proxy.process_data(TextData(content="crash"))
+    assert crashed.error_code == "WORKER_CRASHED"
+
+    # 替换进程在后台启动，调用方等待其就绪
+    result = proxy.process_data(TextData(content="b"))
+    assert result.success
+    new_pid, loaded_pid, _ = _pids(result)
+    assert new_pid == loaded_pid != first_pid
+    stats = proxy.get_process_statistics()
+    assert (stats["crashes"], stats["restarts"], stats["alive"]) == (1, 1, 1)
+    assert proxy.get_health_status()["healthy"]
+
+
+def test_failed_worker_init_fails_start(registry):
+    registry.register_module(BrokenModule("broken"), isolation=ProcessIsolation(workers=1))
+    started = time.perf_counter()
+    assert registry.start_all_modules() == {"broken": False}
+    assert time.perf_counter() - started < 30
+    assert "工作进程初始化失败" in registry.get_module("broken").get_init_metrics()["last_error"]
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from daoji_core.data import DataType, ProcessingResult, TextData
+from daoji_core.modules.base import BaseModule
+
+
+class SlowInitModule(BaseModule):
+    lazy_init = True
+
+    def __init__(self, name, succeed=True):
+        super().__init__(name)
+        self.succeed = succeed
+        self.init_calls = 0
+
+    def initialize(self):
+        self.init_calls += 1
+        time.sleep(0.2)
+        return self.succeed
+
+    def cleanup(self):
+        return True
+
+    def get_supported_types(self):
+        return [DataType.TEXT]
+
+    def process_data(self, data):
+        return ProcessingResult.trusted_success(data=data, processing_time=0.0, processor_name=self.name)
+
+
+def _concurrent_calls(module, count=8):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def call(i):
+        barrier.wait()
+        results[i] = module.process_data(TextData(content=str(i)))
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_first_calls_initialize_once():
+    module = SlowInitModule("lazy")
+    assert module.start()
+    assert not module.is_initialized()
+
+    results = _concurrent_calls(module)
+    assert all(result.success for result in results)
+    assert module.init_calls == 1
+    metrics = module.get_init_metrics()
+    assert metrics["trigger"] == "first_use"
+    assert metrics["attempts"] == 1
+    assert metrics["waiters"] >= 1
+
+
+def test_failed_lazy_init_returns_error_and_retries():
+    module = SlowInitModule("broken", succeed=False)
+    module.start()
+
+    results = _concurrent_calls(module, count=4)
+    assert all(result.error_code == "MODULE_INIT_FAILED" for result in results)
+    assert module.init_calls <= 4
+
+    module.succeed = True
+    assert module.process_data(TextData(content="x")).success
+    assert module.is_initialized()
@@ -0,0 +1,123 @@
+import pytest
+
+from daoji_core.data import DataPipeline, DataProcessor, DataType, PipelineMetrics, ProcessingResult, TextData
+from daoji_core.data.metrics import LatencyHistogram
+
+
+class FlagProcessor(DataProcessor):
+    def __init__(self, name, types=(DataType.TEXT,), accept=None, fail_on=None):
+        super().__init__(name)
+        self.supported_types = types
+        self.accept = accept
+        self.fail_on = fail_on
+
+    def can_process(self, data):
+        return self.accept(data) if self.accept is not None else True
+
+    def process(self, data):
+        if data.content == self.fail_on:
+            return ProcessingResult.error_result(error="bad", processing_time=0.0, processor_name=self.name)
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+def test_counts_after_run():
+    pipeline = DataPipeline("metrics", metrics=True)
+    pipeline.add_processor(FlagProcessor("first"))
+    pipeline.add_processor(FlagProcessor("maybe", types=None, accept=lambda data: data.content != "b"))
+    pipeline.add_processor(FlagProcessor("last", fail_on="c"))
+    for content in "abc":
+        pipeline.process(TextData(content=content))
+    pipeline.process_batch([TextData(content="b"), TextData(content="c")])
+
+    snapshot = pipeline.metrics.snapshot()
+    stages = snapshot["processors"]
+    assert (stages["first"]["calls"], stages["first"]["skips"], stages["first"]["errors"]) == (5, 0, 0)
+    assert (stages["maybe"]["calls"], stages["maybe"]["skips"], stages["maybe"]["errors"]) == (3, 2, 0)
+    assert (stages["last"]["calls"], stages["last"]["skips"], stages["last"]["errors"]) == (5, 0, 2)
+    assert (snapshot["pipeline"]["calls"], snapshot["pipeline"]["errors"]) == (5, 2)
+    assert stages["last"]["latency"]["count"] == 5
+
+
+def test_metrics_are_off_by_default():
+    pipeline = DataPipeline("metrics").add_processor(FlagProcessor("first"))
+    pipeline.process(TextData(content="a"))
+    assert pipeline.metrics is None
+    assert pipeline.export_metrics() == ""
+    assert pipeline.get_pipeline_info()["metrics"] is None
+
+    metrics = pipeline.enable_metrics()
+    pipeline.process(TextData(content="a"))
+    assert metrics.snapshot()["processors"]["first"]["calls"] == 1
+    pipeline.disable_metrics()
+    assert pipeline.metrics is None
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    summary = histogram.to_dict()
+    assert summary["count"] == 100
+    assert summary["sum"] == pytest.approx(5.05)
+    assert (summary["min"], summary["max"]) == (0.001, 0.1)
+    # 桶宽为1.25倍，估算的相对误差不超过25%
+    for key, expected in (("p50", 0.05), ("p95", 0.095), ("p99", 0.099)):
+        assert summary[key] == pytest.approx(expected, rel=0.25)
+    assert summary["p50"] <= summary["p95"] <= summary["p99"] <= summary["max"]
+
+    constant = LatencyHistogram()
+    constant.observe(0.003, count=10)
+    assert [constant.quantile(q) for q in (0.5, 0.95, 0.99)] == [0.003] * 3
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_text():
+    metrics = PipelineMetrics('a"b\\c\nd')
+    metrics.record("proc", 0.25, errors=1, count=2)
+    metrics.record_skip("proc", 3)
+    metrics.record_pipeline(0.5)
+
+    pipeline = 'pipeline="a\\"b\\\\c\\nd"'
+    processor = f'{pipeline},processor="proc"'
+    expected = f"""\
+# HELP daoji_pipeline_calls_total 处理的记录数
+# TYPE daoji_pipeline_calls_total counter
+daoji_pipeline_calls_total{{{pipeline}}} 1
+# HELP daoji_pipeline_skips_total 跳过的记录数
+# TYPE daoji_pipeline_skips_total counter
+daoji_pipeline_skips_total{{{pipeline}}} 0
+# HELP daoji_pipeline_errors_total 失败的记录数
+# TYPE daoji_pipeline_errors_total counter
+daoji_pipeline_errors_total{{{pipeline}}} 0
+# HELP daoji_pipeline_allocations_total 新增的内存块数
+# TYPE daoji_pipeline_allocations_total counter
+daoji_pipeline_allocations_total{{{pipeline}}} 0
+# HELP daoji_pipeline_latency_seconds 单条记录处理耗时
+# TYPE daoji_pipeline_latency_seconds summary
+daoji_pipeline_latency_seconds{{{pipeline},quantile="0.5"}} 0.500000000
+daoji_pipeline_latency_seconds{{{pipeline},quantile="0.95"}} 0.500000000
+daoji_pipeline_latency_seconds{{{pipeline},quantile="0.99"}} 0.500000000
+daoji_pipeline_latency_seconds_sum{{{pipeline}}} 0.500000000
+daoji_pipeline_latency_seconds_count{{{pipeline}}} 1
+# HELP daoji_processor_calls_total 处理的记录数
+# TYPE daoji_processor_calls_total counter
+daoji_processor_calls_total{{{processor}}} 2
+# HELP daoji_processor_skips_total 跳过的记录数
+# TYPE daoji_processor_skips_total counter
+daoji_processor_skips_total{{{processor}}} 3
+# HELP daoji_processor_errors_total 失败的记录数
+# TYPE daoji_processor_errors_total counter
+daoji_processor_errors_total{{{processor}}} 1
+# HELP daoji_processor_allocations_total 新增的内存块数
+# TYPE daoji_processor_allocations_total counter
+daoji_processor_allocations_total{{{processor}}} 0
+# HELP daoji_processor_latency_seconds 单条记录处理耗时
+# TYPE daoji_processor_latency_seconds summary
+daoji_processor_latency_seconds{{{processor},quantile="0.5"}} 0.125000000
+daoji_processor_latency_seconds{{{processor},quantile="0.95"}} 0.125000000
+daoji_processor_latency_seconds{{{processor},quantile="0.99"}} 0.125000000
+daoji_processor_latency_seconds_sum{{{processor}}} 0.250000000
+daoji_processor_latency_seconds_count{{{processor}}} 2
+"""
+    assert metrics.to_prometheus() == expected
+    assert PipelineMetrics("empty").to_prometheus().startswith("# HELP daoji_pipeline_calls_total")
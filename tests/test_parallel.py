@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from daoji_core.data import DataProcessor, DataType, MergeStrategy, ParallelProcessor, ProcessingResult, TextData
+
+
+class BranchProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def __init__(self, name, delay=0.0, barrier=None, error=None, metadata=None):
+        super().__init__(name)
+        self.delay = delay
+        self.barrier = barrier
+        self.error = error
+        self.metadata = metadata if metadata is not None else {name: True}
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return ProcessingResult.success_result(
+            data=data.evolve(content=f"{data.content}|{self.name}", metadata={**data.metadata, **self.metadata}),
+            processing_time=self.delay,
+            processor_name=self.name,
+        )
+
+
+def run(processors, **kwargs):
+    parallel = ParallelProcessor(processors, name="parallel", **kwargs)
+    try:
+        return parallel.process(TextData(content="x", metadata={"source": "in"}))
+    finally:
+        parallel.shutdown()
+
+
+def test_thread_backend_runs_branches_concurrently():
+    # 三个分支都到达屏障后才能继续，串行执行时屏障会超时
+    barrier = threading.Barrier(3, timeout=5)
+    result = run([BranchProcessor(name, barrier=barrier) for name in "abc"], backend="thread", max_workers=3)
+    assert result.success
+    assert set(result.branch_timings) == {"a", "b", "c"}
+
+
+def test_branch_timeout():
+    result = run([BranchProcessor("slow", delay=0.5), BranchProcessor("fast")], timeout=0.1)
+    assert not result.success
+    assert result.error_code == "BRANCH_TIMEOUT"
+    assert result.processor_name == "slow"
+    assert set(result.branch_timings) == {"slow", "fast"}
+
+
+def test_allow_partial_merges_remaining_branches():
+    processors = [BranchProcessor("slow", delay=0.5), BranchProcessor("broken", error=ValueError("boom"))]
+    processors.append(BranchProcessor("fast"))
+    result = run(processors, timeout=0.1, allow_partial=True)
+    assert result.success
+    assert result.data.content == "x|fast"
+    assert len(result.warnings) == 2
+
+
+def test_raising_branch_yields_branch_error():
+    result = run([BranchProcessor("ok"), BranchProcessor("broken", error=ValueError("boom"))])
+    assert not result.success
+    assert result.error_code == "BRANCH_ERROR"
+    assert result.processor_name == "broken"
+    assert "boom" in result.error
+
+
+@pytest.mark.parametrize(
+    ("strategy", "content", "metadata"),
+    [
+        (MergeStrategy.FIRST, "x|a", {"source": "in", "a": True}),
+        (MergeStrategy.LAST, "x|b", {"source": "in", "b": True}),
+        (MergeStrategy.MERGE_METADATA, "x", {"source": "in", "a": True, "b": True}),
+    ],
+)
+def test_merge_strategies(strategy, content, metadata):
+    # b 先完成，合并仍按声明顺序
+    result = run([BranchProcessor("a", delay=0.1), BranchProcessor("b")], merge_strategy=strategy)
+    assert result.success
+    assert result.data.content == content
+    assert result.data.metadata == metadata
+
+
+def test_merge_callable():
+    def join(data, successes):
+        return data.evolve(content="+".join(result.data.content for result in successes))
+
+    result = run([BranchProcessor("a"), BranchProcessor("b")], merge_strategy=join)
+    assert result.data.content == "x|a+x|b"
+
+    result = run([BranchProcessor("a")], merge_strategy=lambda data, successes: "not a model")
+    assert result.error_code == "MERGE_ERROR"
+
+
+def test_branch_spans_use_actual_start_time():
+    result = run([BranchProcessor("a", delay=0.1), BranchProcessor("b", delay=0.1)], max_workers=1)
+    span = result.timing
+    first, second = span.find("a"), span.find("b")
+    assert first.start_ns >= span.start_ns
+    # 单个工作线程时 b 排在 a 之后开始
+    assert second.start_ns >= first.end_ns
+    assert second.end_ns <= span.end_ns
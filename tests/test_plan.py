@@ -0,0 +1,89 @@
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TableData, TextData
+
+
+class LoggingProcessor(DataProcessor):
+    """记录执行顺序，按 supported_types 或 can_process 决定是否处理"""
+
+    def __init__(self, name, log, types=None, accept=None):
+        super().__init__(name)
+        self.log = log
+        self.supported_types = types
+        self.accept = accept
+        self.checks = 0
+
+    def can_process(self, data):
+        self.checks += 1
+        return self.accept(data) if self.accept is not None else True
+
+    def process(self, data):
+        self.log.append(self.name)
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+class TextToTable(LoggingProcessor):
+    def process(self, data):
+        self.log.append(self.name)
+        table = TableData(headers=["word"], rows=[[word] for word in data.content.split()], metadata=data.metadata)
+        return ProcessingResult.success_result(data=table, processing_time=0.0, processor_name=self.name)
+
+
+def test_plan_is_rebuilt_after_changes():
+    log = []
+    pipeline = DataPipeline("plan").add_processor(LoggingProcessor("a", log, types=(DataType.TEXT,)))
+    plan = pipeline.get_plan()
+    assert pipeline.get_plan() is plan
+
+    pipeline.add_processor(LoggingProcessor("b", log, types=(DataType.TEXT,)))
+    rebuilt = pipeline.get_plan()
+    assert rebuilt is not plan
+    assert [step.name for step in rebuilt.steps] == ["a", "b"]
+
+    assert pipeline.remove_processor("a")
+    assert [step.name for step in pipeline.get_plan().steps] == ["b"]
+    pipeline.process(TextData(content="x"))
+    assert log == ["b"]
+
+    # 直接修改 processors 列表后需手动使计划失效
+    pipeline.processors.append(LoggingProcessor("c", log, types=(DataType.TEXT,)))
+    assert len(pipeline.get_plan()) == 1
+    pipeline.invalidate_plan()
+    assert [step.name for step in pipeline.get_plan().steps] == ["b", "c"]
+
+
+def test_type_change_resumes_with_steps_for_new_type():
+    log = []
+    pipeline = DataPipeline("plan")
+    pipeline.add_processor(LoggingProcessor("table_before", log, types=(DataType.TABLE,)))
+    pipeline.add_processor(LoggingProcessor("text_before", log, types=(DataType.TEXT,)))
+    pipeline.add_processor(TextToTable("convert", log, types=(DataType.TEXT,)))
+    pipeline.add_processor(LoggingProcessor("text_after", log, types=(DataType.TEXT,)))
+    pipeline.add_processor(LoggingProcessor("any", log))
+    pipeline.add_processor(LoggingProcessor("table_after", log, types=(DataType.TABLE,)))
+
+    result = pipeline.process(TextData(content="a b"))
+    assert result.success
+    assert result.data.type == DataType.TABLE
+    assert log == ["text_before", "convert", "any", "table_after"]
+
+    log.clear()
+    results = pipeline.process_batch([TextData(content="a"), TableData(headers=["word"], rows=[["b"]])])
+    assert all(result.data.type == DataType.TABLE for result in results)
+    assert log == ["table_before", "text_before", "convert", "any", "any", "table_after", "table_after"]
+
+
+def test_processors_without_supported_types_use_can_process():
+    log = []
+    dynamic = LoggingProcessor("dynamic", log, accept=lambda data: data.content != "skip")
+    typed = LoggingProcessor("typed", log, types=(DataType.TEXT,))
+    pipeline = DataPipeline("plan").add_processor(dynamic).add_processor(typed)
+
+    plan = pipeline.get_plan()
+    assert plan.dynamic_steps == (plan.steps[0],)
+    assert plan.steps_for(DataType.IMAGE) == (plan.steps[0],)
+
+    pipeline.process(TextData(content="keep"))
+    pipeline.process(TextData(content="skip"))
+    assert log == ["dynamic", "typed", "typed"]
+    assert dynamic.checks == 2
+    # 声明了 supported_types 的处理器不再调用 can_process
+    assert typed.checks == 0
@@ -0,0 +1,120 @@
+import asyncio
+import pstats
+import threading
+import tracemalloc
+
+import pytest
+
+from daoji_core.data import AsyncDataProcessor, DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+
+
+def build_words(text):
+    return [word.upper() for word in text.split() * 50]
+
+
+class WordsProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        words = build_words(data.content)
+        return ProcessingResult.success_result(
+            data=data.evolve(metadata={**data.metadata, "words": words}), processing_time=0.0, processor_name=self.name
+        )
+
+
+class ClosingProcessor(WordsProcessor):
+    """在被剖析的阶段内关闭剖析器"""
+
+    def __init__(self, pipeline):
+        super().__init__("closing")
+        self.pipeline = pipeline
+
+    def process(self, data):
+        self.pipeline.profiler.close()
+        return super().process(data)
+
+
+class AsyncWordsProcessor(AsyncDataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    async def aprocess(self, data):
+        await asyncio.sleep(0)
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+@pytest.fixture(autouse=True)
+def stop_tracemalloc():
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_dump_writes_stage_files(tmp_path):
+    pipeline = DataPipeline("prof pipe").add_processor(WordsProcessor("module:words"))
+    profiler = pipeline.enable_profiling(tmp_path, cpu=True, memory=True, sample_rate=2)
+    for _ in range(4):
+        pipeline.process(TextData(content="a b c"))
+
+    assert profiler.stages["module:words"].samples == 2
+    written = pipeline.disable_profiling()
+    assert pipeline.profiler is None
+    assert not tracemalloc.is_tracing()
+    assert sorted(path.name for path in written) == [
+        "prof_pipe.all.pstats",
+        "prof_pipe.module_words.alloc.txt",
+        "prof_pipe.module_words.pstats",
+    ]
+    assert all(path.parent == tmp_path for path in written)
+
+    stats = pstats.Stats(str(tmp_path / "prof_pipe.module_words.pstats"))
+    assert any(function == "build_words" for _, _, function in stats.stats)
+    combined = pstats.Stats(str(tmp_path / "prof_pipe.all.pstats"))
+    assert any(function == "build_words" for _, _, function in combined.stats)
+
+    report = (tmp_path / "prof_pipe.module_words.alloc.txt").read_text(encoding="utf-8")
+    lines = report.splitlines()
+    assert lines[0] == "# prof pipe / module:words"
+    assert lines[1].startswith("# 采样次数: 2")
+    assert len(lines) > 3
+
+
+def test_cpu_only_profile_skips_allocation_report(tmp_path):
+    pipeline = DataPipeline("cpu").add_processor(WordsProcessor("words"))
+    pipeline.enable_profiling(tmp_path)
+    pipeline.process(TextData(content="a"))
+    assert sorted(path.name for path in pipeline.disable_profiling()) == ["cpu.all.pstats", "cpu.words.pstats"]
+    assert pipeline.disable_profiling() == []
+
+
+def test_close_inside_profiled_stage_does_not_deadlock(tmp_path):
+    pipeline = DataPipeline("closing")
+    pipeline.add_processor(ClosingProcessor(pipeline))
+    pipeline.enable_profiling(tmp_path, cpu=False, memory=True)
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(pipeline.process(TextData(content="a"))), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert results[0].success
+    # tracemalloc 在阶段结束时停止
+    assert not tracemalloc.is_tracing()
+    assert pipeline.profiler.stages["closing"].samples == 1
+
+
+def test_aprocess_is_not_profiled(tmp_path):
+    pipeline = DataPipeline("async").add_processor(AsyncWordsProcessor("async")).add_processor(WordsProcessor("sync"))
+    profiler = pipeline.enable_profiling(tmp_path)
+    result = asyncio.run(pipeline.aprocess(TextData(content="a")))
+    assert result.success
+    assert profiler.stages == {}
+
+    pipeline.process(TextData(content="a"))
+    assert {"async", "sync"} <= set(profiler.stages)
+    pipeline.disable_profiling(dump=False)
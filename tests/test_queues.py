@@ -0,0 +1,68 @@
+import threading
+import time
+
+from daoji_core.data import OverflowPolicy, ProcessingResult, TextData
+from daoji_core.data.queues import ModuleQueue
+
+
+class BlockingHandler:
+    """第一次调用阻塞到 release，用于让队列保持满载"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.seen = []
+
+    def __call__(self, data):
+        self.started.set()
+        self.release.wait(5)
+        self.seen.append(data.content)
+        return ProcessingResult.trusted_success(data=data, processing_time=0.0, processor_name="handler")
+
+
+def _fill(policy):
+    handler = BlockingHandler()
+    queue = ModuleQueue("m", handler, maxsize=2, workers=1, policy=policy)
+    first = queue.submit(TextData(content="0"))
+    assert handler.started.wait(5)
+    queued = [queue.submit(TextData(content=str(i))) for i in (1, 2)]
+    return handler, queue, first, queued
+
+
+def test_drop_oldest_evicts_head_of_queue():
+    handler, queue, first, (oldest, newer) = _fill(OverflowPolicy.DROP_OLDEST)
+    newest = queue.submit(TextData(content="3"))
+
+    dropped = oldest.result(1)
+    assert not dropped.success
+    assert dropped.error_code == "QUEUE_DROPPED"
+
+    handler.release.set()
+    assert first.result(5).success
+    assert newer.result(5).success
+    assert newest.result(5).success
+    queue.close()
+    assert handler.seen == ["0", "2", "3"]
+    stats = queue.get_statistics()
+    assert stats["dropped"] == 1
+    assert stats["completed"] == 3
+
+
+def test_reject_refuses_new_items():
+    handler, queue, first, queued = _fill(OverflowPolicy.REJECT)
+    started = time.perf_counter()
+    rejected = queue.submit(TextData(content="3")).result(1)
+    assert time.perf_counter() - started < 1
+    assert rejected.error_code == "QUEUE_FULL"
+
+    handler.release.set()
+    assert all(future.result(5).success for future in [first, *queued])
+    queue.close()
+    assert handler.seen == ["0", "1", "2"]
+    assert queue.get_statistics()["rejected"] == 1
+
+
+def test_closed_queue_refuses_items():
+    queue = ModuleQueue("m", BlockingHandler(), maxsize=1)
+    queue.close()
+    assert queue.submit(TextData(content="x")).result(1).error_code == "QUEUE_CLOSED"
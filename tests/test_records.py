@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pytest
+
+from daoji_core.data import (
+    ImageData,
+    ImageRecord,
+    TableData,
+    TableRecord,
+    TextData,
+    TextRecord,
+    as_model,
+    as_record,
+)
+
+
+def test_record_fields_are_lazy():
+    record = TextRecord(content="a b c")
+    assert record._id is None
+    assert record._timestamp is None
+    assert record._metadata is None
+    assert record.get_metadata("missing") is None
+    assert record._metadata is None
+
+    record_id = record.id
+    assert record.id == record_id
+    assert isinstance(record.timestamp, datetime)
+    assert record.word_count == 3
+    record.add_metadata("k", 1)
+    assert record.metadata == {"k": 1}
+
+
+def test_text_round_trip():
+    record = TextRecord(content="hello world", language="en", metadata={"k": "v"}, source="unit")
+    model = as_model(record)
+    assert isinstance(model, TextData)
+    assert (model.id, model.timestamp, model.metadata, model.source) == (
+        record.id,
+        record.timestamp,
+        {"k": "v"},
+        "unit",
+    )
+    assert (model.content, model.language, model.word_count) == ("hello world", "en", 2)
+
+    back = as_record(model)
+    assert isinstance(back, TextRecord)
+    assert back == record
+    assert as_model(back).model_dump() == model.model_dump()
+
+
+def test_model_to_record_keeps_identity():
+    model = TextData(content="x", metadata={"k": 1})
+    record = as_record(model)
+    assert (record.id, record.timestamp, record.metadata) == (model.id, model.timestamp, model.metadata)
+    assert as_record(record) is record
+    assert as_model(model) is model
+
+
+def test_table_round_trip_validates_on_conversion():
+    record = TableRecord(headers=["a", "b"], rows=[[1, 2], [3, 4]], column_schema={"a": "int"})
+    model = as_model(record)
+    assert isinstance(model, TableData)
+    assert model.rows == [[1, 2], [3, 4]]
+    assert model.id == record.id
+    assert as_record(model) == record
+
+    broken = TableRecord(headers=["a"], rows=[[1, 2]])
+    with pytest.raises(ValueError):
+        broken.validate()
+    with pytest.raises(ValueError):
+        as_model(broken)
+
+
+def test_image_round_trip_shares_buffer():
+    payload = memoryview(b"\x89PNG" + bytes(20))
+    record = ImageRecord(data=payload, format="png", width=1, height=2, metadata={"k": "v"})
+    model = as_model(record)
+    assert isinstance(model, ImageData)
+    assert model.data is payload
+    assert (model.id, model.timestamp, model.metadata) == (record.id, record.timestamp, {"k": "v"})
+
+    back = as_record(model)
+    assert isinstance(back, ImageRecord)
+    assert back.data is payload
+    assert (back.format, back.width, back.height) == ("png", 1, 2)
+
+
+def test_from_model_rejects_mismatched_record_class():
+    with pytest.raises(ValueError):
+        TableRecord.from_model(TextData(content="x"))
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from daoji_core.data import DataType
+from daoji_core.modules import ModuleRegistry
+from daoji_core.modules.base import SimpleModule
+
+
+def make_module(name):
+    return SimpleModule(name, [DataType.TEXT])
+
+
+@pytest.fixture
+def registry():
+    registry = ModuleRegistry.get_instance()
+    registry.clear_registry()
+    yield registry
+    registry.clear_registry()
+
+
+def test_snapshot_is_cached_until_next_write(registry):
+    registry.register_module(make_module("a"))
+    first = registry.snapshot()
+    assert registry.snapshot() is first
+    assert first.names == ("a",)
+
+    registry.register_module(make_module("b"))
+    second = registry.snapshot()
+    assert second is not first
+    assert second.version > first.version
+    assert second.names == ("a", "b")
+    # 旧快照不受后续写操作影响
+    assert first.names == ("a",)
+    assert list(first.modules) == ["a"]
+
+    registry.unregister_module("a")
+    third = registry.snapshot()
+    assert third is not second
+    assert third.names == ("b",)
+    assert list(second.modules) == ["a", "b"]
+    assert registry.snapshot() is third
+
+    registry.clear_registry()
+    assert registry.snapshot().names == ()
+    assert third.names == ("b",)
+
+
+def test_snapshot_is_read_only(registry):
+    registry.register_module(make_module("a"), depends_on=["b"])
+    snapshot = registry.snapshot()
+    assert snapshot.dependencies["a"] == ("b",)
+    assert snapshot.module_types["a"] is SimpleModule
+    with pytest.raises(TypeError):
+        snapshot.modules["x"] = make_module("x")
+    with pytest.raises(AttributeError):
+        snapshot.names = ()
+
+
+def test_get_module_sees_writes_immediately(registry):
+    module = make_module("a")
+    registry.register_module(module)
+    registry.snapshot()
+    assert registry.get_module("a") is module
+    assert "a" in registry and len(registry) == 1
+
+    registry.unregister_module("a")
+    assert registry.get_module("a") is None
+    assert "a" not in registry
+
+
+def test_iteration_is_stable_during_concurrent_writes(registry):
+    stable = make_module("stable")
+    registry.register_module(stable)
+    before = registry.snapshot()
+    stop = threading.Event()
+    errors = []
+
+    def churn():
+        try:
+            i = 0
+            while not stop.is_set():
+                name = f"dynamic-{i % 8}"
+                registry.register_module(make_module(name))
+                registry.unregister_module(name)
+                i += 1
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=churn, daemon=True)
+    writer.start()
+    versions = []
+    try:
+        deadline = time.monotonic() + 10
+        while len(set(versions)) < 50 and time.monotonic() < deadline:
+            snapshot = registry.snapshot()
+            names = snapshot.names
+            # 遍历期间写线程持续注册/注销，快照内容保持不变
+            iterated = [name for name, module in snapshot.modules.items() if module.name == name]
+            assert tuple(iterated) == names == snapshot.names
+            assert set(snapshot.module_types) == set(names)
+            assert "stable" in names
+            assert any(module is stable for module in registry)
+            assert registry.get_module("stable") is stable
+            versions.append(snapshot.version)
+    finally:
+        stop.set()
+        writer.join(timeout=10)
+
+    assert not writer.is_alive()
+    assert errors == []
+    # 每次写操作后读到的是新快照，版本单调递增
+    assert len(set(versions)) >= 50
+    assert versions == sorted(versions)
+    assert before.names == ("stable",) and list(before.modules) == ["stable"]
+    final = registry.snapshot()
+    assert final.names == ("stable",)
+    assert final.version >= versions[-1]
@@ -0,0 +1,66 @@
+import pytest
+
+from daoji_core.data import DataFlowManager, DataType, ProcessingResult, TextData
+
+
+class TypedModule:
+    def __init__(self, name, types):
+        self.name = name
+        self.types = list(types)
+
+    def process_data(self, data):
+        return ProcessingResult.success_result(data=data.evolve(metadata={"module": self.name}), processing_time=0.0)
+
+    def get_supported_types(self):
+        return self.types
+
+    def get_module_info(self):
+        return {"name": self.name}
+
+
+@pytest.fixture
+def flow():
+    flow = DataFlowManager()
+    flow.register_module("text", TypedModule("text", [DataType.TEXT]))
+    flow.register_module("image", TypedModule("image", [DataType.IMAGE]))
+    flow.register_module("both", TypedModule("both", [DataType.TEXT, DataType.IMAGE]))
+    yield flow
+    flow.shutdown()
+
+
+def auto_routed(flow, data):
+    return [name for result in flow.auto_route_data(data) for name in result.branch_timings]
+
+
+def route_accepted(flow, data):
+    return [name for name in flow.modules if flow.route_data(data, name).success]
+
+
+def test_auto_route_matches_route_data(flow):
+    data = TextData(content="x")
+    assert auto_routed(flow, data) == route_accepted(flow, data) == ["text", "both"]
+
+
+def test_routing_rule_ignores_unsupported_modules(flow):
+    flow.set_routing_rule(DataType.TEXT, ["image", "text"])
+    data = TextData(content="x")
+
+    assert [name for name, _ in flow.get_routing_table().modules_for(DataType.TEXT)] == ["text"]
+    assert auto_routed(flow, data) == ["text"]
+    assert set(auto_routed(flow, data)) <= set(route_accepted(flow, data))
+    assert flow.route_data(data, "image").error_code == "UNSUPPORTED_DATA_TYPE"
+    # 规则本身保留，模块支持该类型后重建路由表即可生效
+    assert flow.get_routing_rules()[DataType.TEXT] == ["image", "text"]
+
+    flow.modules["image"].types.append(DataType.TEXT)
+    flow.rebuild_routing_table()
+    assert auto_routed(flow, data) == ["image", "text"]
+    assert set(auto_routed(flow, data)) <= set(route_accepted(flow, data))
+
+
+def test_unregister_removes_module_from_routes(flow):
+    version = flow.get_routing_table().version
+    assert flow.unregister_module("both")
+    assert flow.get_routing_table().version == version + 1
+    assert auto_routed(flow, TextData(content="x")) == ["text"]
+    assert flow.route_data(TextData(content="x"), "both").error_code == "MODULE_NOT_FOUND"
@@ -0,0 +1,37 @@
+import os
+
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+from daoji_core.data.sharding import ShardedRunner
+
+
+class CrashProcessor(DataProcessor):
+    """处理内容为 crash 的记录时直接结束工作进程"""
+
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        if data.content == "crash":
+            os._exit(1)
+        return ProcessingResult.success_result(
+            data=data.evolve(content=data.content.upper()), processing_time=0.0, processor_name=self.name
+        )
+
+
+def build_pipeline():
+    return DataPipeline("shard").add_processor(CrashProcessor("crash"))
+
+
+def test_crash_is_bisected_to_single_record():
+    items = [TextData(content="crash" if i == 13 else f"r{i}") for i in range(24)]
+    with ShardedRunner(build_pipeline, workers=2, chunk_size=8, max_retries=1) as runner:
+        results = runner.map(items)
+        stats = runner.get_stats()
+
+    assert len(results) == len(items)
+    assert results[13].error_code == "WORKER_CRASHED"
+    assert [r.data.content for i, r in enumerate(results) if i != 13] == [f"R{i}" for i in range(24) if i != 13]
+    assert stats["crashed_items"] == 1
+    assert stats["crashes"] >= 2
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from daoji_core.data import DataType
+from daoji_core.modules import ModuleRegistry
+from daoji_core.modules.base import SimpleModule
+from daoji_core.utils.exceptions import ModuleError
+
+
+class RecordingModule(SimpleModule):
+    def __init__(self, name, log, delay=0.0, fail=False):
+        super().__init__(name, [DataType.TEXT])
+        self.log = log
+        self.delay = delay
+        self.fail = fail
+
+    def _start_internal(self):
+        self.log.append(("start", self.name, threading.get_ident()))
+        time.sleep(self.delay)
+        self.log.append(("started", self.name, None))
+        return not self.fail
+
+    def _stop_internal(self):
+        self.log.append(("stop", self.name, None))
+        return True
+
+
+@pytest.fixture
+def registry():
+    registry = ModuleRegistry.get_instance()
+    registry.clear_registry()
+    yield registry
+    registry.clear_registry()
+
+
+def test_modules_start_after_dependencies(registry):
+    log = []
+    registry.register_module(RecordingModule("db", log, delay=0.1))
+    registry.register_module(RecordingModule("cache", log, delay=0.1))
+    registry.register_module(RecordingModule("api", log), depends_on=["db", "cache"])
+    registry.register_module(RecordingModule("worker", log), depends_on=["api"])
+
+    assert registry.resolve_start_order() == [["db", "cache"], ["api"], ["worker"]]
+    report = registry.start_modules()
+    assert report.success
+
+    events = [(event, name) for event, name, _ in log]
+    position = {item: i for i, item in enumerate(events)}
+    assert position[("start", "api")] > position[("started", "db")]
+    assert position[("start", "api")] > position[("started", "cache")]
+    assert position[("start", "worker")] > position[("started", "api")]
+    # 互不依赖的模块并行启动
+    assert position[("start", "cache")] < position[("started", "db")]
+    assert report.critical_path[-2:] == ["api", "worker"]
+
+    log.clear()
+    registry.stop_all_modules()
+    stops = [name for event, name, _ in log if event == "stop"]
+    assert stops.index("worker") < stops.index("api") < min(stops.index("db"), stops.index("cache"))
+
+
+def test_failed_dependency_skips_dependents(registry):
+    log = []
+    registry.register_module(RecordingModule("db", log, fail=True))
+    registry.register_module(RecordingModule("api", log), depends_on=["db"])
+    registry.register_module(RecordingModule("orphan", log), depends_on=["missing"])
+
+    report = registry.start_modules()
+    assert report.results == {"db": False, "api": False, "orphan": False}
+    assert report.records["db"].error_code == "START_FAILED"
+    assert report.records["api"].error_code == "DEPENDENCY_FAILED"
+    assert report.records["orphan"].error_code == "DEPENDENCY_MISSING"
+    assert ("start", "api") not in [(event, name) for event, name, _ in log]
+
+
+def test_dependency_cycle_is_reported(registry):
+    log = []
+    registry.register_module(RecordingModule("a", log), depends_on=["b"])
+    registry.register_module(RecordingModule("b", log), depends_on=["a"])
+
+    with pytest.raises(ModuleError):
+        registry.resolve_start_order()
+    report = registry.start_modules()
+    assert {record.error_code for record in report.records.values()} == {"DEPENDENCY_CYCLE"}
+    assert log == []
@@ -0,0 +1,98 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TextData
+
+
+class UpperProcessor(DataProcessor):
+    supported_types = (DataType.TEXT,)
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        return ProcessingResult.success_result(
+            data=data.evolve(content=data.content.upper()), processing_time=0.0, processor_name=self.name
+        )
+
+
+class CountingSource:
+    """记录已被取走的记录数"""
+
+    def __init__(self, count=None):
+        self.pulled = 0
+        self.count = count
+
+    def __iter__(self):
+        numbers = itertools.count() if self.count is None else range(self.count)
+        for i in numbers:
+            self.pulled += 1
+            yield TextData(content=f"r{i}")
+
+
+def prefetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "daoji-prefetch"]
+
+
+def build_pipeline():
+    return DataPipeline("stream").add_processor(UpperProcessor("upper")).add_processor(UpperProcessor("again"))
+
+
+def test_input_is_consumed_lazily():
+    source = CountingSource()
+    results = build_pipeline().stream(source, batch_size=4)
+    first = next(results)
+    assert first.data.content == "R0"
+    assert source.pulled == 4
+    results.close()
+
+
+@pytest.mark.parametrize(("batch_size", "prefetch"), [(1, 0), (3, 0), (2, 3), (4, 1)])
+def test_in_flight_records_are_bounded(batch_size, prefetch):
+    source = CountingSource(40)
+    yielded = 0
+    max_in_flight = 0
+    for result in build_pipeline().stream(source, batch_size=batch_size, prefetch=prefetch):
+        assert result.success
+        # 给预读线程时间填满队列
+        time.sleep(0.01)
+        max_in_flight = max(max_in_flight, source.pulled - yielded)
+        yielded += 1
+    assert yielded == 40
+    assert max_in_flight <= batch_size + prefetch
+    if prefetch:
+        assert max_in_flight > batch_size
+
+
+def test_results_keep_input_order():
+    items = [TextData(content=f"r{i}") for i in range(25)]
+    results = list(build_pipeline().stream(iter(items), batch_size=4, prefetch=2))
+    assert [result.data.content for result in results] == [f"R{i}" for i in range(25)]
+    assert [result.data.id for result in results] == [item.id for item in items]
+
+
+def test_early_close_stops_prefetch_thread():
+    before = set(prefetch_threads())
+    results = build_pipeline().stream(CountingSource(), batch_size=2, prefetch=4)
+    next(results)
+    assert set(prefetch_threads()) - before
+
+    results.close()
+    deadline = time.monotonic() + 2
+    while set(prefetch_threads()) - before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not set(prefetch_threads()) - before
+
+
+def test_source_errors_are_raised_to_consumer():
+    def source():
+        yield TextData(content="a")
+        raise RuntimeError("source failed")
+
+    results = build_pipeline().stream(source(), prefetch=2)
+    assert next(results).data.content == "A"
+    with pytest.raises(RuntimeError, match="source failed"):
+        next(results)
@@ -0,0 +1,82 @@
+import time
+
+from daoji_core.data import DataPipeline, DataProcessor, DataType, ProcessingResult, TextData, TimingSpan, timed
+
+
+class StepProcessor(DataProcessor):
+    def __init__(self, name, types=(DataType.TEXT,), raise_on=None, nested=False):
+        super().__init__(name)
+        self.supported_types = types
+        self.raise_on = raise_on
+        self.nested = nested
+
+    def can_process(self, data):
+        return True
+
+    def process(self, data):
+        if self.nested:
+            with timed("tokenize"):
+                time.sleep(0.01)
+        if data.content == self.raise_on:
+            raise RuntimeError("boom")
+        return ProcessingResult.success_result(data=data, processing_time=0.0, processor_name=self.name)
+
+
+def names(span):
+    return [child.name for child in span.children]
+
+
+def test_one_child_per_executed_processor():
+    pipeline = DataPipeline("timing")
+    pipeline.add_processor(StepProcessor("a"))
+    pipeline.add_processor(StepProcessor("table_only", types=(DataType.TABLE,)))
+    pipeline.add_processor(StepProcessor("b"))
+    result = pipeline.process(TextData(content="x"))
+
+    span = result.timing
+    assert span.name == "timing"
+    assert span.finished
+    assert names(span) == ["a", "b"]
+    assert all(child.finished and child.start_ns >= span.start_ns for child in span.children)
+    assert span.children[0].end_ns <= span.children[1].start_ns
+    assert sum(child.duration_ns for child in span.children) <= span.duration_ns
+
+
+def test_timing_is_kept_on_error_path():
+    pipeline = DataPipeline("timing")
+    pipeline.add_processor(StepProcessor("a"))
+    pipeline.add_processor(StepProcessor("broken", raise_on="x"))
+    pipeline.add_processor(StepProcessor("never"))
+    result = pipeline.process(TextData(content="x"))
+
+    assert not result.success
+    assert result.timing.finished
+    assert names(result.timing) == ["a", "broken"]
+    assert result.timing.find("broken").finished
+
+
+def test_nested_timed_attaches_under_processor_span():
+    pipeline = DataPipeline("timing").add_processor(StepProcessor("a")).add_processor(StepProcessor("b", nested=True))
+    result = pipeline.process(TextData(content="x"))
+
+    span = result.timing
+    assert names(span.find("a")) == []
+    assert names(span.find("b")) == ["tokenize"]
+    assert span.find("tokenize").duration >= 0.01
+    assert set(span.flatten()) == {"timing", "timing/a", "timing/b", "timing/b/tokenize"}
+
+
+def test_batch_results_share_chunk_tree():
+    pipeline = DataPipeline("timing").add_processor(StepProcessor("a")).add_processor(StepProcessor("b", nested=True))
+    results = pipeline.process_batch([TextData(content="x"), TextData(content="y")])
+
+    assert results[0].timing is results[1].timing
+    assert names(results[0].timing) == ["a", "b"]
+    assert names(results[0].timing.find("b")) == ["tokenize", "tokenize"]
+
+
+def test_from_elapsed():
+    span = TimingSpan.from_elapsed("remote", 1_000, 0.5)
+    assert span.finished
+    assert span.duration_ns == 500_000_000
+    assert span.to_dict() == {"name": "remote", "duration_ns": 500_000_000, "children": []}
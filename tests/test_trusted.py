@@ -0,0 +1,49 @@
+import pytest
+
+from daoji_core.data import ProcessingResult, TableData, TextData
+from daoji_core.data.timing import TimingSpan
+
+
+def comparable(model, *exclude):
+    """去掉每次构造都不同的默认工厂字段后比较"""
+    return model.model_dump(exclude=set(exclude)), model.model_fields_set
+
+
+def test_trusted_text_matches_validation():
+    for values in ({"content": "hello world", "language": "en"}, {"content": ""}, {"content": "a b", "word_count": 9}):
+        trusted = TextData.construct_trusted(**values)
+        validated = TextData(**values)
+        assert comparable(trusted, "id", "timestamp") == comparable(validated, "id", "timestamp")
+    assert TextData.construct_trusted(content="a b c").word_count == 3
+
+
+def test_trusted_table_matches_validation():
+    values = {"headers": ["a", "b"], "rows": [[1, 2], [3, 4]], "source": "s"}
+    trusted = TableData.construct_trusted(**values)
+    validated = TableData(**values)
+    assert comparable(trusted, "id", "timestamp") == comparable(validated, "id", "timestamp")
+    assert list(trusted.model_dump()) == list(validated.model_dump())
+    assert trusted.rows is values["rows"]
+    with pytest.raises(TypeError):
+        TableData.construct_trusted(headers=["a"])
+
+
+def test_trusted_results_match_validation():
+    data = TextData(content="x")
+    timing = TimingSpan.from_elapsed("step", 0, 0.1)
+    success = {"data": data, "processing_time": 0.5, "processor_name": "p", "timing": timing}
+    trusted = ProcessingResult.trusted_success(**success)
+    validated = ProcessingResult.success_result(**success)
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.data is data
+
+    error = {"error": "boom", "processing_time": 0.1, "error_code": "E", "processor_name": "p"}
+    trusted = ProcessingResult.trusted_error(**error)
+    validated = ProcessingResult.error_result(**error)
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_fields_set == validated.model_fields_set
+
+    # 可变默认值每次构造都是新对象
+    trusted.warnings.append("w")
+    assert ProcessingResult.trusted_error(**error).warnings == []